@@ -0,0 +1,128 @@
+import datetime
+import itertools
+import random
+import statistics
+import time
+
+from src.models.employees.employee import Employee
+from src.models.employees.employee_position_enum import EmployeePositionEnum
+from src.models.employees.employee_priority_enum import EmployeePriorityEnum
+from src.models.employees.employee_status_enum import EmployeeStatusEnum
+from src.models.shifts.shift import Shift
+from src.models.shifts.shifts_file import all_shifts_in_the_week
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.aggregated_schedule import create_aggregated_schedule
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.model_backend_enum import ModelBackendEnum
+from src.models.solution.squared_deviation_encoding_enum import SquaredDeviationEncodingEnum
+
+
+def create_benchmark_shifts(number_of_weeks: int) -> list[Shift]:
+    shifts: list[Shift] = []
+
+    for week in range(number_of_weeks):
+        week_offset = datetime.timedelta(weeks=week)
+        for shift in all_shifts_in_the_week:
+            shifts.append(Shift(shift_id=f"week{week}_{shift.shift_id}", shift_type=shift.shift_type, start_time=shift.start_time + week_offset, end_time=shift.end_time + week_offset))
+
+    return shifts
+
+
+# With "number_of_trained_shifts_sets", the employees are trained for one of that many random sets of shifts, like the
+# few roles of a real staff.
+def create_benchmark_employees(number_of_employees: int, seed: int = 0, number_of_trained_shifts_sets: int | None = None) -> list[Employee]:
+    random_generator = random.Random(seed)
+    employees: list[Employee] = []
+    get_random_trained_shifts = lambda: random_generator.sample(list(ShiftTypesEnum), random_generator.randint(3, len(ShiftTypesEnum)))
+    trained_shifts_sets = [get_random_trained_shifts() for _ in range(number_of_trained_shifts_sets)] if number_of_trained_shifts_sets is not None else []
+
+    for employee_number in range(number_of_employees):
+        trained_shifts = random_generator.choice(trained_shifts_sets) if trained_shifts_sets else get_random_trained_shifts()
+        employees.append(Employee(name=f"employee{employee_number}", employee_id=f"employee{employee_number}",
+                                  priority=random_generator.choice(list(EmployeePriorityEnum)),
+                                  employee_status=random_generator.choice(list(EmployeeStatusEnum)),
+                                  position=random_generator.choice(list(EmployeePositionEnum)),
+                                  shift_types_trained_to_do=trained_shifts))
+
+    return employees
+
+
+def benchmark_model_backends(number_of_employees: int, number_of_weeks: int, max_time_in_seconds: float = 30) -> None:
+    min_time_between_shifts = datetime.timedelta(hours=9)
+    employees = create_benchmark_employees(number_of_employees)
+    shifts = create_benchmark_shifts(number_of_weeks)
+
+    for model_backend in ModelBackendEnum:
+        build_start_time = time.perf_counter()
+        schedule_solution = create_solutions(employees, shifts, model_backend, min_time_between_shifts)
+        build_time = time.perf_counter() - build_start_time
+
+        model_proto = schedule_solution.constraint_model.Proto()
+        schedule_solution.solver.parameters.max_time_in_seconds = max_time_in_seconds
+        status = schedule_solution.solver.Solve(schedule_solution.constraint_model)
+
+        print(f"{model_backend.value:<14} employees={number_of_employees} weeks={number_of_weeks} "
+              f"variables={len(model_proto.variables)} constraints={len(model_proto.constraints)} "
+              f"build={build_time:.3f}s solve={schedule_solution.solver.WallTime():.3f}s "
+              f"status={schedule_solution.solver.StatusName(status)} objective={schedule_solution.solver.ObjectiveValue()}")
+
+
+def benchmark_warm_started_schedules(number_of_employees: int, number_of_weeks: int, number_of_schedules: int = 20, max_time_in_seconds: float = 10) -> None:
+    employees = create_benchmark_employees(number_of_employees)
+    shifts = create_benchmark_shifts(number_of_weeks)
+
+    for warm_start in [False, True]:
+        schedule_solution = create_solutions(employees, shifts)
+        schedule_solution.solver.parameters.max_time_in_seconds = max_time_in_seconds
+        schedules = list(itertools.islice(schedule_solution.yield_schedules(warm_start), number_of_schedules))
+
+        iterations_wall_times = schedule_solution.iterations_wall_times
+        print(f"warm_start={warm_start!s:<5} employees={number_of_employees} weeks={number_of_weeks} schedules={len(schedules)} "
+              f"total={sum(iterations_wall_times):.3f}s mean={statistics.mean(iterations_wall_times):.3f}s "
+              f"max={max(iterations_wall_times):.3f}s")
+
+
+def benchmark_squared_deviation_encodings(number_of_employees: int, number_of_weeks: int, max_time_in_seconds: float = 30) -> None:
+    employees = create_benchmark_employees(number_of_employees)
+    shifts = create_benchmark_shifts(number_of_weeks)
+
+    for squared_deviation_encoding in SquaredDeviationEncodingEnum:
+        schedule_solution = create_solutions(employees, shifts, squared_deviation_encoding=squared_deviation_encoding)
+        schedule_solution.solver.parameters.max_time_in_seconds = max_time_in_seconds
+        status = schedule_solution.solver.Solve(schedule_solution.constraint_model)
+
+        print(f"{squared_deviation_encoding.value:<16} employees={number_of_employees} weeks={number_of_weeks} "
+              f"solve={schedule_solution.solver.WallTime():.3f}s status={schedule_solution.solver.StatusName(status)} "
+              f"objective={schedule_solution.solver.ObjectiveValue()} bound={schedule_solution.solver.BestObjectiveBound()}")
+
+
+def benchmark_aggregated_schedule(number_of_employees: int, number_of_weeks: int, number_of_trained_shifts_sets: int = 4, max_time_in_seconds: float = 30) -> None:
+    min_time_between_shifts = datetime.timedelta(hours=9)
+    employees = create_benchmark_employees(number_of_employees, number_of_trained_shifts_sets=number_of_trained_shifts_sets)
+    shifts = create_benchmark_shifts(number_of_weeks)
+
+    aggregated_schedule = create_aggregated_schedule(employees, shifts, min_time_between_shifts, max_time_per_solve_in_seconds=max_time_in_seconds)
+    search_status = aggregated_schedule.search_status
+    print(f"aggregated     employees={number_of_employees} weeks={number_of_weeks} total={search_status.wall_time_in_seconds:.3f}s "
+          f"status={search_status.status.value} objective={search_status.objective_value} gap={search_status.objective_gap} "
+          f"cuts={aggregated_schedule.number_of_no_good_cuts}")
+
+    schedule_solution = create_solutions(employees, shifts, min_time_between_shifts=min_time_between_shifts)
+    schedule_solution.solver.parameters.max_time_in_seconds = max_time_in_seconds
+    status = schedule_solution.solver.Solve(schedule_solution.constraint_model)
+    print(f"full           employees={number_of_employees} weeks={number_of_weeks} solve={schedule_solution.solver.WallTime():.3f}s "
+          f"status={schedule_solution.solver.StatusName(status)} objective={schedule_solution.solver.ObjectiveValue()}")
+
+
+if __name__ == "__main__":
+    for employees_count, weeks_count in [(6, 1), (30, 4), (100, 4)]:
+        benchmark_model_backends(employees_count, weeks_count)
+
+    for employees_count, weeks_count in [(6, 1), (30, 2)]:
+        benchmark_warm_started_schedules(employees_count, weeks_count)
+
+    for employees_count, weeks_count in [(6, 1), (30, 4), (100, 4)]:
+        benchmark_squared_deviation_encodings(employees_count, weeks_count)
+
+    for employees_count, weeks_count in [(100, 4), (300, 4)]:
+        benchmark_aggregated_schedule(employees_count, weeks_count)
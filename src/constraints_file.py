@@ -1,16 +1,26 @@
+import bisect
 import datetime
-import itertools
 import math
 import uuid
-from typing import Tuple
+from typing import Hashable
 from uuid import UUID
 
+import numpy as np
 from ortools.sat.python import cp_model
-from ortools.sat.python.cp_model import IntVar
+from ortools.sat.python.cp_model import IntVar, IntervalVar
 from src.models.employees.employee import Employee
+from src.models.employees.employee_preferences.employees_preferences_matrices import create_employees_preferences_matrices, \
+    create_preferences_matrix
 from src.models.employees.employee_status_enum import EmployeeStatusEnum
+from src.models.employees.employees_equivalence_classes import get_employees_equivalence_classes
+from src.models.shifts.eligible_shift_combinations import EligibleShiftCombinations
 from src.models.shifts.shift_combinations_key import ShiftCombinationsKey
 from src.models.shifts.shift import Shift
+from src.models.shifts.shift_index import get_shift_index
+from src.models.solution.objective_registry import add_objective_term, PREFERRED_SHIFTS_OBJECTIVE_TERM, \
+    SHIFTS_PREFERRED_NOT_TO_WORK_OBJECTIVE_TERM, POSITION_DEVIATION_OBJECTIVE_TERM, PREFERENCES_OBJECTIVE_PRIORITY, \
+    POSITION_DEVIATION_OBJECTIVE_PRIORITY
+from src.models.solution.squared_deviation_encoding_enum import SquaredDeviationEncodingEnum
 
 
 # Returns a dictionary that contains all the combinations of shifts and employees as: FrozenShiftCombinationsKey
@@ -29,64 +39,89 @@ dict[ShiftCombinationsKey, IntVar]:
     return shift_combinations
 
 
+# Same as "generate_shift_employee_combinations", but without creating a variable for a shift that the employee is not
+# trained to do, or for a shift that the employee cannot work. These pairs are never assigned.
+def generate_eligible_shift_employee_combinations(employees: list[Employee], shifts: list[Shift], constraint_model: cp_model.CpModel) -> \
+EligibleShiftCombinations:
+    shift_index = get_shift_index(shifts)
+    cannot_work = create_preferences_matrix([employee.shifts_preferences.shifts_cannot_work for employee in employees], shift_index)
+
+    shift_combinations = EligibleShiftCombinations()
+    for employee_row, employee in enumerate(employees):
+        employee_id = employee.employee_id
+
+        for shift in shifts:
+            shift_position = shift_index.shift_position_by_id[shift.shift_id]
+            if shift.shift_type in employee.shift_types_trained_to_do and not cannot_work[employee_row, shift_position]:
+                key = ShiftCombinationsKey(employee_id, shift.shift_id)
+
+                shift_combinations[key] = constraint_model.NewBoolVar(f"employee_{employee_id}_shift_{shift.shift_id}")
+
+    return shift_combinations
+
+
+def get_employee_assignments_to_shifts(employee: Employee, shifts: list[Shift], shift_combinations: dict[ShiftCombinationsKey, IntVar]) -> list[IntVar]:
+    keys = [ShiftCombinationsKey(employee.employee_id, shift.shift_id) for shift in shifts]
+    assignments = [shift_combinations.get(key) for key in keys]
+    return [assignment for assignment in assignments if assignment is not None]
+
+
+def get_employees_assignments_to_shift(shift: Shift, employees: list[Employee], shift_combinations: dict[ShiftCombinationsKey, IntVar]) -> list[IntVar]:
+    keys = [ShiftCombinationsKey(employee.employee_id, shift.shift_id) for employee in employees]
+    assignments = [shift_combinations.get(key) for key in keys]
+    return [assignment for assignment in assignments if assignment is not None]
+
+
 def add_exactly_one_employee_per_shift_constraint(shifts: list[Shift], employees: list[Employee], constraint_model: cp_model.CpModel, shift_combinations: dict[ShiftCombinationsKey, IntVar]) -> None:
     for shift in shifts:
-        all_employees_working_this_shift = []
-
-        for employee in employees:
-            key = ShiftCombinationsKey(employee.employee_id, shift.shift_id)
-            all_employees_working_this_shift.append(shift_combinations[key])
+        all_employees_working_this_shift = get_employees_assignments_to_shift(shift, employees, shift_combinations)
 
         constraint_model.AddExactlyOne(all_employees_working_this_shift)
 
 
 def add_at_most_one_shift_per_employee_in_the_same_day_constraint(shifts: list[Shift], employees: list[Employee], constraint_model: cp_model.CpModel, shift_combinations: dict[ShiftCombinationsKey, IntVar]) -> None:
-    shift_grouping_func = lambda shift: shift.start_time.date()
+    shift_index = get_shift_index(shifts)
 
-    for _, shifts_group in itertools.groupby(shifts, shift_grouping_func):
-        shifts_in_day = list(shifts_group)
+    for shifts_in_day in shift_index.shifts_by_day.values():
         for employee in employees:
-            works_shifts_on_day: list[IntVar] = []
-            for shift in shifts_in_day:
-                key = ShiftCombinationsKey(employee.employee_id, shift.shift_id)
-                works_shifts_on_day.append(shift_combinations[key])
+            works_shifts_on_day: list[IntVar] = get_employee_assignments_to_shifts(employee, shifts_in_day, shift_combinations)
 
             constraint_model.AddAtMostOne(works_shifts_on_day)
 
 
 def add_limit_employees_working_days_constraint(shifts: list[Shift], employees: list[Employee], constraint_model: cp_model.CpModel, shift_combinations: dict[ShiftCombinationsKey, IntVar], max_working_days: int) -> None:
     for employee in employees:
-        shifts_employee_is_working: list[IntVar] = []
-
-        for shift in shifts:
-            key = ShiftCombinationsKey(employee.employee_id, shift.shift_id)
-            shifts_employee_is_working.append(shift_combinations[key])
+        shifts_employee_is_working: list[IntVar] = get_employee_assignments_to_shifts(employee, shifts, shift_combinations)
 
         constraint_model.Add(sum(shifts_employee_is_working) <= max_working_days)
 
 
-def add_minimum_time_between_a_morning_shift_and_the_shift_before_constraint(shifts: list[Shift], employees: list[Employee], constraint_model: cp_model.CpModel, shift_combinations: dict[ShiftCombinationsKey, IntVar], min_time_between_shifts: datetime.timedelta, afternoon_start_time: datetime.time):
-    all_afternoon_shifts = [shift for shift in shifts if afternoon_start_time <= shift.start_time.time()]
+# Returns the pairs of an afternoon shift and a shift that starts after it, but before the employee who worked the
+# afternoon shift had the minimum time of rest. The pairs are found once by bisecting the shifts start times.
+def get_minimum_rest_conflicting_shifts(shifts: list[Shift], min_time_between_shifts: datetime.timedelta, afternoon_start_time: datetime.time) -> list[tuple[Shift, Shift]]:
+    shift_index = get_shift_index(shifts)
+    conflicting_shifts: list[tuple[Shift, Shift]] = []
 
-    for employee in employees:
-        for afternoon_shift in all_afternoon_shifts:
-            worked_an_afternoon_shift_yesterday = constraint_model.NewBoolVar(f"afternoon_{afternoon_shift.shift_id}_{employee.employee_id}")
-            afternoon_shift_key = ShiftCombinationsKey(employee.employee_id, afternoon_shift.shift_id)
-            employee_assignment_an_afternoon_shift = worked_an_afternoon_shift_yesterday == shift_combinations[afternoon_shift_key]
+    for afternoon_shift in shift_index.shifts_sorted_by_start_time:
+        if afternoon_start_time <= afternoon_shift.start_time.time():
+            rest_end_time = afternoon_shift.end_time + min_time_between_shifts
 
-            constraint_model.Add(employee_assignment_an_afternoon_shift)
+            for shift in shift_index.get_shifts_starting_between(afternoon_shift.start_time, rest_end_time):
+                conflicting_shifts.append((afternoon_shift, shift))
 
-            forbidden_shifts = []
+    return conflicting_shifts
 
-            for shift in shifts:
-                if shift != afternoon_shift and shift not in forbidden_shifts:
-                    time_between_shift_and_afternoon_shift = shift.start_time - afternoon_shift.end_time
 
-                    if time_between_shift_and_afternoon_shift <= min_time_between_shifts:
-                        forbidden_shifts.append(shift_combinations[ShiftCombinationsKey(employee.employee_id, shift.shift_id)])
-            
-            constraint_model.Add(sum(forbidden_shifts) == 0).OnlyEnforceIf(worked_an_afternoon_shift_yesterday)
-            constraint_model.Add(sum(forbidden_shifts) > 0).OnlyEnforceIf(worked_an_afternoon_shift_yesterday.Not())
+def add_minimum_time_between_a_morning_shift_and_the_shift_before_constraint(shifts: list[Shift], employees: list[Employee], constraint_model: cp_model.CpModel, shift_combinations: dict[ShiftCombinationsKey, IntVar], min_time_between_shifts: datetime.timedelta, afternoon_start_time: datetime.time):
+    conflicting_shifts = get_minimum_rest_conflicting_shifts(shifts, min_time_between_shifts, afternoon_start_time)
+
+    for employee in employees:
+        for afternoon_shift, shift in conflicting_shifts:
+            afternoon_shift_key = ShiftCombinationsKey(employee.employee_id, afternoon_shift.shift_id)
+            shift_key = ShiftCombinationsKey(employee.employee_id, shift.shift_id)
+
+            if afternoon_shift_key in shift_combinations and shift_key in shift_combinations:
+                constraint_model.AddImplication(shift_combinations[afternoon_shift_key], shift_combinations[shift_key].Not())
 
 
 def add_prevent_new_employees_from_working_parallel_shifts_together(shifts: list[Shift], employees: list[Employee], constraint_model: cp_model.CpModel, shift_combinations: dict[ShiftCombinationsKey, IntVar])-> \
@@ -100,7 +135,8 @@ tuple[dict[UUID, IntVar], dict[UUID, IntVar], dict[str, IntVar], dict[str, IntVa
     for shift in shifts:
         # Set the values for new_emps_in_each_shifts and non_new_emps_in_each_shifts for each shift.
         new_emps_work_shift = constraint_model.NewBoolVar(f"new_emps_{shift.shift_id}")
-        new_emps_in_shifts = [shift_combinations[ShiftCombinationsKey(employee.employee_id, shift.shift_id)] for employee in employees if employee.employee_status == EmployeeStatusEnum.new_employee]
+        new_emps = [employee for employee in employees if employee.employee_status == EmployeeStatusEnum.new_employee]
+        new_emps_in_shifts = get_employees_assignments_to_shift(shift, new_emps, shift_combinations)
         not_new_emps_in_shift = [new_emp_in_shift.Not() for new_emp_in_shift in new_emps_in_shifts]
 
         constraint_model.AddBoolOr(new_emps_in_shifts).OnlyEnforceIf(new_emps_work_shift)
@@ -108,19 +144,19 @@ tuple[dict[UUID, IntVar], dict[UUID, IntVar], dict[str, IntVar], dict[str, IntVa
         new_emps_in_each_shifts[shift.shift_id] = new_emps_work_shift
 
         non_new_emps_work_shift = constraint_model.NewBoolVar(f"non_new_emps_{shift.shift_id}")
-        non_new_emps_in_shifts = [shift_combinations[ShiftCombinationsKey(employee.employee_id, shift.shift_id)] for employee in employees if employee.employee_status != EmployeeStatusEnum.new_employee]
+        non_new_emps = [employee for employee in employees if employee.employee_status != EmployeeStatusEnum.new_employee]
+        non_new_emps_in_shifts = get_employees_assignments_to_shift(shift, non_new_emps, shift_combinations)
         not_non_new_emps_in_shifts = [non_new_emp_in_shift.Not() for non_new_emp_in_shift in non_new_emps_in_shifts]
 
         constraint_model.AddBoolOr(non_new_emps_in_shifts).OnlyEnforceIf(non_new_emps_work_shift)
         constraint_model.AddBoolAnd(not_non_new_emps_in_shifts).OnlyEnforceIf(non_new_emps_work_shift.Not())
         non_new_emps_in_each_shifts[shift.shift_id] = non_new_emps_work_shift
 
+    shift_index = get_shift_index(shifts)
+
     for shift in shifts:
-        shifts_without_shift = [s for s in shifts if s != shift]
-        parallel_shifts_to_shift: list[Shift] = get_overlapping_shifts(shift, shifts_without_shift)
-        parallel_shift_permutations: list[list[Shift]] = get_shift_permutations_from_shifts(parallel_shifts_to_shift)
-        fully_overlapping_permutations: list[set[Shift]] = [set(permutation) for permutation in parallel_shift_permutations if is_fully_overlapping(shift, permutation)]
-        hermetic_non_supersets_permutations: list[set[Shift]] = get_permutations_without_supersets(fully_overlapping_permutations)  # Non-supersets
+        parallel_shifts_to_shift: tuple[Shift, ...] = shift_index.overlapping_shifts[shift]
+        hermetic_non_supersets_permutations: list[frozenset[Shift]] = get_minimal_fully_overlapping_shifts_sets(shift, parallel_shifts_to_shift)  # Non-supersets
         for perm in hermetic_non_supersets_permutations:
             add_values_to_fully_non_new_emps_in_all_shift_permutations(perm, fully_non_new_emps_in_all_shift_permutations, constraint_model, non_new_emps_in_each_shifts)
         non_new_emps_in_shift_permutations: dict[str, IntVar] = get_non_new_emps_in_shift_permutations(fully_non_new_emps_in_all_shift_permutations, hermetic_non_supersets_permutations)
@@ -158,6 +194,36 @@ def is_fully_overlapping(comparison_shift, overlapping_shifts: list['Shift']):
     return first_shift_starts_before_shift_starts and last_shift_ends_after_shift_ends
 
 
+# Returns the smallest sets of shifts that together fully overlap "comparison_shift", the sets that "is_fully_overlapping"
+# accepts and that have no accepted subset. Sorted by start time, in such a set only the first shift starts before
+# "comparison_shift" starts, only the last shift ends after "comparison_shift" ends, and every other shift starts during
+# the shift before it, after all the earlier shifts have ended (otherwise the shift before it could be left out).
+def get_minimal_fully_overlapping_shifts_sets(comparison_shift: Shift, overlapping_shifts: list[Shift]) -> list[frozenset[Shift]]:
+    shifts_sorted_by_start_time = sorted(overlapping_shifts, key=lambda shift: shift.start_time)
+    start_times = [shift.start_time for shift in shifts_sorted_by_start_time]
+    minimal_sets: dict[frozenset[Shift], None] = {}
+
+    def extend_shifts_chain(shifts_chain: list[Shift], latest_end_time_before_last_shift: datetime.datetime) -> None:
+        last_shift = shifts_chain[-1]
+
+        if last_shift.end_time >= comparison_shift.end_time:
+            minimal_sets[frozenset(shifts_chain)] = None
+            return
+
+        next_shift_starts_after = max(last_shift.start_time, comparison_shift.start_time, latest_end_time_before_last_shift)
+        first_next_shift = bisect.bisect_right(start_times, next_shift_starts_after)
+        last_next_shift = bisect.bisect_right(start_times, last_shift.end_time)
+
+        for next_shift in shifts_sorted_by_start_time[first_next_shift:last_next_shift]:
+            extend_shifts_chain(shifts_chain + [next_shift], max(latest_end_time_before_last_shift, last_shift.end_time))
+
+    last_first_shift = bisect.bisect_right(start_times, comparison_shift.start_time)
+    for first_shift in shifts_sorted_by_start_time[:last_first_shift]:
+        extend_shifts_chain([first_shift], first_shift.start_time)
+
+    return list(minimal_sets)
+
+
 def add_values_to_fully_non_new_emps_in_all_shift_permutations(shifts: set[Shift], fully_non_new_emps_in_all_shift_permutations: dict[str, IntVar], constraint_model: cp_model.CpModel, non_new_employees_in_shifts: dict[uuid.UUID, IntVar]):
     permutation_id = get_permutation_id(shifts)
     if permutation_id not in fully_non_new_emps_in_all_shift_permutations:
@@ -170,7 +236,7 @@ def add_values_to_fully_non_new_emps_in_all_shift_permutations(shifts: set[Shift
         fully_non_new_emps_in_all_shift_permutations[permutation_id] = non_new_employees_work_perm
 
 
-def get_non_new_emps_in_shift_permutations(non_new_emps_in_all_permutations: dict[str, IntVar], permutations: list[set[Shift]]) -> dict[str, IntVar]:
+def get_non_new_emps_in_shift_permutations(non_new_emps_in_all_permutations: dict[str, IntVar], permutations: list[frozenset[Shift]]) -> dict[str, IntVar]:
     non_new_emps_in_shift_permutations: dict[str, IntVar] = {}
 
     for shifts_permutation in permutations:
@@ -180,105 +246,181 @@ def get_non_new_emps_in_shift_permutations(non_new_emps_in_all_permutations: dic
     return non_new_emps_in_shift_permutations
 
 
-def get_permutations_without_supersets(fully_overlapping_permutations: list[set[Shift]]) -> list[set[Shift]]:
-    super_perms: list[set[Shift]] = []
-    for overlapping_permutation in fully_overlapping_permutations:
-        if overlapping_permutation in super_perms:
-            continue
-        else:
-            for other_overlapping_permutation in fully_overlapping_permutations:
-                if overlapping_permutation != other_overlapping_permutation and other_overlapping_permutation.issuperset(overlapping_permutation):
-                    super_perms.append(other_overlapping_permutation)
-
-    # Sets are not hashable because they are mutable. Converting these lists to frozensets allows me to use the "-"
-    # operator, because then these lists are immutable and hashable.
-    frozenset_fully_overlapping_permutations = {frozenset(perm) for perm in fully_overlapping_permutations}
-    frozenset_super_perms = {frozenset(perm) for perm in super_perms}
-
-    perfect_overlapping_permutations = list(frozenset_fully_overlapping_permutations - frozenset_super_perms)
-    return perfect_overlapping_permutations
-
+def get_permutation_id(shifts: set[Shift]) -> str:
+    # UUID is not lexicographically sortable
+    shifts_sorted_by_id = sorted(shifts, key= lambda shift: str(shift.shift_id))
+    return f"perm_{''.join([str(shift.shift_id) for shift in shifts_sorted_by_id])}"
 
-def get_overlapping_shifts(shift: Shift, shifts: list[Shift]) -> list[Shift]:
-    overlapping_shifts_to_shift: list[Shift] = []
-    for comparison_shift in shifts:
-        if shift.overlaps_with(comparison_shift):
-            overlapping_shifts_to_shift.append(comparison_shift)
-    return overlapping_shifts_to_shift
 
+def add_prevent_overlapping_shifts_for_employees_constraint(shifts: list[Shift], employees: list[Employee], constraint_model: cp_model.CpModel, shift_combinations: dict[ShiftCombinationsKey, IntVar]) -> None:
+    overlapping_shifts_cliques = [clique for clique in get_shift_index(shifts).overlapping_shifts_cliques if len(clique) > 1]
 
-def get_shift_permutations_from_shifts(parallel_shifts: list[Shift]) -> list[list[Shift]]:
-    permutations_lists: list[list[Shift]] = []
+    for employee in employees:
+        for overlapping_shifts in overlapping_shifts_cliques:
+            overlapping_shifts_for_employee: list[IntVar] = get_employee_assignments_to_shifts(employee, overlapping_shifts, shift_combinations)
 
-    for permutation_size in range(1, len(parallel_shifts) + 1):
-        p: Tuple[Shift]
-        permutations = [list(p) for p in itertools.permutations(parallel_shifts, permutation_size)]
+            if len(overlapping_shifts_for_employee) > 1:
+                constraint_model.AddAtMostOne(overlapping_shifts_for_employee)
 
-        for permutation in permutations:
-            permutations_lists.append(permutation)
 
-    return permutations_lists
+# The shifts times in the model are the number of microseconds from the start of the first shift, so shifts that only
+# touch each other are not overlapping in the model either.
+def get_shift_time_in_model(time: datetime.datetime, first_shift_start_time: datetime.datetime) -> int:
+    return (time - first_shift_start_time) // datetime.timedelta(microseconds=1)
 
 
-def get_permutation_id(shifts: set[Shift]) -> str:
-    # UUID is not lexicographically sortable
-    shifts_sorted_by_id = sorted(shifts, key= lambda shift: str(shift.shift_id))
-    return f"perm_{''.join([str(shift.shift_id) for shift in shifts_sorted_by_id])}"
+# The same as "add_prevent_overlapping_shifts_for_employees_constraint", using an optional interval for each assignment
+# and one "AddNoOverlap" for each employee. When a minimum time between shifts is given, the interval of a shift that
+# starts after "afternoon_start_time" is extended by that time, so the employee is not working a shift that starts
+# before the employee had a rest.
+def add_prevent_overlapping_shifts_for_employees_with_intervals_constraint(shifts: list[Shift], employees: list[Employee], constraint_model: cp_model.CpModel, shift_combinations: dict[ShiftCombinationsKey, IntVar], min_time_between_shifts: datetime.timedelta | None = None, afternoon_start_time: datetime.time | None = None) -> \
+dict[ShiftCombinationsKey, IntervalVar]:
+    shift_intervals: dict[ShiftCombinationsKey, IntervalVar] = {}
+    if not shifts:
+        return shift_intervals
 
+    first_shift_start_time = get_shift_index(shifts).start_times[0]
 
-def add_prevent_overlapping_shifts_for_employees_constraint(shifts: list[Shift], employees: list[Employee], constraint_model: cp_model.CpModel, shift_combinations: dict[ShiftCombinationsKey, IntVar]) -> None:
     for employee in employees:
-        seen_shifts = []
-        for shift in shifts:
-            overlapping_shifts_for_employee: list[IntVar] = []
-            for comparison_shift in shifts:
-                if shift.overlaps_with(comparison_shift) and comparison_shift not in seen_shifts:
-                    key = ShiftCombinationsKey(employee.employee_id, comparison_shift.shift_id)
-                    overlapping_shifts_for_employee.append(shift_combinations[key])
-                    seen_shifts.append(shift)
-            constraint_model.AddAtMostOne(overlapping_shifts_for_employee)
+        employee_shift_intervals: list[IntervalVar] = []
 
+        for shift in shifts:
+            key = ShiftCombinationsKey(employee.employee_id, shift.shift_id)
+            if key not in shift_combinations:
+                continue
+
+            shift_end_time = shift.end_time
+            if min_time_between_shifts is not None and afternoon_start_time is not None and afternoon_start_time <= shift.start_time.time():
+                shift_end_time += min_time_between_shifts
+
+            interval_start = get_shift_time_in_model(shift.start_time, first_shift_start_time)
+            interval_size = get_shift_time_in_model(shift_end_time, shift.start_time)
+            shift_intervals[key] = constraint_model.NewOptionalFixedSizeIntervalVar(interval_start, interval_size, shift_combinations[key], f"interval_employee_{employee.employee_id}_shift_{shift.shift_id}")
+            employee_shift_intervals.append(shift_intervals[key])
+
+        if len(employee_shift_intervals) > 1:
+            constraint_model.AddNoOverlap(employee_shift_intervals)
+
+    return shift_intervals
+
+
+# The line between the squares of "k" and "k + 1" is "(2k + 1) * deviation - k(k + 1)". The square of an integer deviation
+# is the highest of these lines at it, so a minimized square is bounded by all of them, and is exact without a product.
+def add_squared_deviation_constraint(constraint_model: cp_model.CpModel, deviation: IntVar, squared_deviation: IntVar, max_deviation: int,
+                                     squared_deviation_encoding: SquaredDeviationEncodingEnum) -> None:
+    if squared_deviation_encoding == SquaredDeviationEncodingEnum.ELEMENT:
+        constraint_model.AddElement(deviation, [pow(value, 2) for value in range(max_deviation + 1)], squared_deviation)
+    elif squared_deviation_encoding == SquaredDeviationEncodingEnum.PIECEWISE_LINEAR:
+        for value in range(max_deviation):
+            constraint_model.Add(squared_deviation >= (2 * value + 1) * deviation - value * (value + 1))
+    else:
+        constraint_model.AddMultiplicationEquality(squared_deviation, deviation, deviation)
+
+
+# An employee's shifts before the scheduled shifts are counted from "prior_shifts_counts", and the number of shifts an
+# employee aspires to is their position, unless "shifts_targets" has a target for them.
+def add_aspire_for_minimal_deviation_between_employees_position_and_number_of_shifts_given_constraint(shifts: list[Shift], employees: list[Employee], constraint_model: cp_model.CpModel, shift_combinations: dict[ShiftCombinationsKey, IntVar],
+                                                                                                      squared_deviation_encoding: SquaredDeviationEncodingEnum = SquaredDeviationEncodingEnum.PIECEWISE_LINEAR,
+                                                                                                      prior_shifts_counts: dict[uuid.UUID | str, int] | None = None,
+                                                                                                      shifts_targets: dict[uuid.UUID | str, int] | None = None) -> list[IntVar]:
+    prior_shifts_counts = prior_shifts_counts if prior_shifts_counts is not None else {}
+    shifts_targets = shifts_targets if shifts_targets is not None else {}
 
-def add_aspire_for_minimal_deviation_between_employees_position_and_number_of_shifts_given_constraint(shifts: list[Shift], employees: list[Employee], constraint_model: cp_model.CpModel, shift_combinations: dict[ShiftCombinationsKey, IntVar]) -> list[IntVar]:
     deviations = []
     for employee in employees:
-        emp_shifts = [shift_combinations[ShiftCombinationsKey(employee.employee_id, shift.shift_id)] for shift in shifts]
-        deviation = constraint_model.NewIntVar(0, len(emp_shifts), f'deviation_{employee.employee_id}')
-        multy_deviation = constraint_model.NewIntVar(0, pow(len(emp_shifts), 2), f'multy_deviation_{employee.employee_id}')
-
-        constraint_model.AddAbsEquality(deviation, sum(emp_shifts) - employee.position.value)
-        constraint_model.AddMultiplicationEquality(multy_deviation, deviation, deviation)
+        emp_shifts = get_employee_assignments_to_shifts(employee, shifts, shift_combinations)
+        prior_shifts_count = prior_shifts_counts.get(employee.employee_id, 0)
+        shifts_target = shifts_targets.get(employee.employee_id, employee.position.value)
+        max_deviation = max(abs(prior_shifts_count - shifts_target), abs(prior_shifts_count + len(emp_shifts) - shifts_target))
+        deviation = constraint_model.NewIntVar(0, max_deviation, f'deviation_{employee.employee_id}')
+        multy_deviation = constraint_model.NewIntVar(0, pow(max_deviation, 2), f'multy_deviation_{employee.employee_id}')
+
+        constraint_model.AddAbsEquality(deviation, prior_shifts_count + sum(emp_shifts) - shifts_target)
+        add_squared_deviation_constraint(constraint_model, deviation, multy_deviation, max_deviation, squared_deviation_encoding)
         deviations.append(multy_deviation)
-    constraint_model.Minimize(sum(deviations))
+    add_objective_term(constraint_model, POSITION_DEVIATION_OBJECTIVE_TERM, sum(deviations), priority=POSITION_DEVIATION_OBJECTIVE_PRIORITY)
     return deviations
 
 
+# Every fixed shift is worked by its employee. A fixed employee who can not work the shift raises a ValueError.
+def add_fixed_assignments_constraint(shifts: list[Shift], employees: list[Employee], constraint_model: cp_model.CpModel, shift_combinations: dict[ShiftCombinationsKey, IntVar],
+                                     fixed_assignments: dict[uuid.UUID | str, uuid.UUID | str]) -> None:
+    shifts_ids = {shift.shift_id for shift in shifts}
+
+    for shift_id, employee_id in fixed_assignments.items():
+        if shift_id not in shifts_ids:
+            continue
+
+        fixed_assignment = shift_combinations.get(ShiftCombinationsKey(employee_id, shift_id))
+        if fixed_assignment is None:
+            raise ValueError(f"The employee {employee_id} is fixed to the shift {shift_id}, which they can not work")
+
+        constraint_model.Add(fixed_assignment == 1)
+
+
 def add_aspire_to_maximize_all_employees_preferences_constraint(shifts: list[Shift], employees: list[Employee], constraint_model: cp_model.CpModel, shift_combinations: dict[ShiftCombinationsKey, IntVar]):
     emps_shifts_prefs = []
     emps_days_pref_not_to_work = []
 
-    for employee in employees:
+    shift_index = get_shift_index(shifts)
+    preferences_matrices = create_employees_preferences_matrices(employees, shift_index)
+    get_shifts_in_matrix_row = lambda matrix_row: [shift_index.shifts_sorted_by_start_time[shift_position] for shift_position in np.flatnonzero(matrix_row)]
+
+    for employee_row, employee in enumerate(employees):
 
-        employee_pref_shifts_by_id = employee.shifts_preferences.shifts_wants_to_work.get_shifts_preference(shifts)
-        emp_shift_pref_assignments = [shift_combinations[ShiftCombinationsKey(employee.employee_id, shift.shift_id)] for shift in employee_pref_shifts_by_id]
+        employee_pref_shifts_by_id = get_shifts_in_matrix_row(preferences_matrices.wants_to_work[employee_row])
+        emp_shift_pref_assignments = get_employee_assignments_to_shifts(employee, employee_pref_shifts_by_id, shift_combinations)
         emps_shifts_prefs.append(sum(emp_shift_pref_assignments) * employee.priority.value)
 
-        employee_shifts_cannot_work_by_id = employee.shifts_preferences.shifts_cannot_work.get_shifts_preference(shifts)
-        employee_shifts_cannot_work_assignments = [shift_combinations[ShiftCombinationsKey(employee.employee_id, shift.shift_id)] for shift in employee_shifts_cannot_work_by_id]
-        constraint_model.Add(sum(employee_shifts_cannot_work_assignments) == 0)
+        employee_shifts_cannot_work_by_id = get_shifts_in_matrix_row(preferences_matrices.cannot_work[employee_row])
+        employee_shifts_cannot_work_assignments = get_employee_assignments_to_shifts(employee, employee_shifts_cannot_work_by_id, shift_combinations)
+        if employee_shifts_cannot_work_assignments:
+            constraint_model.Add(sum(employee_shifts_cannot_work_assignments) == 0)
 
-        employee_shifts_in_days_prefer_not_to_work = employee.shifts_preferences.shifts_prefer_not_to_work.get_shifts_preference(shifts)
-        employee_shifts_in_days_prefer_not_to_work_assignments = [shift_combinations[ShiftCombinationsKey(employee.employee_id, shift.shift_id)] for shift in employee_shifts_in_days_prefer_not_to_work]
+        employee_shifts_in_days_prefer_not_to_work = get_shifts_in_matrix_row(preferences_matrices.prefer_not_to_work[employee_row])
+        employee_shifts_in_days_prefer_not_to_work_assignments = get_employee_assignments_to_shifts(employee, employee_shifts_in_days_prefer_not_to_work, shift_combinations)
         emps_days_pref_not_to_work.append(sum(employee_shifts_in_days_prefer_not_to_work_assignments) * (math.ceil(1 / employee.priority.value)))
 
-    constraint_model.Minimize(sum(emps_days_pref_not_to_work))
-    constraint_model.Maximize(sum(emps_shifts_prefs))
+    add_objective_term(constraint_model, PREFERRED_SHIFTS_OBJECTIVE_TERM, sum(emps_shifts_prefs), maximize=True, priority=PREFERENCES_OBJECTIVE_PRIORITY)
+    add_objective_term(constraint_model, SHIFTS_PREFERRED_NOT_TO_WORK_OBJECTIVE_TERM, sum(emps_days_pref_not_to_work), priority=PREFERENCES_OBJECTIVE_PRIORITY)
+
+
+# "row" is lexicographically greater or equal to "other_row": the first assignment in which they differ is in "row".
+# Every "equal_prefix" literal is true when the rows are equal up to its column, and then the next column is ordered.
+def add_lexicographic_greater_or_equal_constraint(constraint_model: cp_model.CpModel, row: list[IntVar], other_row: list[IntVar], name: str) -> None:
+    equal_prefix = []
+
+    for column, (assignment, other_assignment) in enumerate(zip(row, other_row)):
+        constraint_model.Add(assignment >= other_assignment).OnlyEnforceIf(equal_prefix)
+
+        if column < len(row) - 1:
+            next_equal_prefix = constraint_model.NewBoolVar(f'{name}_equal_prefix_{column}')
+            constraint_model.AddBoolOr([next_equal_prefix, assignment, other_assignment]).OnlyEnforceIf(equal_prefix)
+            constraint_model.AddBoolOr([next_equal_prefix, assignment.Not(), other_assignment.Not()]).OnlyEnforceIf(equal_prefix)
+            equal_prefix = [next_equal_prefix]
+
+
+# Interchangeable employees can swap all their shifts without changing the schedule's constraints or objective, so only
+# one order of each equivalence class is searched: the assignment rows of the class are lexicographically decreasing.
+def add_break_interchangeable_employees_symmetry_constraint(shifts: list[Shift], employees: list[Employee], constraint_model: cp_model.CpModel, shift_combinations: dict[ShiftCombinationsKey, IntVar],
+                                                            employees_schedule_states: dict[uuid.UUID | str, Hashable] | None = None) -> None:
+    shifts_sorted_by_start_time = get_shift_index(shifts).shifts_sorted_by_start_time
+
+    for equivalence_class in get_employees_equivalence_classes(employees, employees_schedule_states):
+        # Employees of the same class are eligible to the same shifts, so their rows have the same columns
+        assignments_rows = [get_employee_assignments_to_shifts(employee, shifts_sorted_by_start_time, shift_combinations) for employee in equivalence_class]
+
+        for employee, row, next_row in zip(equivalence_class, assignments_rows, assignments_rows[1:]):
+            add_lexicographic_greater_or_equal_constraint(constraint_model, row, next_row, f'symmetry_{employee.employee_id}')
 
 
 def add_employees_can_work_only_shifts_that_they_trained_for_constraint(shifts: list[Shift], employees: list[Employee], constraint_model: cp_model.CpModel, shift_combinations: dict[ShiftCombinationsKey, IntVar]):
+    shift_index = get_shift_index(shifts)
+
     for emp in employees:
-        shifts_cannot_work = [shift for shift in shifts if shift.shift_type not in emp.shift_types_trained_to_do]
+        shifts_cannot_work = [shift for shift_type, shifts_of_type in shift_index.shifts_by_type.items() if shift_type not in emp.shift_types_trained_to_do for shift in shifts_of_type]
 
         for shift in shifts_cannot_work:
             key = ShiftCombinationsKey(emp.employee_id, shift.shift_id)
-            constraint_model.Add(shift_combinations[key] == 0)
+            if key in shift_combinations:
+                constraint_model.Add(shift_combinations[key] == 0)
@@ -0,0 +1 @@
+from src.models.employees.employee_status_enum import EmployeeStatusEnum
@@ -0,0 +1 @@
+from .employees_shifts_preferences import EmployeesShiftsPreferences
@@ -3,10 +3,10 @@ from typing import Union
 
 import pydantic
 
+from .compiled_shifts_preference import CompiledShiftsPreference, combine_compiled_shifts_preferences
 from .date_time_range_preference_ import DateTimeRangePreference
 from .shifts_preference import ShiftsPreference
 from .shifts_preference_by_id import ShiftIdPreference
-from src.models.shifts.shift import Shift
 from src.models.solution.pydantic_config import ConfigPydanticDataclass
 
 
@@ -14,10 +14,6 @@ from src.models.solution.pydantic_config import ConfigPydanticDataclass
 class CombinePreference(ShiftsPreference):
     preferences: list[Union[DateTimeRangePreference, ShiftIdPreference]] = field(default_factory=list)
 
-    def get_shifts_preference(self, shifts: list[Shift]) -> list[Shift]:
-        all_shifts_in_preferences = []
-
-        for preference in self.preferences:
-            all_shifts_in_preferences.extend(preference.get_shifts_preference(shifts))
-
-        return all_shifts_in_preferences
+    # A shift that is in more than one of the preferences is in the combined preference once.
+    def compile_preference(self) -> CompiledShiftsPreference:
+        return combine_compiled_shifts_preferences([preference.compiled_preference for preference in self.preferences])
@@ -0,0 +1,67 @@
+import bisect
+import datetime
+import uuid
+from dataclasses import dataclass
+
+from src.models.shifts.shift import Shift
+
+TimeRange = tuple[datetime.datetime, datetime.datetime]
+
+
+# Returns the given closed time ranges sorted, with every group of overlapping (or touching) ranges merged into one.
+def merge_time_ranges(time_ranges: list[TimeRange]) -> list[TimeRange]:
+    merged_time_ranges: list[TimeRange] = []
+
+    for range_start, range_end in sorted(time_ranges):
+        if merged_time_ranges and range_start <= merged_time_ranges[-1][1]:
+            last_range_start, last_range_end = merged_time_ranges[-1]
+            merged_time_ranges[-1] = (last_range_start, max(last_range_end, range_end))
+        else:
+            merged_time_ranges.append((range_start, range_end))
+
+    return merged_time_ranges
+
+
+def is_time_inside_time_ranges(time: datetime.datetime, time_ranges: list[TimeRange], time_ranges_starts: list[datetime.datetime]) -> bool:
+    last_range_starting_before_time = bisect.bisect_right(time_ranges_starts, time) - 1
+
+    return last_range_starting_before_time >= 0 and time <= time_ranges[last_range_starting_before_time][1]
+
+
+# The canonical form of a preference: a shift is in the preference if its id is one of "shifts_ids", if it starts inside
+# one of "start_time_ranges" or if it ends inside one of "end_time_ranges". The time ranges are merged, so a shift is
+# checked with one bisect for each of them, no matter how many ranges the preference was made of.
+@dataclass(frozen=True)
+class CompiledShiftsPreference:
+    start_time_ranges: list[TimeRange]
+    start_time_ranges_starts: list[datetime.datetime]
+    end_time_ranges: list[TimeRange]
+    end_time_ranges_starts: list[datetime.datetime]
+    shifts_ids: frozenset[uuid.UUID | str]
+
+    def is_shift_in_preference(self, shift: Shift) -> bool:
+        return shift.shift_id in self.shifts_ids or \
+            is_time_inside_time_ranges(shift.start_time, self.start_time_ranges, self.start_time_ranges_starts) or \
+            is_time_inside_time_ranges(shift.end_time, self.end_time_ranges, self.end_time_ranges_starts)
+
+    def get_shifts_preference(self, shifts: list[Shift]) -> list[Shift]:
+        return [shift for shift in shifts if self.is_shift_in_preference(shift)]
+
+
+def create_compiled_shifts_preference(start_time_ranges: list[TimeRange] = (), end_time_ranges: list[TimeRange] = (),
+                                      shifts_ids: frozenset[uuid.UUID | str] = frozenset()) -> CompiledShiftsPreference:
+    merged_start_time_ranges = merge_time_ranges(list(start_time_ranges))
+    merged_end_time_ranges = merge_time_ranges(list(end_time_ranges))
+
+    return CompiledShiftsPreference(start_time_ranges=merged_start_time_ranges,
+                                    start_time_ranges_starts=[range_start for range_start, _ in merged_start_time_ranges],
+                                    end_time_ranges=merged_end_time_ranges,
+                                    end_time_ranges_starts=[range_start for range_start, _ in merged_end_time_ranges],
+                                    shifts_ids=frozenset(shifts_ids))
+
+
+def combine_compiled_shifts_preferences(compiled_preferences: list[CompiledShiftsPreference]) -> CompiledShiftsPreference:
+    return create_compiled_shifts_preference(
+        start_time_ranges=[time_range for compiled_preference in compiled_preferences for time_range in compiled_preference.start_time_ranges],
+        end_time_ranges=[time_range for compiled_preference in compiled_preferences for time_range in compiled_preference.end_time_ranges],
+        shifts_ids=frozenset().union(*[compiled_preference.shifts_ids for compiled_preference in compiled_preferences]))
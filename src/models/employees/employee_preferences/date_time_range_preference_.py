@@ -2,8 +2,9 @@ import datetime
 
 import pydantic
 
+from src.models.employees.employee_preferences.compiled_shifts_preference import CompiledShiftsPreference, \
+    create_compiled_shifts_preference
 from src.models.employees.employee_preferences.shifts_preference import ShiftsPreference
-from src.models.shifts.shift import Shift
 from src.models.solution.pydantic_config import ConfigPydanticDataclass
 
 
@@ -12,14 +13,11 @@ class DateTimeRangePreference(ShiftsPreference):
     range_start: datetime.datetime
     range_end: datetime.datetime
 
-    def get_shifts_preference(self, shifts: list[Shift]) -> list[Shift]:
-        shifts_inside_range_day_preference = []
+    # A shift is in the range if it starts inside it. When the range is reversed (its end is before its start), a shift
+    # that ends inside it is in the range as well.
+    def compile_preference(self) -> CompiledShiftsPreference:
+        if self.range_start < self.range_end:
+            return create_compiled_shifts_preference(start_time_ranges=[(self.range_start, self.range_end)])
 
-        for shift in shifts:
-
-            if self.range_start >= shift.start_time >= self.range_end or \
-                    self.range_start >= shift.end_time >= self.range_end or\
-                    self.range_start <= shift.start_time <= self.range_end:
-                shifts_inside_range_day_preference.append(shift)
-
-        return shifts_inside_range_day_preference
+        reversed_range = (self.range_end, self.range_start)
+        return create_compiled_shifts_preference(start_time_ranges=[reversed_range], end_time_ranges=[reversed_range])
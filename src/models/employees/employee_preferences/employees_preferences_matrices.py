@@ -0,0 +1,80 @@
+import datetime
+from dataclasses import dataclass
+
+import numpy as np
+
+from .compiled_shifts_preference import TimeRange
+from .shifts_preference import ShiftsPreference
+from src.models.employees.employee import Employee
+from src.models.shifts.shift_index import ShiftIndex
+
+
+@dataclass(frozen=True)
+class EmployeesPreferencesMatrices:
+    # employee (in the given order) x shift (in "ShiftIndex.shifts_sorted_by_start_time" order)
+    wants_to_work: np.ndarray
+    prefer_not_to_work: np.ndarray
+    cannot_work: np.ndarray
+
+
+def get_time_in_microseconds(times: list[datetime.datetime], reference_time: datetime.datetime) -> np.ndarray:
+    return np.array([(time - reference_time) // datetime.timedelta(microseconds=1) for time in times], dtype=np.int64)
+
+
+# Returns a matrix of the employees and "sorted_times", where the times inside one of the time ranges of an employee are
+# True. The time ranges of all the employees are found with one binary search, and every range adds 1 to the row of its
+# employee where it starts and -1 where it ends, so a time is inside a range where the running sum of its row is positive.
+def get_sorted_times_inside_employees_time_ranges(sorted_times: np.ndarray, employees_time_ranges: list[list[TimeRange]],
+                                                   reference_time: datetime.datetime) -> np.ndarray:
+    ranges_employees_rows = np.array([employee_row for employee_row, time_ranges in enumerate(employees_time_ranges) for _ in time_ranges], dtype=np.int64)
+    ranges_starts = get_time_in_microseconds([range_start for time_ranges in employees_time_ranges for range_start, _ in time_ranges], reference_time)
+    ranges_ends = get_time_in_microseconds([range_end for time_ranges in employees_time_ranges for _, range_end in time_ranges], reference_time)
+
+    first_positions = np.searchsorted(sorted_times, ranges_starts, side="left")
+    last_positions = np.searchsorted(sorted_times, ranges_ends, side="right")
+    non_empty_ranges = first_positions < last_positions
+
+    ranges_edges = np.zeros((len(employees_time_ranges), len(sorted_times) + 1), dtype=np.int64)
+    np.add.at(ranges_edges, (ranges_employees_rows[non_empty_ranges], first_positions[non_empty_ranges]), 1)
+    np.add.at(ranges_edges, (ranges_employees_rows[non_empty_ranges], last_positions[non_empty_ranges]), -1)
+
+    return np.cumsum(ranges_edges, axis=1)[:, :-1] > 0
+
+
+# Evaluates one kind of preference of all the employees at once. The shifts of the index are sorted by their start time,
+# so the shifts that start inside a merged time range of a compiled preference are a slice of them, found with a binary
+# search over the ranges of all the employees together.
+def create_preferences_matrix(employees_preferences: list[ShiftsPreference], shift_index: ShiftIndex) -> np.ndarray:
+    number_of_shifts = len(shift_index.shifts_sorted_by_start_time)
+    preferences_matrix = np.zeros((len(employees_preferences), number_of_shifts), dtype=bool)
+    if number_of_shifts == 0:
+        return preferences_matrix
+
+    reference_time = shift_index.start_times[0]
+    shifts_start_times = get_time_in_microseconds(shift_index.start_times, reference_time)
+    shifts_end_times = get_time_in_microseconds(shift_index.end_times, reference_time)
+    shifts_positions_sorted_by_end_time = np.argsort(shifts_end_times, kind="stable")
+    sorted_shifts_end_times = shifts_end_times[shifts_positions_sorted_by_end_time]
+    compiled_preferences = [employee_preference.compiled_preference for employee_preference in employees_preferences]
+
+    preferred_shifts_ids = [(employee_row, shift_index.shift_position_by_id[shift_id]) for employee_row, compiled_preference in enumerate(compiled_preferences)
+                            for shift_id in compiled_preference.shifts_ids if shift_id in shift_index.shift_position_by_id]
+    if preferred_shifts_ids:
+        employees_rows, shifts_positions = zip(*preferred_shifts_ids)
+        preferences_matrix[list(employees_rows), list(shifts_positions)] = True
+
+    preferences_matrix |= get_sorted_times_inside_employees_time_ranges(shifts_start_times, [compiled_preference.start_time_ranges for compiled_preference in compiled_preferences],
+                                                                        reference_time)
+
+    inside_end_time_ranges = get_sorted_times_inside_employees_time_ranges(sorted_shifts_end_times, [compiled_preference.end_time_ranges for compiled_preference in compiled_preferences],
+                                                                           reference_time)
+    preferences_matrix[:, shifts_positions_sorted_by_end_time] |= inside_end_time_ranges
+
+    return preferences_matrix
+
+
+def create_employees_preferences_matrices(employees: list[Employee], shift_index: ShiftIndex) -> EmployeesPreferencesMatrices:
+    return EmployeesPreferencesMatrices(
+        wants_to_work=create_preferences_matrix([employee.shifts_preferences.shifts_wants_to_work for employee in employees], shift_index),
+        prefer_not_to_work=create_preferences_matrix([employee.shifts_preferences.shifts_prefer_not_to_work for employee in employees], shift_index),
+        cannot_work=create_preferences_matrix([employee.shifts_preferences.shifts_cannot_work for employee in employees], shift_index))
@@ -9,7 +9,7 @@ from .no_preferences import NoPreference
 from src.models.solution.pydantic_config import ConfigPydanticDataclass
 from .shifts_preference_by_id import ShiftIdPreference
 
-PreferenceType = Union[CombinePreference, DateTimeRangePreference, NoPreference, ShiftIdPreference]
+PreferenceType = Union[NoPreference, CombinePreference, DateTimeRangePreference, ShiftIdPreference]
 
 
 @pydantic.dataclasses.dataclass(config=ConfigPydanticDataclass)
@@ -1,7 +1,9 @@
+import functools
 from abc import abstractmethod
 
 import pydantic
 
+from src.models.employees.employee_preferences.compiled_shifts_preference import CompiledShiftsPreference
 from src.models.shifts.shift import Shift
 from src.models.solution.pydantic_config import ConfigPydanticDataclass
 
@@ -10,5 +12,13 @@ from src.models.solution.pydantic_config import ConfigPydanticDataclass
 class ShiftsPreference:
 
     @abstractmethod
-    def get_shifts_preference(self, shifts: list[Shift]) -> list[Shift]:
+    def compile_preference(self) -> CompiledShiftsPreference:
         raise NotImplementedError
+
+    # A preference is compiled the first time it is used, and is not expected to change after that.
+    @functools.cached_property
+    def compiled_preference(self) -> CompiledShiftsPreference:
+        return self.compile_preference()
+
+    def get_shifts_preference(self, shifts: list[Shift]) -> list[Shift]:
+        return self.compiled_preference.get_shifts_preference(shifts)
@@ -3,16 +3,15 @@ from dataclasses import field
 
 import pydantic
 
+from src.models.employees.employee_preferences.compiled_shifts_preference import CompiledShiftsPreference, \
+    create_compiled_shifts_preference
 from src.models.employees.employee_preferences.shifts_preference import ShiftsPreference
-from src.models.shifts.shift import Shift
 from src.models.solution.pydantic_config import ConfigPydanticDataclass
 
 
 @pydantic.dataclasses.dataclass(config=ConfigPydanticDataclass)
 class ShiftIdPreference(ShiftsPreference):
-    shifts_pref_by_id: list[uuid] = field(default_factory=list)
+    shifts_pref_by_id: list[uuid.UUID | str] = field(default_factory=list)
 
-    def get_shifts_preference(self, shifts: list[Shift]) -> list[Shift]:
-        shifts = [shift for shift in shifts if shift.shift_id in self.shifts_pref_by_id]
-
-        return shifts
+    def compile_preference(self) -> CompiledShiftsPreference:
+        return create_compiled_shifts_preference(shifts_ids=frozenset(self.shifts_pref_by_id))
@@ -0,0 +1,48 @@
+import uuid
+from typing import Hashable
+
+from src.models.employees.employee import Employee
+from src.models.employees.employee_position_enum import EmployeePositionEnum
+from src.models.employees.employee_preferences.no_preferences import NoPreference
+from src.models.employees.employee_priority_enum import EmployeePriorityEnum
+from src.models.employees.employee_status_enum import EmployeeStatusEnum
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+
+EmployeeEquivalenceKey = tuple[frozenset[ShiftTypesEnum], EmployeeStatusEnum, EmployeePriorityEnum, EmployeePositionEnum]
+
+
+# Employees with the same key are interchangeable in every constraint. Employees with preferences are never
+# interchangeable, so they have no key.
+def get_employee_equivalence_key(employee: Employee) -> EmployeeEquivalenceKey | None:
+    preferences = employee.shifts_preferences
+    if not all(isinstance(preference, NoPreference) for preference in [preferences.shifts_cannot_work, preferences.shifts_prefer_not_to_work,
+                                                                        preferences.shifts_wants_to_work]):
+        return None
+
+    return frozenset(employee.shift_types_trained_to_do), employee.employee_status, employee.priority, employee.position
+
+
+# Returns the groups of at least two interchangeable employees, each in the order of the given employees. Employees in
+# a different state before the schedule (with other prior shifts or fixed assignments) are not interchangeable.
+def get_employees_equivalence_classes(employees: list[Employee], employees_schedule_states: dict[uuid.UUID | str, Hashable] | None = None) -> list[list[Employee]]:
+    employees_schedule_states = employees_schedule_states if employees_schedule_states is not None else {}
+    employees_by_equivalence_key: dict[tuple[EmployeeEquivalenceKey, Hashable], list[Employee]] = {}
+
+    for employee in employees:
+        equivalence_key = get_employee_equivalence_key(employee)
+        if equivalence_key is not None:
+            employees_by_equivalence_key.setdefault((equivalence_key, employees_schedule_states.get(employee.employee_id)), []).append(employee)
+
+    return [equivalence_class for equivalence_class in employees_by_equivalence_key.values() if len(equivalence_class) > 1]
+
+
+# Every employee in an equivalence class is represented by the first employee of the class, and every other employee by
+# themselves.
+def get_employees_canonical_ids(employees: list[Employee], employees_schedule_states: dict[uuid.UUID | str, Hashable] | None = None) -> dict[uuid.UUID | str, uuid.UUID | str]:
+    employees_canonical_ids = {employee.employee_id: employee.employee_id for employee in employees}
+
+    for equivalence_class in get_employees_equivalence_classes(employees, employees_schedule_states):
+        for employee in equivalence_class:
+            employees_canonical_ids[employee.employee_id] = equivalence_class[0].employee_id
+
+    return employees_canonical_ids
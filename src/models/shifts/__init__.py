@@ -0,0 +1,2 @@
+from .shift_combinations_key import ShiftCombinationsKey
+from .shifts_types_enum import ShiftTypesEnum
@@ -0,0 +1,10 @@
+from ortools.sat.python.cp_model import IntVar
+
+from src.models.shifts.shift_combinations_key import ShiftCombinationsKey
+
+
+class EligibleShiftCombinations(dict[ShiftCombinationsKey, IntVar]):
+    # Holds only the employee and shift pairs that the employee can ever work. A pair that is missing (the employee is
+    # not trained for the shift or cannot work it) has no variable in the model, and is never assigned. Looking it up
+    # raises a KeyError, so a pair that may be missing is read with "get", which returns None for it.
+    pass
@@ -7,7 +7,7 @@ from .shifts_types_enum import ShiftTypesEnum
 
 @dataclass(frozen=True)
 class Shift:
-    shift_id: uuid.UUID
+    shift_id: uuid.UUID | str
     shift_type: ShiftTypesEnum
     start_time: datetime.datetime
     end_time: datetime.datetime
@@ -0,0 +1,110 @@
+import bisect
+import datetime
+import functools
+import types
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Mapping
+
+from .shift import Shift
+from .shifts_types_enum import ShiftTypesEnum
+
+SHIFT_INDEX_CACHE_SIZE = 64
+
+
+# The index is shared by every caller with the same shifts (see "get_shift_index"), so it only holds tuples and read-only
+# mappings that no caller can change under the others.
+@dataclass(frozen=True)
+class ShiftIndex:
+    shifts_sorted_by_start_time: tuple[Shift, ...]
+    start_times: tuple[datetime.datetime, ...]
+    end_times: tuple[datetime.datetime, ...]
+    shifts_by_day: Mapping[datetime.date, tuple[Shift, ...]]
+    shifts_by_type: Mapping[ShiftTypesEnum, tuple[Shift, ...]]
+    overlapping_shifts_cliques: tuple[tuple[Shift, ...], ...]
+    overlapping_shifts: Mapping[Shift, tuple[Shift, ...]]
+
+    # shift id, the position of the shift in "shifts_sorted_by_start_time"
+    shift_position_by_id: Mapping[uuid.UUID | str, int]
+
+    def get_shifts_starting_between(self, after_time: datetime.datetime, before_time: datetime.datetime) -> list[Shift]:
+        first_shift = bisect.bisect_right(self.start_times, after_time)
+        last_shift = bisect.bisect_left(self.start_times, before_time)
+
+        return list(self.shifts_sorted_by_start_time[first_shift:last_shift])
+
+
+# Returns the maximal groups of shifts that all overlap with each other (the maximal cliques of the shifts interval
+# graph), by sweeping over the shifts start and end times. A shift that ends when another shift starts does not overlap
+# with it, so at the same time the ends are handled before the starts.
+def get_overlapping_shifts_cliques(shifts: list[Shift]) -> list[list[Shift]]:
+    shift_end, shift_without_duration, shift_start = 0, 1, 2
+    events: list[tuple[datetime.datetime, int, int]] = []
+
+    for shift_index, shift in enumerate(shifts):
+        if shift.start_time < shift.end_time:
+            events.append((shift.start_time, shift_start, shift_index))
+            events.append((shift.end_time, shift_end, shift_index))
+        elif shift.start_time == shift.end_time:
+            events.append((shift.start_time, shift_without_duration, shift_index))
+
+    events.sort(key=lambda event: (event[0], event[1]))
+
+    cliques: list[list[Shift]] = []
+    active_shifts: dict[int, Shift] = {}
+    started_a_shift_since_last_clique = False
+
+    for _, event_type, shift_index in events:
+        if event_type == shift_start:
+            active_shifts[shift_index] = shifts[shift_index]
+            started_a_shift_since_last_clique = True
+        elif event_type == shift_end:
+            if started_a_shift_since_last_clique:
+                cliques.append(list(active_shifts.values()))
+                started_a_shift_since_last_clique = False
+            del active_shifts[shift_index]
+        elif active_shifts:
+            # A shift without duration only overlaps with the shifts that started before it and end after it.
+            cliques.append(list(active_shifts.values()) + [shifts[shift_index]])
+            started_a_shift_since_last_clique = False
+
+    return cliques
+
+
+def create_shift_index(shifts: list[Shift]) -> ShiftIndex:
+    shifts_sorted_by_start_time = sorted(shifts, key=lambda shift: (shift.start_time, shift.end_time, str(shift.shift_id)))
+
+    shifts_by_day: defaultdict[datetime.date, list[Shift]] = defaultdict(list)
+    shifts_by_type: defaultdict[ShiftTypesEnum, list[Shift]] = defaultdict(list)
+    for shift in shifts_sorted_by_start_time:
+        shifts_by_day[shift.start_time.date()].append(shift)
+        shifts_by_type[shift.shift_type].append(shift)
+
+    overlapping_shifts_cliques = get_overlapping_shifts_cliques(shifts_sorted_by_start_time)
+    overlapping_shifts: dict[Shift, dict[Shift, None]] = {shift: {} for shift in shifts_sorted_by_start_time}
+    for clique in overlapping_shifts_cliques:
+        for shift in clique:
+            for overlapping_shift in clique:
+                if overlapping_shift != shift:
+                    overlapping_shifts[shift][overlapping_shift] = None
+
+    return ShiftIndex(shifts_sorted_by_start_time=tuple(shifts_sorted_by_start_time),
+                      start_times=tuple(shift.start_time for shift in shifts_sorted_by_start_time),
+                      end_times=tuple(shift.end_time for shift in shifts_sorted_by_start_time),
+                      shifts_by_day=types.MappingProxyType({day: tuple(shifts_in_day) for day, shifts_in_day in shifts_by_day.items()}),
+                      shifts_by_type=types.MappingProxyType({shift_type: tuple(shifts_of_type) for shift_type, shifts_of_type in shifts_by_type.items()}),
+                      overlapping_shifts_cliques=tuple(tuple(clique) for clique in overlapping_shifts_cliques),
+                      overlapping_shifts=types.MappingProxyType({shift: tuple(overlapping) for shift, overlapping in overlapping_shifts.items()}),
+                      shift_position_by_id=types.MappingProxyType({shift.shift_id: position for position, shift in enumerate(shifts_sorted_by_start_time)}))
+
+
+# The same shifts (a repeating week for example) are given to every constraint and to many requests, so the index is
+# built once for every set of shifts.
+def get_shift_index(shifts: list[Shift]) -> ShiftIndex:
+    return get_shift_index_of_shifts_set(frozenset(shifts))
+
+
+@functools.lru_cache(maxsize=SHIFT_INDEX_CACHE_SIZE)
+def get_shift_index_of_shifts_set(shifts: frozenset[Shift]) -> ShiftIndex:
+    return create_shift_index(list(shifts))
@@ -0,0 +1,257 @@
+import datetime
+import time
+import uuid
+from dataclasses import dataclass
+
+import numpy as np
+from ortools.sat.python import cp_model
+from ortools.sat.python.cp_model import IntVar
+
+from src.constraints_file import get_minimum_rest_conflicting_shifts, add_squared_deviation_constraint
+from src.models.employees.employee import Employee
+from src.models.employees.employee_preferences.employees_preferences_matrices import create_employees_preferences_matrices
+from src.models.employees.employee_status_enum import EmployeeStatusEnum
+from src.models.shifts.shift import Shift
+from src.models.shifts.shift_combinations_key import ShiftCombinationsKey
+from src.models.shifts.shift_index import get_shift_index
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.assignments_matrix import create_schedule_solution_metadata_from_assignments_matrix
+from src.models.solution.create_solutions import create_solutions, AFTERNOON_START_TIME
+from src.models.solution.one_schedule_solution_metadata import ScheduleSolutionMetadata
+from src.models.solution.schedule_solutions import add_hints_from_solution
+from src.models.solution.schedules_search_status import SchedulesSearchStatus, create_schedules_search_status
+from src.models.solution.solve_status_enum import SolveStatusEnum
+from src.models.solution.solver_profile_enum import SolverProfileEnum
+from src.models.solution.solver_profiles import configure_solver_profile, get_default_solver_profile, set_solve_time_limit
+from src.models.solution.squared_deviation_encoding_enum import SquaredDeviationEncodingEnum
+
+AGGREGATED_MODEL_MAX_NO_GOOD_CUTS = 20
+AGGREGATED_FULL_MODEL_BOUND_TIME_IN_SECONDS = 5.0
+
+EmployeesClassKey = tuple[frozenset[ShiftTypesEnum], EmployeeStatusEnum]
+
+
+# The employees of a class are trained for the same shifts and have the same status. Unlike interchangeable employees,
+# they can have different positions, priorities and preferences.
+def get_employees_classes(employees: list[Employee]) -> dict[EmployeesClassKey, list[Employee]]:
+    employees_classes: dict[EmployeesClassKey, list[Employee]] = {}
+
+    for employee in employees:
+        employees_classes.setdefault((frozenset(employee.shift_types_trained_to_do), employee.employee_status), []).append(employee)
+
+    return employees_classes
+
+
+@dataclass
+class AggregatedModel:
+    constraint_model: cp_model.CpModel
+
+    # class key, shift id, whether an employee of the class works the shift
+    class_covers_shift: dict[EmployeesClassKey, dict[uuid.UUID | str, IntVar]]
+
+
+# A relaxation of the full model on one variable for each class and shift. The capacity of a class is the number of its
+# employees who can work in every group of overlapping shifts and in every pair of shifts without enough rest between
+# them. The preferences of a class are the best of its employees' preferences, and its deviation is the deviation of the
+# sum of the shifts of its employees from the sum of their positions.
+def create_aggregated_model(employees_classes: dict[EmployeesClassKey, list[Employee]], shifts: list[Shift], min_time_between_shifts: datetime.timedelta | None = None,
+                            afternoon_start_time: datetime.time = AFTERNOON_START_TIME) -> AggregatedModel:
+    constraint_model = cp_model.CpModel()
+    shift_index = get_shift_index(shifts)
+    sorted_shifts = shift_index.shifts_sorted_by_start_time
+    class_covers_shift: dict[EmployeesClassKey, dict[uuid.UUID | str, IntVar]] = {}
+    emps_shifts_prefs = []
+    emps_days_pref_not_to_work = []
+    deviations = []
+
+    conflicting_shifts_groups = list(shift_index.overlapping_shifts_cliques)
+    if min_time_between_shifts is not None:
+        conflicting_shifts_groups = conflicting_shifts_groups + [list(shifts_pair) for shifts_pair in get_minimum_rest_conflicting_shifts(shifts, min_time_between_shifts, afternoon_start_time)]
+
+    for class_number, (class_key, class_employees) in enumerate(employees_classes.items()):
+        trained_shift_types, _ = class_key
+        preferences_matrices = create_employees_preferences_matrices(class_employees, shift_index)
+        can_work = ~preferences_matrices.cannot_work.all(axis=0)
+        wants_to_work_priority = (preferences_matrices.wants_to_work * np.array([[employee.priority.value] for employee in class_employees])).max(axis=0)
+        all_prefer_not_to_work = preferences_matrices.prefer_not_to_work.all(axis=0)
+
+        class_covers_shift[class_key] = {}
+        for shift_position, shift in enumerate(sorted_shifts):
+            if shift.shift_type in trained_shift_types and can_work[shift_position]:
+                covers_shift = constraint_model.NewBoolVar(f"class_{class_number}_shift_{shift.shift_id}")
+                class_covers_shift[class_key][shift.shift_id] = covers_shift
+                emps_shifts_prefs.append(covers_shift * int(wants_to_work_priority[shift_position]))
+                emps_days_pref_not_to_work.append(covers_shift * int(all_prefer_not_to_work[shift_position]))
+
+        covered_shifts = class_covers_shift[class_key]
+
+        # No employee works two shifts of a group, so a class covers at most one shift of it for every employee who can work in it
+        for conflicting_shifts in conflicting_shifts_groups:
+            group_covers = [covered_shifts[shift.shift_id] for shift in conflicting_shifts if shift.shift_id in covered_shifts]
+            group_positions = [shift_index.shift_position_by_id[shift.shift_id] for shift in conflicting_shifts]
+            employees_who_can_work_in_group = int((~preferences_matrices.cannot_work[:, group_positions]).any(axis=1).sum())
+
+            if len(group_covers) > employees_who_can_work_in_group:
+                constraint_model.Add(sum(group_covers) <= employees_who_can_work_in_group)
+
+        sum_of_positions = sum(employee.position.value for employee in class_employees)
+        max_deviation = max(len(covered_shifts), sum_of_positions)
+        deviation = constraint_model.NewIntVar(0, max_deviation, f"deviation_class_{class_number}")
+        squared_deviation = constraint_model.NewIntVar(0, pow(max_deviation, 2), f"squared_deviation_class_{class_number}")
+        constraint_model.AddAbsEquality(deviation, sum(covered_shifts.values()) - sum_of_positions)
+        add_squared_deviation_constraint(constraint_model, deviation, squared_deviation, max_deviation, SquaredDeviationEncodingEnum.PIECEWISE_LINEAR)
+        deviations.append(squared_deviation)
+
+    for shift in sorted_shifts:
+        constraint_model.AddExactlyOne([covered_shifts[shift.shift_id] for covered_shifts in class_covers_shift.values() if shift.shift_id in covered_shifts])
+
+    constraint_model.Minimize(sum(deviations) + sum(emps_days_pref_not_to_work) - sum(emps_shifts_prefs))
+
+    return AggregatedModel(constraint_model, class_covers_shift)
+
+
+def get_class_shifts(aggregated_model: AggregatedModel, solver: cp_model.CpSolver, class_key: EmployeesClassKey, shifts: list[Shift]) -> list[Shift]:
+    covered_shifts = aggregated_model.class_covers_shift[class_key]
+    return [shift for shift in shifts if shift.shift_id in covered_shifts and solver.Value(covered_shifts[shift.shift_id])]
+
+
+# Forbids the shifts that the aggregated model gave to a class, when they can not be assigned to its employees.
+def add_class_shifts_no_good_cut(aggregated_model: AggregatedModel, class_key: EmployeesClassKey, class_shifts: list[Shift]) -> None:
+    covered_shifts = aggregated_model.class_covers_shift[class_key]
+    aggregated_model.constraint_model.Add(sum(covered_shifts[shift.shift_id] for shift in class_shifts) <= len(class_shifts) - 1)
+
+
+# Returns the schedule of the shifts of one class among its employees, by the full constraints, or None if there is none.
+def assign_class_shifts(class_employees: list[Employee], class_shifts: list[Shift], min_time_between_shifts: datetime.timedelta | None,
+                        afternoon_start_time: datetime.time, max_time_per_solve_in_seconds: float | None, solver_profile: SolverProfileEnum | None = None,
+                        random_seed: int | None = None, number_of_cpus: int | None = None) -> dict[uuid.UUID | str, uuid.UUID | str] | None:
+    class_schedule_solution = create_solutions(class_employees, class_shifts, min_time_between_shifts=min_time_between_shifts, afternoon_start_time=afternoon_start_time,
+                                               solver_profile=solver_profile, random_seed=random_seed, number_of_cpus=number_of_cpus)
+    if max_time_per_solve_in_seconds is not None:
+        set_solve_time_limit(class_schedule_solution.solver.parameters, max_time_per_solve_in_seconds)
+
+    status = class_schedule_solution.solver.Solve(class_schedule_solution.constraint_model)
+    if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+        return None
+
+    assignments_matrix_index = class_schedule_solution.assignments_matrix_index
+    assignments_matrix = assignments_matrix_index.get_assignments_matrix(class_schedule_solution.solver.ResponseProto().solution)
+    return create_schedule_solution_metadata_from_assignments_matrix(assignments_matrix, assignments_matrix_index).schedule
+
+
+@dataclass
+class AggregatedSchedule:
+    schedule: ScheduleSolutionMetadata | None
+
+    # The objective and status of the schedule in the full model, with the best bound of the full model in the time it had
+    search_status: SchedulesSearchStatus | None
+    number_of_no_good_cuts: int
+
+
+# Checks the stitched schedule against all the constraints of the full model by fixing its assignments as assumptions.
+# A valid schedule then hints a short solve of the full model, for the bound of its objective.
+def validate_aggregated_schedule(employees: list[Employee], shifts: list[Shift], schedule: dict[uuid.UUID | str, uuid.UUID | str],
+                                 min_time_between_shifts: datetime.timedelta | None, afternoon_start_time: datetime.time,
+                                 full_model_bound_time_in_seconds: float, search_start_time: float, solver_profile: SolverProfileEnum | None = None,
+                                 random_seed: int | None = None, number_of_cpus: int | None = None) -> tuple[ScheduleSolutionMetadata | None, SchedulesSearchStatus]:
+    # A stitched schedule can put interchangeable employees out of their order
+    schedule_solution = create_solutions(employees, shifts, min_time_between_shifts=min_time_between_shifts, afternoon_start_time=afternoon_start_time,
+                                         solver_profile=solver_profile, random_seed=random_seed, break_employees_symmetry=False, number_of_cpus=number_of_cpus)
+    solver = schedule_solution.solver
+    constraint_model = schedule_solution.constraint_model
+
+    if any(ShiftCombinationsKey(employee_id, shift_id) not in schedule_solution.all_shifts for shift_id, employee_id in schedule.items()):
+        return None, SchedulesSearchStatus(status=SolveStatusEnum.INFEASIBLE, objective_value=None, best_objective_bound=None, objective_gap=None,
+                                           last_solve_status=SolveStatusEnum.INFEASIBLE, number_of_schedules=0,
+                                           wall_time_in_seconds=time.perf_counter() - search_start_time, time_budget_exhausted=False)
+
+    constraint_model.AddAssumptions([assignment if schedule.get(assignment_key.shift_id) == assignment_key.employee_id else assignment.Not()
+                                     for assignment_key, assignment in schedule_solution.all_shifts.items()])
+    status = solver.Solve(constraint_model)
+    search_status = create_schedules_search_status(solver, status, time.perf_counter() - search_start_time)
+
+    # A feasible solution with the assignments of the schedule is enough to know that the schedule keeps all the
+    # constraints, even when the time limit stopped the solve before its objective was optimal
+    if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+        return None, search_status
+
+    assignments_matrix_index = schedule_solution.assignments_matrix_index
+    schedule_metadata = create_schedule_solution_metadata_from_assignments_matrix(assignments_matrix_index.get_assignments_matrix(solver.ResponseProto().solution),
+                                                                                  assignments_matrix_index)
+    search_status.status = SolveStatusEnum.FEASIBLE
+    search_status.best_objective_bound, search_status.objective_gap = None, None
+    search_status.number_of_schedules = 1
+
+    if full_model_bound_time_in_seconds > 0:
+        objective_value = search_status.objective_value
+        add_hints_from_solution(constraint_model, solver.ResponseProto().solution)
+        constraint_model.ClearAssumptions()
+        set_solve_time_limit(solver.parameters, full_model_bound_time_in_seconds)
+        solver.Solve(constraint_model)
+
+        search_status.best_objective_bound = solver.BestObjectiveBound()
+        search_status.objective_gap = abs(objective_value - search_status.best_objective_bound) / max(1.0, abs(objective_value))
+        if search_status.objective_gap == 0:
+            search_status.status = SolveStatusEnum.OPTIMAL
+
+    search_status.wall_time_in_seconds = time.perf_counter() - search_start_time
+    return schedule_metadata, search_status
+
+
+# Schedules a big staff in two phases: the aggregated model decides which class of employees covers every shift, and
+# then every class assigns its own shifts to its employees in a small model. When a class can not take the shifts it
+# was given, or the stitched schedule breaks a constraint between classes, the aggregated solution is cut off and the
+# aggregated model is solved again.
+def create_aggregated_schedule(employees: list[Employee], shifts: list[Shift], min_time_between_shifts: datetime.timedelta | None = None,
+                               afternoon_start_time: datetime.time = AFTERNOON_START_TIME, max_time_per_solve_in_seconds: float | None = None,
+                               max_no_good_cuts: int = AGGREGATED_MODEL_MAX_NO_GOOD_CUTS,
+                               full_model_bound_time_in_seconds: float = AGGREGATED_FULL_MODEL_BOUND_TIME_IN_SECONDS,
+                               solver_profile: SolverProfileEnum | None = None, random_seed: int | None = None,
+                               number_of_cpus: int | None = None) -> AggregatedSchedule:
+    search_start_time = time.perf_counter()
+    employees_classes = get_employees_classes(employees)
+    aggregated_model = create_aggregated_model(employees_classes, shifts, min_time_between_shifts, afternoon_start_time)
+    solver = cp_model.CpSolver()
+    configure_solver_profile(solver, solver_profile if solver_profile is not None else get_default_solver_profile(), random_seed, number_of_cpus)
+    if max_time_per_solve_in_seconds is not None:
+        set_solve_time_limit(solver.parameters, max_time_per_solve_in_seconds)
+    search_status = None
+
+    for number_of_no_good_cuts in range(max_no_good_cuts + 1):
+        status = solver.Solve(aggregated_model.constraint_model)
+        if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+            return AggregatedSchedule(None, create_schedules_search_status(solver, status, time.perf_counter() - search_start_time), number_of_no_good_cuts)
+
+        schedule: dict[uuid.UUID | str, uuid.UUID | str] | None = {}
+
+        for class_key, class_employees in employees_classes.items():
+            class_shifts = get_class_shifts(aggregated_model, solver, class_key, shifts)
+            class_schedule = assign_class_shifts(class_employees, class_shifts, min_time_between_shifts, afternoon_start_time, max_time_per_solve_in_seconds,
+                                                 solver_profile, random_seed, number_of_cpus) \
+                if class_shifts else {}
+
+            if class_schedule is None:
+                add_class_shifts_no_good_cut(aggregated_model, class_key, class_shifts)
+                schedule = None
+                break
+
+            schedule.update(class_schedule)
+
+        if schedule is None:
+            continue
+
+        schedule_metadata, search_status = validate_aggregated_schedule(employees, shifts, schedule, min_time_between_shifts, afternoon_start_time,
+                                                                        full_model_bound_time_in_seconds, search_start_time, solver_profile, random_seed,
+                                                                        number_of_cpus)
+        if schedule_metadata is not None:
+            return AggregatedSchedule(schedule_metadata, search_status, number_of_no_good_cuts)
+
+        aggregated_model.constraint_model.Add(sum(covers_shift for covered_shifts in aggregated_model.class_covers_shift.values() for covers_shift in covered_shifts.values()
+                                                  if solver.Value(covers_shift)) <= len(shifts) - 1)
+
+    if search_status is None:
+        search_status = SchedulesSearchStatus(status=SolveStatusEnum.UNKNOWN, objective_value=None, best_objective_bound=None, objective_gap=None,
+                                              last_solve_status=SolveStatusEnum.UNKNOWN, number_of_schedules=0,
+                                              wall_time_in_seconds=time.perf_counter() - search_start_time, time_budget_exhausted=False)
+    search_status.status = SolveStatusEnum.UNKNOWN
+    return AggregatedSchedule(None, search_status, max_no_good_cuts)
@@ -0,0 +1,82 @@
+import uuid
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+from ortools.sat.python.cp_model import IntVar
+
+from src.models.employees.employee import Employee
+from src.models.shifts.eligible_shift_combinations import EligibleShiftCombinations
+from src.models.shifts.shift import Shift
+from src.models.shifts.shift_combinations_key import ShiftCombinationsKey
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.one_schedule_solution_metadata import ScheduleSolutionMetadata
+
+NO_ASSIGNMENT_VARIABLE = -1
+MORNING_SHIFT_TYPES = [ShiftTypesEnum.MORNING, ShiftTypesEnum.MORNING_BACKUP, ShiftTypesEnum.WEEKEND_MORNING, ShiftTypesEnum.WEEKEND_MORNING_BACKUP]
+
+
+# Where the assignment variables of a model are, so the assignments of a solution are read as one employee x shift matrix
+# out of the values of all the variables of the model.
+@dataclass(frozen=True)
+class AssignmentsMatrixIndex:
+    employees_ids: list[uuid.UUID | str]
+    shifts_ids: list[uuid.UUID | str]
+
+    # The index of the variable of every employee and shift in the model, or "NO_ASSIGNMENT_VARIABLE" for a pair that
+    # is never assigned
+    variables_indexes: np.ndarray
+    closing_shifts_mask: np.ndarray
+    morning_shifts_mask: np.ndarray
+
+    def get_assignments_matrix(self, solution_values: Sequence[int]) -> np.ndarray:
+        solution_values = np.asarray(solution_values, dtype=np.int64)
+        has_variable = self.variables_indexes != NO_ASSIGNMENT_VARIABLE
+
+        return has_variable & (solution_values[np.where(has_variable, self.variables_indexes, 0)] != 0)
+
+
+def create_assignments_matrix_index(all_shifts: dict[ShiftCombinationsKey, IntVar], employees: list[Employee], shifts: list[Shift]) -> AssignmentsMatrixIndex:
+    variables_indexes = np.full((len(employees), len(shifts)), NO_ASSIGNMENT_VARIABLE, dtype=np.int64)
+
+    for employee_row, employee in enumerate(employees):
+        for shift_column, shift in enumerate(shifts):
+            assignment = all_shifts.get(ShiftCombinationsKey(employee.employee_id, shift.shift_id))
+            if assignment is not None:
+                variables_indexes[employee_row, shift_column] = assignment.Index()
+
+    return AssignmentsMatrixIndex(employees_ids=[employee.employee_id for employee in employees],
+                                  shifts_ids=[shift.shift_id for shift in shifts],
+                                  variables_indexes=variables_indexes,
+                                  closing_shifts_mask=np.array([shift.shift_type == ShiftTypesEnum.CLOSING for shift in shifts], dtype=bool),
+                                  morning_shifts_mask=np.array([shift.shift_type in MORNING_SHIFT_TYPES for shift in shifts], dtype=bool))
+
+
+# Only the employees with at least one shift (or one closing, or one morning) are in the counts.
+def get_employees_counts(employees_ids: list[uuid.UUID | str], counts: np.ndarray) -> dict[uuid.UUID | str, int]:
+    return {employees_ids[employee_row]: int(counts[employee_row]) for employee_row in np.flatnonzero(counts)}
+
+
+def create_schedule_solution_metadata_from_assignments_matrix(assignments_matrix: np.ndarray, assignments_matrix_index: AssignmentsMatrixIndex) -> ScheduleSolutionMetadata:
+    employees_rows, shifts_columns = np.nonzero(assignments_matrix)
+    schedule = {assignments_matrix_index.shifts_ids[shift_column]: assignments_matrix_index.employees_ids[employee_row]
+                for employee_row, shift_column in zip(employees_rows, shifts_columns)}
+
+    return ScheduleSolutionMetadata(
+        get_employees_counts(assignments_matrix_index.employees_ids, (assignments_matrix & assignments_matrix_index.closing_shifts_mask).sum(axis=1)),
+        get_employees_counts(assignments_matrix_index.employees_ids, (assignments_matrix & assignments_matrix_index.morning_shifts_mask).sum(axis=1)),
+        get_employees_counts(assignments_matrix_index.employees_ids, assignments_matrix.sum(axis=1)),
+        schedule)
+
+
+# The metadata of a schedule that was put together outside of one model, from its shift id, employee id pairs.
+def create_schedule_solution_metadata_from_schedule(schedule: dict[uuid.UUID | str, uuid.UUID | str], employees: list[Employee], shifts: list[Shift]) -> ScheduleSolutionMetadata:
+    assignments_matrix_index = create_assignments_matrix_index(EligibleShiftCombinations(), employees, shifts)
+    employees_rows = {employee_id: employee_row for employee_row, employee_id in enumerate(assignments_matrix_index.employees_ids)}
+    shifts_columns = {shift_id: shift_column for shift_column, shift_id in enumerate(assignments_matrix_index.shifts_ids)}
+
+    assignments_matrix = np.zeros((len(employees), len(shifts)), dtype=bool)
+    for shift_id, employee_id in schedule.items():
+        assignments_matrix[employees_rows[employee_id], shifts_columns[shift_id]] = True
+
+    return create_schedule_solution_metadata_from_assignments_matrix(assignments_matrix, assignments_matrix_index)
@@ -1,28 +1,96 @@
+import datetime
+import uuid
+from typing import Hashable
+
 from ortools.sat.python import cp_model
 
-from src.constraints_file import generate_shift_employee_combinations, add_exactly_one_employee_per_shift_constraint, \
+from src.constraints_file import generate_eligible_shift_employee_combinations, add_exactly_one_employee_per_shift_constraint, \
     add_prevent_overlapping_shifts_for_employees_constraint, \
+    add_prevent_overlapping_shifts_for_employees_with_intervals_constraint, \
+    add_minimum_time_between_a_morning_shift_and_the_shift_before_constraint, \
     add_aspire_for_minimal_deviation_between_employees_position_and_number_of_shifts_given_constraint, \
     add_employees_can_work_only_shifts_that_they_trained_for_constraint, \
-    add_aspire_to_maximize_all_employees_preferences_constraint
+    add_aspire_to_maximize_all_employees_preferences_constraint, add_break_interchangeable_employees_symmetry_constraint, \
+    add_fixed_assignments_constraint
 from src.models.employees.employee import Employee
 from src.models.shifts.shift import Shift
+from src.models.solution.model_backend_enum import ModelBackendEnum
+from src.models.solution.objective_mode_enum import ObjectiveModeEnum
+from src.models.solution.objective_registry import set_objective_weights, apply_lexicographic_objective, POSITION_DEVIATION_OBJECTIVE_TERM
 from src.models.solution.schedule_solutions import ScheduleSolutions
+from src.models.solution.solver_profile_enum import SolverProfileEnum
+from src.models.solution.squared_deviation_encoding_enum import SquaredDeviationEncodingEnum
+from src.models.solution.solver_profiles import configure_solver_profile, get_default_solver_profile
+
+AFTERNOON_START_TIME = datetime.time(12, 30)
+
+
+# What an employee brings into the schedule from outside of it, so employees with different states are never swapped
+def get_employees_schedule_states(employees: list[Employee], prior_shifts_counts: dict[uuid.UUID | str, int] | None,
+                                  shifts_targets: dict[uuid.UUID | str, int] | None,
+                                  fixed_assignments: dict[uuid.UUID | str, uuid.UUID | str] | None) -> dict[uuid.UUID | str, Hashable]:
+    prior_shifts_counts = prior_shifts_counts if prior_shifts_counts is not None else {}
+    shifts_targets = shifts_targets if shifts_targets is not None else {}
+    fixed_assignments = fixed_assignments if fixed_assignments is not None else {}
 
+    return {employee.employee_id: (prior_shifts_counts.get(employee.employee_id, 0), shifts_targets.get(employee.employee_id),
+                                   frozenset(shift_id for shift_id, employee_id in fixed_assignments.items() if employee_id == employee.employee_id))
+            for employee in employees}
 
-def create_solutions(employees: list[Employee], shifts: list[Shift]) -> ScheduleSolutions:
+
+def create_solutions(employees: list[Employee], shifts: list[Shift], model_backend: ModelBackendEnum = ModelBackendEnum.BOOLEAN_SUMS,
+                     min_time_between_shifts: datetime.timedelta | None = None, afternoon_start_time: datetime.time = AFTERNOON_START_TIME,
+                     solver_profile: SolverProfileEnum | None = None, random_seed: int | None = None,
+                     objective_mode: ObjectiveModeEnum = ObjectiveModeEnum.WEIGHTED_SUM, objective_weights: dict[str, int] | None = None,
+                     squared_deviation_encoding: SquaredDeviationEncodingEnum = SquaredDeviationEncodingEnum.PIECEWISE_LINEAR,
+                     break_employees_symmetry: bool = True, prior_shifts_counts: dict[uuid.UUID | str, int] | None = None,
+                     shifts_targets: dict[uuid.UUID | str, int] | None = None,
+                     fixed_assignments: dict[uuid.UUID | str, uuid.UUID | str] | None = None, max_time_per_solve_in_seconds: float | None = None,
+                     max_total_time_in_seconds: float | None = None, number_of_cpus: int | None = None) -> ScheduleSolutions:
+
+    # The piecewise linear square is only bounded from below, so it is exact only while the deviation is minimized
+    if squared_deviation_encoding == SquaredDeviationEncodingEnum.PIECEWISE_LINEAR and objective_weights is not None and \
+            objective_weights.get(POSITION_DEVIATION_OBJECTIVE_TERM, 1) <= 0:
+        squared_deviation_encoding = SquaredDeviationEncodingEnum.ELEMENT
 
     constraint_model = cp_model.CpModel()
 
-    all_shifts = generate_shift_employee_combinations(employees, shifts, constraint_model)
+    all_shifts = generate_eligible_shift_employee_combinations(employees, shifts, constraint_model)
     add_exactly_one_employee_per_shift_constraint(shifts, employees, constraint_model, all_shifts)
-    add_prevent_overlapping_shifts_for_employees_constraint(shifts, employees, constraint_model, all_shifts)
-    add_aspire_for_minimal_deviation_between_employees_position_and_number_of_shifts_given_constraint(shifts, employees, constraint_model, all_shifts)
+
+    if model_backend == ModelBackendEnum.INTERVALS:
+        add_prevent_overlapping_shifts_for_employees_with_intervals_constraint(shifts, employees, constraint_model, all_shifts, min_time_between_shifts, afternoon_start_time)
+    else:
+        add_prevent_overlapping_shifts_for_employees_constraint(shifts, employees, constraint_model, all_shifts)
+
+        if min_time_between_shifts is not None:
+            add_minimum_time_between_a_morning_shift_and_the_shift_before_constraint(shifts, employees, constraint_model, all_shifts, min_time_between_shifts, afternoon_start_time)
+
+    add_aspire_for_minimal_deviation_between_employees_position_and_number_of_shifts_given_constraint(shifts, employees, constraint_model, all_shifts, squared_deviation_encoding,
+                                                                                                      prior_shifts_counts, shifts_targets)
     add_employees_can_work_only_shifts_that_they_trained_for_constraint(shifts, employees, constraint_model, all_shifts)
     add_aspire_to_maximize_all_employees_preferences_constraint(shifts, employees, constraint_model, all_shifts)
 
+    if fixed_assignments is not None:
+        add_fixed_assignments_constraint(shifts, employees, constraint_model, all_shifts, fixed_assignments)
+
+    employees_schedule_states = get_employees_schedule_states(employees, prior_shifts_counts, shifts_targets, fixed_assignments)
+    if break_employees_symmetry:
+        add_break_interchangeable_employees_symmetry_constraint(shifts, employees, constraint_model, all_shifts, employees_schedule_states)
+
     solver = cp_model.CpSolver()
+    configure_solver_profile(solver, solver_profile if solver_profile is not None else get_default_solver_profile(), random_seed, number_of_cpus)
+
+    if objective_weights is not None:
+        set_objective_weights(constraint_model, objective_weights)
+
+    # The stages of a lexicographic objective are the first solves of the search, within its time limits
+    objective_stages_search_clock = None
+    if objective_mode == ObjectiveModeEnum.LEXICOGRAPHIC:
+        objective_stages_search_clock = apply_lexicographic_objective(constraint_model, solver, max_time_per_solve_in_seconds, max_total_time_in_seconds)
+        objective_stages_search_clock.pause()
 
-    my_solution = ScheduleSolutions(solver, all_shifts, employees, shifts, constraint_model)
+    my_solution = ScheduleSolutions(solver, all_shifts, employees, shifts, constraint_model, employees_schedule_states, objective_stages_search_clock,
+                                    break_employees_symmetry)
 
     return my_solution
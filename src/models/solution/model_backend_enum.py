@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class ModelBackendEnum(Enum):
+    BOOLEAN_SUMS = "boolean sums"   # Overlapping shifts are prevented with sums of the assignments
+    INTERVALS = "intervals"         # Every assignment is an optional interval, and each employee has one "NoOverlap"
@@ -0,0 +1,269 @@
+import collections
+import datetime
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass
+
+from google.protobuf.message import DecodeError
+from ortools.sat import cp_model_pb2
+from ortools.sat.python import cp_model
+
+from src.models.employees.employee import Employee
+from src.models.shifts.eligible_shift_combinations import EligibleShiftCombinations
+from src.models.shifts.shift import Shift
+from src.models.shifts.shift_combinations_key import ShiftCombinationsKey
+from src.models.solution.create_solutions import create_solutions, get_employees_schedule_states, AFTERNOON_START_TIME
+from src.models.solution.model_backend_enum import ModelBackendEnum
+from src.models.solution.objective_mode_enum import ObjectiveModeEnum
+from src.models.solution.problem_hash import get_problem_hash
+from src.models.solution.schedule_solutions import ScheduleSolutions
+from src.models.solution.solver_profile_enum import SolverProfileEnum
+from src.models.solution.solver_profiles import configure_solver_profile, get_default_solver_profile
+from src.models.solution.squared_deviation_encoding_enum import SquaredDeviationEncodingEnum
+
+MODEL_CACHE_MAX_SIZE_IN_BYTES = 256 * 1024 * 1024
+MODEL_CACHE_MAX_AGE_IN_SECONDS = 24 * 60 * 60
+MODEL_CACHE_FILE_SUFFIX = ".model"
+
+# Part of the hash of every model, so the models that were cached on disk before the constraints changed are not used
+MODEL_CACHE_VERSION = 2
+
+
+@dataclass
+class CachedModel:
+    model_proto: bytes
+
+    # The index in the model of the variable of every employee and shift pair that has one
+    assignments_variables_indexes: dict[ShiftCombinationsKey, int]
+    created_time: float
+
+    @property
+    def size_in_bytes(self) -> int:
+        return len(self.model_proto)
+
+
+@dataclass
+class ModelCacheStatistics:
+    hits: int
+    misses: int
+    evictions: int
+    number_of_models: int
+    size_in_bytes: int
+
+
+# The built models by the hash of their problem, in memory and in "cache_directory" when it is given, so a model that was
+# built by another process or before a restart is not built again. A model is evicted when it is older than
+# "max_age_in_seconds", and the least recently used models are evicted when the models are bigger than
+# "max_size_in_bytes" (in memory and on disk separately).
+class ModelCache:
+
+    def __init__(self, max_size_in_bytes: int = MODEL_CACHE_MAX_SIZE_IN_BYTES, max_age_in_seconds: float = MODEL_CACHE_MAX_AGE_IN_SECONDS,
+                 cache_directory: str | None = None):
+        self.max_size_in_bytes = max_size_in_bytes
+        self.max_age_in_seconds = max_age_in_seconds
+        self.cache_directory = cache_directory
+        self.models: collections.OrderedDict[str, CachedModel] = collections.OrderedDict()
+        self.size_in_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if cache_directory is not None:
+            os.makedirs(cache_directory, exist_ok=True)
+
+    def get_model_file_path(self, model_hash: str) -> str:
+        return os.path.join(self.cache_directory, model_hash + MODEL_CACHE_FILE_SUFFIX)
+
+    def is_expired(self, cached_model: CachedModel) -> bool:
+        return time.time() - cached_model.created_time > self.max_age_in_seconds
+
+    def get(self, model_hash: str) -> CachedModel | None:
+        cached_model = self.models.get(model_hash)
+        if cached_model is None and self.cache_directory is not None:
+            cached_model = self.load_model_from_disk(model_hash)
+
+            # A model from the disk that is bigger than the memory of the cache is used without being kept in memory
+            if cached_model is not None and cached_model.size_in_bytes <= self.max_size_in_bytes:
+                self.add_model_to_memory(model_hash, cached_model)
+
+        if cached_model is not None and self.is_expired(cached_model):
+            self.remove(model_hash)
+            self.evictions += 1
+            cached_model = None
+
+        if cached_model is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if model_hash in self.models:
+            self.models.move_to_end(model_hash)
+
+        return cached_model
+
+    def put(self, model_hash: str, cached_model: CachedModel) -> None:
+        self.remove(model_hash)
+        self.add_model_to_memory(model_hash, cached_model)
+
+        if self.cache_directory is not None:
+            self.save_model_to_disk(model_hash, cached_model)
+            self.evict_models_from_disk()
+
+    def remove(self, model_hash: str) -> None:
+        cached_model = self.models.pop(model_hash, None)
+        if cached_model is not None:
+            self.size_in_bytes -= cached_model.size_in_bytes
+
+        if self.cache_directory is not None and os.path.exists(self.get_model_file_path(model_hash)):
+            os.remove(self.get_model_file_path(model_hash))
+
+    def add_model_to_memory(self, model_hash: str, cached_model: CachedModel) -> None:
+        self.models[model_hash] = cached_model
+        self.size_in_bytes += cached_model.size_in_bytes
+
+        while self.size_in_bytes > self.max_size_in_bytes and self.models:
+            _, evicted_model = self.models.popitem(last=False)
+            self.size_in_bytes -= evicted_model.size_in_bytes
+            self.evictions += 1
+
+    # A file that can not be read (written by another version, or cut in the middle) is a miss, and is removed
+    def load_model_from_disk(self, model_hash: str) -> CachedModel | None:
+        model_file_path = self.get_model_file_path(model_hash)
+        if not os.path.exists(model_file_path):
+            return None
+
+        try:
+            with open(model_file_path, "rb") as model_file:
+                return create_cached_model_from_file_content(model_file.read())
+        except (OSError, ValueError, KeyError, TypeError, DecodeError):
+            os.remove(model_file_path)
+            return None
+
+    # The model is written to a temporary file that replaces the model file at once, so a process that reads the model
+    # file never reads half of it
+    def save_model_to_disk(self, model_hash: str, cached_model: CachedModel) -> None:
+        model_file_path = self.get_model_file_path(model_hash)
+        temporary_file_path = f"{model_file_path}.{uuid.uuid4().hex}.tmp"
+
+        with open(temporary_file_path, "wb") as model_file:
+            model_file.write(get_cached_model_file_content(cached_model))
+        os.replace(temporary_file_path, model_file_path)
+
+    # The files of the models are evicted by their modification time, the oldest first
+    def evict_models_from_disk(self) -> None:
+        model_files = []
+        for file_name in os.listdir(self.cache_directory):
+            if file_name.endswith(MODEL_CACHE_FILE_SUFFIX):
+                model_file_stat = os.stat(os.path.join(self.cache_directory, file_name))
+                model_files.append((model_file_stat.st_mtime, model_file_stat.st_size, file_name))
+
+        model_files.sort()
+        files_size_in_bytes = sum(file_size for _, file_size, _ in model_files)
+
+        for modification_time, file_size, file_name in model_files:
+            if time.time() - modification_time <= self.max_age_in_seconds and files_size_in_bytes <= self.max_size_in_bytes:
+                break
+
+            os.remove(os.path.join(self.cache_directory, file_name))
+            files_size_in_bytes -= file_size
+            self.evictions += 1
+
+    def get_statistics(self) -> ModelCacheStatistics:
+        return ModelCacheStatistics(hits=self.hits, misses=self.misses, evictions=self.evictions, number_of_models=len(self.models),
+                                    size_in_bytes=self.size_in_bytes)
+
+
+# A uuid id is written as {"uuid": ...}, so it is read back as a uuid and not as a string
+def get_json_id(model_id: uuid.UUID | str) -> dict[str, str] | str:
+    return {"uuid": str(model_id)} if isinstance(model_id, uuid.UUID) else model_id
+
+
+def get_id_from_json(json_id: dict[str, str] | str) -> uuid.UUID | str:
+    return uuid.UUID(json_id["uuid"]) if isinstance(json_id, dict) else json_id
+
+
+# A model file is a line of json with the creation time and the index of every assignment variable, followed by the
+# model proto. The cache directory can be shared, so a file is only ever parsed as data, and never unpickled.
+def get_cached_model_file_content(cached_model: CachedModel) -> bytes:
+    model_header = {"created_time": cached_model.created_time,
+                    "assignments_variables_indexes": [[get_json_id(assignment_key.employee_id), get_json_id(assignment_key.shift_id), variable_index]
+                                                      for assignment_key, variable_index in cached_model.assignments_variables_indexes.items()]}
+
+    return json.dumps(model_header).encode() + b"\n" + cached_model.model_proto
+
+
+def create_cached_model_from_file_content(file_content: bytes) -> CachedModel:
+    model_header_line, model_proto = file_content.split(b"\n", 1)
+    model_header = json.loads(model_header_line)
+
+    # Parsed once here, so a model that can not be parsed is a miss and not an error of the search
+    cp_model_pb2.CpModelProto().ParseFromString(model_proto)
+
+    return CachedModel(model_proto=model_proto,
+                       assignments_variables_indexes={ShiftCombinationsKey(get_id_from_json(employee_id), get_id_from_json(shift_id)): int(variable_index)
+                                                      for employee_id, shift_id, variable_index in model_header["assignments_variables_indexes"]},
+                       created_time=float(model_header["created_time"]))
+
+
+# The statistics of the caches of several processes, as if they were one cache
+def merge_model_caches_statistics(model_caches_statistics: list[ModelCacheStatistics]) -> ModelCacheStatistics:
+    return ModelCacheStatistics(hits=sum(statistics.hits for statistics in model_caches_statistics),
+                                misses=sum(statistics.misses for statistics in model_caches_statistics),
+                                evictions=sum(statistics.evictions for statistics in model_caches_statistics),
+                                number_of_models=sum(statistics.number_of_models for statistics in model_caches_statistics),
+                                size_in_bytes=sum(statistics.size_in_bytes for statistics in model_caches_statistics))
+
+
+# The model is cached before any schedule is searched in it, since the searches add constraints to their model.
+def create_cached_model(schedule_solution: ScheduleSolutions) -> CachedModel:
+    return CachedModel(model_proto=schedule_solution.constraint_model.Proto().SerializeToString(),
+                       assignments_variables_indexes={assignment_key: assignment.Index() for assignment_key, assignment in schedule_solution.all_shifts.items()},
+                       created_time=time.time())
+
+
+# The same as "create_solutions", but the model is built only when no model of the same problem and settings is in the
+# cache. A cached model is parsed into a new model for every call, so the searches of one call never change it. The
+# solver profile, the seed and the time limits only change the solve, so they are not part of the hash, except for a
+# lexicographic objective: its stages are solved when the model is built, and they bound the model with what they found.
+def create_solutions_with_model_cache(model_cache: ModelCache, employees: list[Employee], shifts: list[Shift], model_backend: ModelBackendEnum = ModelBackendEnum.BOOLEAN_SUMS,
+                                      min_time_between_shifts: datetime.timedelta | None = None, afternoon_start_time: datetime.time = AFTERNOON_START_TIME,
+                                      solver_profile: SolverProfileEnum | None = None, random_seed: int | None = None,
+                                      objective_mode: ObjectiveModeEnum = ObjectiveModeEnum.WEIGHTED_SUM, objective_weights: dict[str, int] | None = None,
+                                      squared_deviation_encoding: SquaredDeviationEncodingEnum = SquaredDeviationEncodingEnum.PIECEWISE_LINEAR,
+                                      break_employees_symmetry: bool = True, prior_shifts_counts: dict[uuid.UUID | str, int] | None = None,
+                                      shifts_targets: dict[uuid.UUID | str, int] | None = None,
+                                      fixed_assignments: dict[uuid.UUID | str, uuid.UUID | str] | None = None,
+                                      max_time_per_solve_in_seconds: float | None = None, max_total_time_in_seconds: float | None = None,
+                                      number_of_cpus: int | None = None) -> ScheduleSolutions:
+    model_settings = {"model_cache_version": MODEL_CACHE_VERSION, "model_backend": model_backend, "min_time_between_shifts": min_time_between_shifts,
+                      "afternoon_start_time": afternoon_start_time, "objective_mode": objective_mode, "objective_weights": objective_weights,
+                      "squared_deviation_encoding": squared_deviation_encoding, "break_employees_symmetry": break_employees_symmetry,
+                      "prior_shifts_counts": prior_shifts_counts, "shifts_targets": shifts_targets, "fixed_assignments": fixed_assignments}
+    if objective_mode == ObjectiveModeEnum.LEXICOGRAPHIC:
+        model_settings.update({"solver_profile": solver_profile if solver_profile is not None else get_default_solver_profile(), "random_seed": random_seed,
+                               "max_time_per_solve_in_seconds": max_time_per_solve_in_seconds, "max_total_time_in_seconds": max_total_time_in_seconds,
+                               "number_of_cpus": number_of_cpus})
+    model_hash = get_problem_hash(employees, shifts, model_settings)
+    cached_model = model_cache.get(model_hash)
+
+    if cached_model is None:
+        schedule_solution = create_solutions(employees, shifts, model_backend, min_time_between_shifts, afternoon_start_time, solver_profile, random_seed,
+                                             objective_mode, objective_weights, squared_deviation_encoding, break_employees_symmetry, prior_shifts_counts,
+                                             shifts_targets, fixed_assignments, max_time_per_solve_in_seconds, max_total_time_in_seconds, number_of_cpus)
+        model_cache.put(model_hash, create_cached_model(schedule_solution))
+
+        return schedule_solution
+
+    constraint_model = cp_model.CpModel()
+    constraint_model.Proto().ParseFromString(cached_model.model_proto)
+    all_shifts = EligibleShiftCombinations({assignment_key: constraint_model.GetIntVarFromProtoIndex(variable_index)
+                                            for assignment_key, variable_index in cached_model.assignments_variables_indexes.items()})
+
+    solver = cp_model.CpSolver()
+    configure_solver_profile(solver, solver_profile if solver_profile is not None else get_default_solver_profile(), random_seed, number_of_cpus)
+
+    return ScheduleSolutions(solver, all_shifts, employees, shifts, constraint_model,
+                             get_employees_schedule_states(employees, prior_shifts_counts, shifts_targets, fixed_assignments),
+                             break_employees_symmetry=break_employees_symmetry)
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class ObjectiveModeEnum(Enum):
+    WEIGHTED_SUM = "weighted sum"       # One objective, the sum of all the weighted objective terms
+    LEXICOGRAPHIC = "lexicographic"     # The objective terms are optimized one priority after the other
@@ -0,0 +1,125 @@
+import itertools
+import math
+import weakref
+from dataclasses import dataclass, field
+
+from ortools.sat.python import cp_model
+
+from src.models.solution.schedule_solutions import add_hints_from_solution, get_next_solve_time_limit, OBJECTIVE_BOUND_ROUNDING_TOLERANCE, SearchClock
+from src.models.solution.solver_profiles import is_deterministic_search, get_solve_time_limit, set_solve_time_limit
+
+# The objective terms of the constraints
+PREFERRED_SHIFTS_OBJECTIVE_TERM = "preferred shifts"
+SHIFTS_PREFERRED_NOT_TO_WORK_OBJECTIVE_TERM = "shifts preferred not to work"
+POSITION_DEVIATION_OBJECTIVE_TERM = "position deviation"
+REPAIR_CHURN_OBJECTIVE_TERM = "repair churn"
+
+# The preferences of the employees come before the deviation from their positions in a lexicographic objective
+PREFERENCES_OBJECTIVE_PRIORITY = 0
+POSITION_DEVIATION_OBJECTIVE_PRIORITY = 1
+
+
+@dataclass
+class ObjectiveTerm:
+    name: str
+
+    # Always minimized, a term that should be maximized is registered negated
+    expression: cp_model.LinearExprT
+    weight: int = 1
+
+    # In a lexicographic objective, the terms with a smaller priority are optimized first
+    priority: int = 0
+
+
+@dataclass
+class ObjectiveRegistry:
+    terms: list[ObjectiveTerm] = field(default_factory=list)
+
+    def get_weighted_objective(self) -> cp_model.LinearExprT:
+        return sum(term.weight * term.expression for term in self.terms)
+
+    # The weighted objective of every priority, the first priority first
+    def get_lexicographic_objectives(self) -> list[cp_model.LinearExprT]:
+        terms_sorted_by_priority = sorted(self.terms, key=lambda term: term.priority)
+
+        return [sum(term.weight * term.expression for term in priority_terms)
+                for _, priority_terms in itertools.groupby(terms_sorted_by_priority, key=lambda term: term.priority)]
+
+
+# Every constraint adds its terms to the registry of its model instead of setting the objective of the model, because in
+# CP-SAT only the last objective that was set is optimized.
+objective_registries: weakref.WeakKeyDictionary[cp_model.CpModel, ObjectiveRegistry] = weakref.WeakKeyDictionary()
+
+
+def get_objective_registry(constraint_model: cp_model.CpModel) -> ObjectiveRegistry:
+    if constraint_model not in objective_registries:
+        objective_registries[constraint_model] = ObjectiveRegistry()
+
+    return objective_registries[constraint_model]
+
+
+# The objective of the model is set to the weighted sum of all its terms after every term, so a model is ready to be
+# solved no matter which constraints were added to it.
+def add_objective_term(constraint_model: cp_model.CpModel, name: str, expression: cp_model.LinearExprT, maximize: bool = False,
+                       weight: int = 1, priority: int = 0) -> None:
+    objective_registry = get_objective_registry(constraint_model)
+    objective_registry.terms.append(ObjectiveTerm(name=name, expression=-expression if maximize else expression, weight=weight, priority=priority))
+
+    constraint_model.Minimize(objective_registry.get_weighted_objective())
+
+
+def set_objective_weights(constraint_model: cp_model.CpModel, objective_weights: dict[str, int]) -> None:
+    objective_registry = get_objective_registry(constraint_model)
+
+    for term in objective_registry.terms:
+        term.weight = objective_weights.get(term.name, term.weight)
+
+    constraint_model.Minimize(objective_registry.get_weighted_objective())
+
+
+# Optimizes the objective of every priority but the last one, and bounds it to its optimal value before moving on to the
+# next one. The solution of every stage is the hint of the next stage, and the model is left with the objective of the
+# last priority. When a stage has no solution, the model is left with the objective of that stage, and the search of the
+# schedules reports it.
+# The stages are solves of the search, so they share its time limits. A stage that is not proven optimal (its value is
+# not its best bound, because of the time limit or of the gap limit of the profile) is not bounded, and the model is left
+# with the weighted sum of its objective and the objectives after it, the same as when the time of the search is over.
+# Returns the clock of the stages, which the first search of the schedules goes on with.
+def apply_lexicographic_objective(constraint_model: cp_model.CpModel, solver: cp_model.CpSolver, max_time_per_solve_in_seconds: float | None = None,
+                                  max_total_time_in_seconds: float | None = None) -> SearchClock:
+    search_clock = SearchClock(is_deterministic_search(solver.parameters))
+    lexicographic_objectives = get_objective_registry(constraint_model).get_lexicographic_objectives()
+    if not lexicographic_objectives:
+        return search_clock
+
+    solver_time_limit = get_solve_time_limit(solver.parameters)
+
+    try:
+        for stage_number, stage_objective in enumerate(lexicographic_objectives[:-1]):
+            stage_time_limit = get_next_solve_time_limit(solver_time_limit, max_time_per_solve_in_seconds, max_total_time_in_seconds, search_clock)
+            if stage_time_limit is None:
+                constraint_model.Minimize(sum(lexicographic_objectives[stage_number:]))
+                return search_clock
+
+            set_solve_time_limit(solver.parameters, stage_time_limit)
+            constraint_model.Minimize(stage_objective)
+            status = solver.Solve(constraint_model)
+            search_clock.add_solve(solver)
+
+            if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+                return search_clock
+
+            add_hints_from_solution(constraint_model, solver.ResponseProto().solution)
+
+            stage_objective_value = round(solver.ObjectiveValue())
+            if stage_objective_value > math.ceil(solver.BestObjectiveBound() - OBJECTIVE_BOUND_ROUNDING_TOLERANCE):
+                constraint_model.Minimize(sum(lexicographic_objectives[stage_number:]))
+                return search_clock
+
+            constraint_model.Add(stage_objective <= stage_objective_value)
+    finally:
+        set_solve_time_limit(solver.parameters, solver_time_limit)
+
+    constraint_model.Minimize(lexicographic_objectives[-1])
+
+    return search_clock
@@ -13,4 +13,4 @@ class ScheduleSolutionMetadata:
     number_of_shift_for_each_emp: dict[uuid.UUID | str, int]
 
     # shift id, employee id
-    schedule: dict[str, str]
+    schedule: dict[uuid.UUID | str, uuid.UUID | str]
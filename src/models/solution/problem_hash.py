@@ -0,0 +1,37 @@
+import dataclasses
+import enum
+import hashlib
+from typing import Any
+
+from src.models.employees.employee import Employee
+from src.models.shifts.shift import Shift
+
+
+# A value that is the same for equal inputs in every process: dataclasses are their fields by name, sets and dicts are
+# sorted, so the order in which they were built does not change the value, and a whole float is its int, so a default of
+# 10 and a parsed 10.0 are the same.
+def get_canonical_value(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return type(value).__name__, tuple((value_field.name, get_canonical_value(getattr(value, value_field.name))) for value_field in dataclasses.fields(value))
+    if isinstance(value, enum.Enum):
+        return type(value).__name__, value.value
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((get_canonical_value(item) for item in value), key=repr))
+    if isinstance(value, dict):
+        return tuple(sorted(((get_canonical_value(key), get_canonical_value(item)) for key, item in value.items()), key=repr))
+    if isinstance(value, (list, tuple)):
+        return tuple(get_canonical_value(item) for item in value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+
+    return value
+
+
+# The hash of a scheduling problem, the same no matter the order of the employees and the shifts. "problem_settings" are
+# the settings that change the model, and not only how it is solved.
+def get_problem_hash(employees: list[Employee], shifts: list[Shift], problem_settings: dict[str, Any]) -> str:
+    canonical_problem = (tuple(sorted((get_canonical_value(employee) for employee in employees), key=repr)),
+                         tuple(sorted((get_canonical_value(shift) for shift in shifts), key=repr)),
+                         get_canonical_value(problem_settings))
+
+    return hashlib.sha256(repr(canonical_problem).encode()).hexdigest()
@@ -0,0 +1,137 @@
+import bisect
+import collections
+import datetime
+import math
+import time
+import uuid
+from dataclasses import dataclass
+
+from ortools.sat.python import cp_model
+
+from src.models.employees.employee import Employee
+from src.models.shifts.shift import Shift
+from src.models.shifts.shift_index import get_shift_index
+from src.models.solution.assignments_matrix import create_schedule_solution_metadata_from_assignments_matrix, \
+    create_schedule_solution_metadata_from_schedule
+from src.models.solution.create_solutions import create_solutions, AFTERNOON_START_TIME
+from src.models.solution.model_backend_enum import ModelBackendEnum
+from src.models.solution.one_schedule_solution_metadata import ScheduleSolutionMetadata
+from src.models.solution.schedules_search_status import SchedulesSearchStatus, create_schedules_search_status
+from src.models.solution.solve_status_enum import SolveStatusEnum
+from src.models.solution.solver_profile_enum import SolverProfileEnum
+from src.models.solution.solver_profiles import set_solve_time_limit
+
+ROLLING_HORIZON_WINDOW = datetime.timedelta(weeks=2)
+ROLLING_HORIZON_STEP = datetime.timedelta(weeks=1)
+
+# An employee's position is the number of shifts they aspire to in every period
+SHIFTS_TARGET_PERIOD = datetime.timedelta(weeks=1)
+
+
+@dataclass
+class RollingHorizonSchedule:
+    schedule: ScheduleSolutionMetadata | None
+    search_status: SchedulesSearchStatus
+    windows_search_statuses: list[SchedulesSearchStatus]
+
+
+# The frozen shifts that still constrain the shifts after "window_start": they overlap it, or they are afternoon shifts
+# and the rest after them is not over when it starts.
+def get_boundary_shifts(frozen_shifts: list[Shift], window_start: datetime.datetime, min_time_between_shifts: datetime.timedelta | None,
+                        afternoon_start_time: datetime.time) -> list[Shift]:
+    boundary_shifts = []
+
+    for shift in frozen_shifts:
+        shift_end_time = shift.end_time
+        if min_time_between_shifts is not None and afternoon_start_time <= shift.start_time.time():
+            shift_end_time += min_time_between_shifts
+
+        if shift_end_time > window_start:
+            boundary_shifts.append(shift)
+
+    return boundary_shifts
+
+
+# The cumulative target of every employee up to the end of a window, so the fairness of every window makes up for the
+# windows before it.
+def get_shifts_targets(employees: list[Employee], horizon_start: datetime.datetime, window_end: datetime.datetime) -> dict[uuid.UUID | str, int]:
+    number_of_periods = max(1, math.ceil((window_end - horizon_start) / SHIFTS_TARGET_PERIOD))
+    return {employee.employee_id: employee.position.value * number_of_periods for employee in employees}
+
+
+# Schedules a long horizon one window at a time. Every window is solved with the shifts that start in it, and only the
+# shifts that start before the next window are frozen. The frozen shifts that still constrain the next window (by
+# overlap or rest) are in its model, fixed to their employees, and the frozen shifts before them are counted for the
+# fairness of the next window. Every model is the size of a window, however long the horizon is.
+def create_rolling_horizon_schedule(employees: list[Employee], shifts: list[Shift], window: datetime.timedelta = ROLLING_HORIZON_WINDOW,
+                                    step: datetime.timedelta = ROLLING_HORIZON_STEP, model_backend: ModelBackendEnum = ModelBackendEnum.BOOLEAN_SUMS,
+                                    min_time_between_shifts: datetime.timedelta | None = None, afternoon_start_time: datetime.time = AFTERNOON_START_TIME,
+                                    solver_profile: SolverProfileEnum | None = None, random_seed: int | None = None,
+                                    max_time_per_window_in_seconds: float | None = None, number_of_cpus: int | None = None) -> RollingHorizonSchedule:
+    # A step that does not move would never end, and a step longer than the window would skip the shifts between them
+    if step <= datetime.timedelta(0):
+        raise ValueError(f"The step of the rolling horizon must be positive, got {step}")
+    if step > window:
+        raise ValueError(f"The step of the rolling horizon ({step}) can not be longer than its window ({window})")
+
+    search_start_time = time.perf_counter()
+    shift_index = get_shift_index(shifts)
+    sorted_shifts = list(shift_index.shifts_sorted_by_start_time)
+    start_times = shift_index.start_times
+    horizon_start = start_times[0] if start_times else None
+    horizon_end = max(shift_index.end_times) if start_times else None
+
+    frozen_assignments: dict[uuid.UUID | str, uuid.UUID | str] = {}
+    frozen_shifts_counts: collections.Counter = collections.Counter()
+    boundary_shifts: list[Shift] = []
+    windows_search_statuses: list[SchedulesSearchStatus] = []
+    first_unfrozen_shift = 0
+    window_start = horizon_start
+
+    while first_unfrozen_shift < len(sorted_shifts):
+        window_end, step_end = window_start + window, window_start + step
+        last_window_shift = bisect.bisect_left(start_times, window_end)
+        last_frozen_shift = len(sorted_shifts) if last_window_shift == len(sorted_shifts) else bisect.bisect_left(start_times, step_end)
+        window_shifts = sorted_shifts[first_unfrozen_shift:last_window_shift]
+
+        if window_shifts:
+            boundary_assignments = {shift.shift_id: frozen_assignments[shift.shift_id] for shift in boundary_shifts}
+            prior_shifts_counts = frozen_shifts_counts - collections.Counter(boundary_assignments.values())
+
+            schedule_solution = create_solutions(employees, boundary_shifts + window_shifts, model_backend, min_time_between_shifts, afternoon_start_time,
+                                                 solver_profile=solver_profile, random_seed=random_seed, prior_shifts_counts=dict(prior_shifts_counts),
+                                                 shifts_targets=get_shifts_targets(employees, horizon_start, min(window_end, horizon_end)),
+                                                 fixed_assignments=boundary_assignments, number_of_cpus=number_of_cpus)
+            solver = schedule_solution.solver
+            if max_time_per_window_in_seconds is not None:
+                set_solve_time_limit(solver.parameters, max_time_per_window_in_seconds)
+
+            window_solve_start_time = time.perf_counter()
+            status = solver.Solve(schedule_solution.constraint_model)
+            windows_search_statuses.append(create_schedules_search_status(solver, status, time.perf_counter() - window_solve_start_time))
+
+            if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+                search_status = create_schedules_search_status(solver, status, time.perf_counter() - search_start_time)
+                return RollingHorizonSchedule(None, search_status, windows_search_statuses)
+
+            assignments_matrix_index = schedule_solution.assignments_matrix_index
+            window_schedule = create_schedule_solution_metadata_from_assignments_matrix(assignments_matrix_index.get_assignments_matrix(solver.ResponseProto().solution),
+                                                                                        assignments_matrix_index).schedule
+            newly_frozen_shifts = sorted_shifts[first_unfrozen_shift:last_frozen_shift]
+
+            for shift in newly_frozen_shifts:
+                frozen_assignments[shift.shift_id] = window_schedule[shift.shift_id]
+                frozen_shifts_counts[window_schedule[shift.shift_id]] += 1
+
+            boundary_shifts = get_boundary_shifts(boundary_shifts + newly_frozen_shifts, step_end, min_time_between_shifts, afternoon_start_time)
+            first_unfrozen_shift = last_frozen_shift
+
+        window_start = step_end
+
+    last_solve_status = windows_search_statuses[-1].status if windows_search_statuses else SolveStatusEnum.OPTIMAL
+    search_status = SchedulesSearchStatus(status=SolveStatusEnum.FEASIBLE, objective_value=None, best_objective_bound=None, objective_gap=None,
+                                          last_solve_status=last_solve_status, number_of_schedules=1,
+                                          wall_time_in_seconds=time.perf_counter() - search_start_time,
+                                          time_budget_exhausted=any(window_search_status.time_budget_exhausted for window_search_status in windows_search_statuses))
+
+    return RollingHorizonSchedule(create_schedule_solution_metadata_from_schedule(frozen_assignments, employees, shifts), search_status, windows_search_statuses)
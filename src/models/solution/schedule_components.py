@@ -0,0 +1,165 @@
+import concurrent.futures
+import datetime
+import multiprocessing
+import time
+from dataclasses import dataclass
+
+from ortools.sat.python import cp_model
+
+from src.constraints_file import generate_eligible_shift_employee_combinations
+from src.models.employees.employee import Employee
+from src.models.shifts.shift import Shift
+from src.models.solution.assignments_matrix import create_schedule_solution_metadata_from_assignments_matrix
+from src.models.solution.create_solutions import create_solutions, AFTERNOON_START_TIME
+from src.models.solution.model_backend_enum import ModelBackendEnum
+from src.models.solution.one_schedule_solution_metadata import ScheduleSolutionMetadata
+from src.models.solution.schedules_search_status import SchedulesSearchStatus, create_schedules_search_status
+from src.models.solution.solve_status_enum import SolveStatusEnum
+from src.models.solution.solver_profile_enum import SolverProfileEnum
+from src.models.solution.solver_profiles import get_number_of_available_cpus, set_solve_time_limit
+
+# The statuses of the components, from the one that decides the status of the whole schedule first
+COMPONENTS_STATUSES_BY_PRECEDENCE = [SolveStatusEnum.MODEL_INVALID, SolveStatusEnum.INFEASIBLE, SolveStatusEnum.UNKNOWN, SolveStatusEnum.FEASIBLE,
+                                     SolveStatusEnum.OPTIMAL]
+
+
+@dataclass
+class ScheduleComponent:
+    employees: list[Employee]
+    shifts: list[Shift]
+
+
+@dataclass
+class ComponentSolveSettings:
+    model_backend: ModelBackendEnum
+    min_time_between_shifts: datetime.timedelta | None
+    afternoon_start_time: datetime.time
+    solver_profile: SolverProfileEnum | None
+    random_seed: int | None
+    max_time_in_seconds: float | None
+
+    # The cpus of the solver of a component, which its profile sizes its number of workers to
+    number_of_cpus: int | None = None
+
+
+@dataclass
+class ComponentsSchedule:
+    schedule: ScheduleSolutionMetadata | None
+    search_status: SchedulesSearchStatus
+
+
+def find_component_root(parents: list[int], node: int) -> int:
+    while parents[node] != node:
+        parents[node] = parents[parents[node]]
+        node = parents[node]
+
+    return node
+
+
+# The employees and the shifts are the nodes of the eligibility graph, with an edge between every employee and every
+# shift that they can work. No constraint or objective term connects two components, so each of them is a schedule of
+# its own. The employees who can not work any shift are added to the first component, where they change nothing but the
+# objective.
+def get_schedule_components(employees: list[Employee], shifts: list[Shift]) -> list[ScheduleComponent]:
+    eligible_shift_combinations = generate_eligible_shift_employee_combinations(employees, shifts, cp_model.CpModel())
+    employees_nodes = {employee.employee_id: node for node, employee in enumerate(employees)}
+    shifts_nodes = {shift.shift_id: len(employees) + node for node, shift in enumerate(shifts)}
+    parents = list(range(len(employees) + len(shifts)))
+
+    for assignment_key in eligible_shift_combinations:
+        employee_root = find_component_root(parents, employees_nodes[assignment_key.employee_id])
+        shift_root = find_component_root(parents, shifts_nodes[assignment_key.shift_id])
+        parents[employee_root] = shift_root
+
+    components_by_root: dict[int, ScheduleComponent] = {}
+    for shift in shifts:
+        components_by_root.setdefault(find_component_root(parents, shifts_nodes[shift.shift_id]), ScheduleComponent([], [])).shifts.append(shift)
+
+    employees_without_shifts = []
+    for employee in employees:
+        component = components_by_root.get(find_component_root(parents, employees_nodes[employee.employee_id]))
+        if component is not None:
+            component.employees.append(employee)
+        else:
+            employees_without_shifts.append(employee)
+
+    components = list(components_by_root.values()) or [ScheduleComponent([], [])]
+    components[0].employees.extend(employees_without_shifts)
+
+    return components
+
+
+# Runs in a process of the pool, or in the calling process when there is only one component.
+def solve_schedule_component(component: ScheduleComponent, solve_settings: ComponentSolveSettings) -> ComponentsSchedule:
+    solve_start_time = time.perf_counter()
+    schedule_solution = create_solutions(component.employees, component.shifts, solve_settings.model_backend, solve_settings.min_time_between_shifts,
+                                         solve_settings.afternoon_start_time, solver_profile=solve_settings.solver_profile, random_seed=solve_settings.random_seed,
+                                         number_of_cpus=solve_settings.number_of_cpus)
+    solver = schedule_solution.solver
+
+    if solve_settings.max_time_in_seconds is not None:
+        set_solve_time_limit(solver.parameters, solve_settings.max_time_in_seconds)
+
+    status = solver.Solve(schedule_solution.constraint_model)
+    search_status = create_schedules_search_status(solver, status, time.perf_counter() - solve_start_time)
+
+    if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+        return ComponentsSchedule(None, search_status)
+
+    assignments_matrix_index = schedule_solution.assignments_matrix_index
+    assignments_matrix = assignments_matrix_index.get_assignments_matrix(solver.ResponseProto().solution)
+    search_status.number_of_schedules = 1
+
+    return ComponentsSchedule(create_schedule_solution_metadata_from_assignments_matrix(assignments_matrix, assignments_matrix_index), search_status)
+
+
+# The objectives and bounds of the components add up, and the worst status of a component is the status of the schedule.
+def merge_components_schedules(components_schedules: list[ComponentsSchedule], wall_time_in_seconds: float) -> ComponentsSchedule:
+    components_statuses = [component_schedule.search_status.status for component_schedule in components_schedules]
+    status = next(status for status in COMPONENTS_STATUSES_BY_PRECEDENCE if status in components_statuses)
+    time_budget_exhausted = any(component_schedule.search_status.time_budget_exhausted for component_schedule in components_schedules)
+
+    if status != SolveStatusEnum.OPTIMAL and status != SolveStatusEnum.FEASIBLE:
+        return ComponentsSchedule(None, SchedulesSearchStatus(status=status, objective_value=None, best_objective_bound=None, objective_gap=None, last_solve_status=status,
+                                                              number_of_schedules=0, wall_time_in_seconds=wall_time_in_seconds, time_budget_exhausted=time_budget_exhausted))
+
+    schedules = [component_schedule.schedule for component_schedule in components_schedules]
+    merged_schedule = ScheduleSolutionMetadata({employee_id: count for schedule in schedules for employee_id, count in schedule.number_of_closings_for_each_emp.items()},
+                                               {employee_id: count for schedule in schedules for employee_id, count in schedule.number_of_mornings_for_each_emp.items()},
+                                               {employee_id: count for schedule in schedules for employee_id, count in schedule.number_of_shift_for_each_emp.items()},
+                                               {shift_id: employee_id for schedule in schedules for shift_id, employee_id in schedule.schedule.items()})
+
+    objective_value = sum(component_schedule.search_status.objective_value for component_schedule in components_schedules)
+    best_objective_bound = sum(component_schedule.search_status.best_objective_bound for component_schedule in components_schedules)
+
+    return ComponentsSchedule(merged_schedule, SchedulesSearchStatus(status=status, objective_value=objective_value, best_objective_bound=best_objective_bound,
+                                                                     objective_gap=abs(objective_value - best_objective_bound) / max(1.0, abs(objective_value)),
+                                                                     last_solve_status=status, number_of_schedules=1, wall_time_in_seconds=wall_time_in_seconds,
+                                                                     time_budget_exhausted=time_budget_exhausted))
+
+
+# Splits the schedule into its independent components and solves them in a pool of processes, the biggest first, with the
+# cpus divided between the processes. The schedules of the components are stitched into one schedule.
+def create_schedule_from_components(employees: list[Employee], shifts: list[Shift], model_backend: ModelBackendEnum = ModelBackendEnum.BOOLEAN_SUMS,
+                                    min_time_between_shifts: datetime.timedelta | None = None, afternoon_start_time: datetime.time = AFTERNOON_START_TIME,
+                                    solver_profile: SolverProfileEnum | None = None, random_seed: int | None = None,
+                                    max_time_in_seconds: float | None = None, number_of_workers: int | None = None,
+                                    number_of_cpus: int | None = None) -> ComponentsSchedule:
+    search_start_time = time.perf_counter()
+    components = sorted(get_schedule_components(employees, shifts), key=lambda component: len(component.employees) * len(component.shifts), reverse=True)
+    solve_settings = ComponentSolveSettings(model_backend=model_backend, min_time_between_shifts=min_time_between_shifts, afternoon_start_time=afternoon_start_time,
+                                            solver_profile=solver_profile, random_seed=random_seed, max_time_in_seconds=max_time_in_seconds,
+                                            number_of_cpus=number_of_cpus)
+    number_of_cpus = number_of_cpus if number_of_cpus is not None else get_number_of_available_cpus()
+    number_of_workers = min(number_of_workers if number_of_workers is not None else number_of_cpus, len(components))
+
+    if number_of_workers <= 1:
+        components_schedules = [solve_schedule_component(component, solve_settings) for component in components]
+    else:
+        solve_settings.number_of_cpus = max(1, number_of_cpus // number_of_workers)
+
+        # Processes are spawned, OR-Tools threads can not be forked safely
+        with concurrent.futures.ProcessPoolExecutor(max_workers=number_of_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            components_schedules = list(executor.map(solve_schedule_component, components, [solve_settings] * len(components)))
+
+    return merge_components_schedules(components_schedules, time.perf_counter() - search_start_time)
@@ -0,0 +1,160 @@
+import bisect
+import collections
+import datetime
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from ortools.sat.python import cp_model
+
+from src.models.employees.employee import Employee
+from src.models.shifts.shift import Shift
+from src.models.shifts.shift_combinations_key import ShiftCombinationsKey
+from src.models.shifts.shift_index import get_shift_index
+from src.models.solution.assignments_matrix import create_schedule_solution_metadata_from_assignments_matrix, \
+    create_schedule_solution_metadata_from_schedule
+from src.models.solution.create_solutions import create_solutions, AFTERNOON_START_TIME
+from src.models.solution.model_backend_enum import ModelBackendEnum
+from src.models.solution.objective_registry import add_objective_term, REPAIR_CHURN_OBJECTIVE_TERM
+from src.models.solution.one_schedule_solution_metadata import ScheduleSolutionMetadata
+from src.models.solution.schedules_search_status import SchedulesSearchStatus, create_schedules_search_status
+from src.models.solution.solve_status_enum import SolveStatusEnum
+from src.models.solution.solver_profile_enum import SolverProfileEnum
+from src.models.solution.solver_profiles import set_solve_time_limit
+
+# The shifts that start this close to a shift that lost its employee can be reassigned
+REPAIR_NEIGHBOURHOOD_RADIUS = datetime.timedelta(days=1)
+REPAIR_MAX_TIME_IN_SECONDS = 0.5
+
+
+@dataclass
+class ScheduleChange:
+    removed_employees_ids: list[uuid.UUID | str] = field(default_factory=list)
+
+    # employee id, the shifts ids that the employee can no longer work
+    unavailable_shifts: dict[uuid.UUID | str, list[uuid.UUID | str]] = field(default_factory=dict)
+    added_shifts: list[Shift] = field(default_factory=list)
+
+
+@dataclass
+class RepairedSchedule:
+    schedule: ScheduleSolutionMetadata | None
+    search_status: SchedulesSearchStatus
+    changed_shifts_ids: list[uuid.UUID | str]
+
+
+# The assignments of the schedule that the change did not break
+def get_kept_assignments(schedule: dict[uuid.UUID | str, uuid.UUID | str], employees: list[Employee], shifts: list[Shift],
+                         schedule_change: ScheduleChange) -> dict[uuid.UUID | str, uuid.UUID | str]:
+    employees_ids = {employee.employee_id for employee in employees}
+    shifts_ids = {shift.shift_id for shift in shifts}
+
+    return {shift_id: employee_id for shift_id, employee_id in schedule.items()
+            if shift_id in shifts_ids and employee_id in employees_ids and shift_id not in schedule_change.unavailable_shifts.get(employee_id, [])}
+
+
+# The shifts that start within "neighbourhood_radius" of a shift without an employee
+def get_repair_neighbourhood(shifts: list[Shift], kept_assignments: dict[uuid.UUID | str, uuid.UUID | str],
+                             neighbourhood_radius: datetime.timedelta) -> list[Shift]:
+    shift_index = get_shift_index(shifts)
+    neighbourhood_positions: set[int] = set()
+
+    for shift in shifts:
+        if shift.shift_id not in kept_assignments:
+            first_shift = bisect.bisect_left(shift_index.start_times, shift.start_time - neighbourhood_radius)
+            last_shift = bisect.bisect_right(shift_index.start_times, shift.start_time + neighbourhood_radius)
+            neighbourhood_positions.update(range(first_shift, last_shift))
+
+    return [shift_index.shifts_sorted_by_start_time[shift_position] for shift_position in sorted(neighbourhood_positions)]
+
+
+# The shifts outside the neighbourhood that can conflict with a shift in it, by overlap or by the rest after them. No
+# shift that starts earlier than the longest shift and the rest before the neighbourhood can reach into it.
+def get_repair_context_shifts(shifts: list[Shift], neighbourhood: list[Shift], min_time_between_shifts: datetime.timedelta | None) -> list[Shift]:
+    shift_index = get_shift_index(shifts)
+    rest_after_shift = min_time_between_shifts if min_time_between_shifts is not None else datetime.timedelta(0)
+    longest_shift = max(shift.end_time - shift.start_time for shift in shifts)
+    neighbourhood_ids = {shift.shift_id for shift in neighbourhood}
+
+    first_shift = bisect.bisect_left(shift_index.start_times, neighbourhood[0].start_time - longest_shift - rest_after_shift)
+    last_shift = bisect.bisect_right(shift_index.start_times, max(shift.end_time for shift in neighbourhood) + rest_after_shift)
+
+    return [shift for shift in shift_index.shifts_sorted_by_start_time[first_shift:last_shift] if shift.shift_id not in neighbourhood_ids]
+
+
+# The largest difference between two values of the objective of the model, from the domains of its variables
+def get_objective_range(constraint_model: cp_model.CpModel) -> int:
+    model_proto = constraint_model.Proto()
+    objective_range = 0
+
+    for variable_reference, coefficient in zip(model_proto.objective.vars, model_proto.objective.coeffs):
+        # A negative reference is the negation of a boolean variable, which has the same range
+        variable_domain = model_proto.variables[variable_reference if variable_reference >= 0 else -variable_reference - 1].domain
+        objective_range += abs(coefficient) * (variable_domain[-1] - variable_domain[0])
+
+    return objective_range
+
+
+# Repairs a schedule after a change in a model of only the shifts around the shifts that the change left without an
+# employee. The shifts that can conflict with them are in the model with their employees fixed, and every other
+# assignment is counted for the fairness. The old assignments are the hints of the search, and changing them is
+# minimized before the fairness and the preferences.
+def repair_schedule(employees: list[Employee], shifts: list[Shift], schedule: dict[uuid.UUID | str, uuid.UUID | str], schedule_change: ScheduleChange,
+                    model_backend: ModelBackendEnum = ModelBackendEnum.BOOLEAN_SUMS, min_time_between_shifts: datetime.timedelta | None = None,
+                    afternoon_start_time: datetime.time = AFTERNOON_START_TIME, solver_profile: SolverProfileEnum | None = None,
+                    random_seed: int | None = None, neighbourhood_radius: datetime.timedelta = REPAIR_NEIGHBOURHOOD_RADIUS,
+                    max_time_in_seconds: float = REPAIR_MAX_TIME_IN_SECONDS) -> RepairedSchedule:
+    repair_start_time = time.perf_counter()
+    employees = [employee for employee in employees if employee.employee_id not in schedule_change.removed_employees_ids]
+    shifts = shifts + schedule_change.added_shifts
+    kept_assignments = get_kept_assignments(schedule, employees, shifts, schedule_change)
+    neighbourhood = get_repair_neighbourhood(shifts, kept_assignments, neighbourhood_radius)
+
+    if not neighbourhood:
+        search_status = SchedulesSearchStatus(status=SolveStatusEnum.OPTIMAL, objective_value=None, best_objective_bound=None, objective_gap=None,
+                                              last_solve_status=SolveStatusEnum.OPTIMAL, number_of_schedules=1,
+                                              wall_time_in_seconds=time.perf_counter() - repair_start_time, time_budget_exhausted=False)
+        return RepairedSchedule(create_schedule_solution_metadata_from_schedule(kept_assignments, employees, shifts), search_status, [])
+
+    context_shifts = get_repair_context_shifts(shifts, neighbourhood, min_time_between_shifts)
+    model_shifts_ids = {shift.shift_id for shift in neighbourhood + context_shifts}
+    prior_shifts_counts = collections.Counter(employee_id for shift_id, employee_id in kept_assignments.items() if shift_id not in model_shifts_ids)
+
+    # Swapping interchangeable employees changes the churn, so their symmetry is not broken
+    schedule_solution = create_solutions(employees, neighbourhood + context_shifts, model_backend, min_time_between_shifts, afternoon_start_time,
+                                         solver_profile=solver_profile, random_seed=random_seed, break_employees_symmetry=False,
+                                         prior_shifts_counts=dict(prior_shifts_counts),
+                                         fixed_assignments={shift.shift_id: kept_assignments[shift.shift_id] for shift in context_shifts})
+    constraint_model, solver = schedule_solution.constraint_model, schedule_solution.solver
+
+    for employee_id, unavailable_shifts_ids in schedule_change.unavailable_shifts.items():
+        for shift_id in unavailable_shifts_ids:
+            unavailable_key = ShiftCombinationsKey(employee_id, shift_id)
+            if unavailable_key in schedule_solution.all_shifts:
+                constraint_model.Add(schedule_solution.all_shifts[unavailable_key] == 0)
+
+    kept_neighbourhood_assignments = [schedule_solution.all_shifts[key] for key in (ShiftCombinationsKey(kept_assignments[shift.shift_id], shift.shift_id)
+                                                                                     for shift in neighbourhood if shift.shift_id in kept_assignments)
+                                      if key in schedule_solution.all_shifts]
+    # Every assignment of the neighbourhood that is changed costs more than the fairness and the preferences can ever improve
+    add_objective_term(constraint_model, REPAIR_CHURN_OBJECTIVE_TERM, len(kept_neighbourhood_assignments) - sum(kept_neighbourhood_assignments),
+                       weight=get_objective_range(constraint_model) + 1)
+
+    for assignment_key, assignment in schedule_solution.all_shifts.items():
+        constraint_model.AddHint(assignment, int(kept_assignments.get(assignment_key.shift_id) == assignment_key.employee_id))
+
+    set_solve_time_limit(solver.parameters, max_time_in_seconds)
+    status = solver.Solve(constraint_model)
+    search_status = create_schedules_search_status(solver, status, time.perf_counter() - repair_start_time)
+
+    if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+        return RepairedSchedule(None, search_status, [])
+
+    assignments_matrix_index = schedule_solution.assignments_matrix_index
+    neighbourhood_schedule = create_schedule_solution_metadata_from_assignments_matrix(assignments_matrix_index.get_assignments_matrix(solver.ResponseProto().solution),
+                                                                                       assignments_matrix_index).schedule
+    repaired_schedule = kept_assignments | neighbourhood_schedule
+    search_status.number_of_schedules = 1
+
+    return RepairedSchedule(create_schedule_solution_metadata_from_schedule(repaired_schedule, employees, shifts), search_status,
+                            [shift.shift_id for shift in shifts if repaired_schedule.get(shift.shift_id) != schedule.get(shift.shift_id)])
@@ -1,71 +1,273 @@
+import math
+import time
 import uuid
-from collections import defaultdict
+from typing import Hashable, Iterator, Sequence
 
 from ortools.sat.python import cp_model
 from ortools.sat.python.cp_model import IntVar
 
 from src.models.employees.employee import Employee
+from src.models.employees.employees_equivalence_classes import get_employees_canonical_ids
 from src.models.shifts.shift import Shift
 from src.models.shifts.shift_combinations_key import ShiftCombinationsKey
-from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.assignments_matrix import create_assignments_matrix_index, create_schedule_solution_metadata_from_assignments_matrix
 from src.models.solution.one_schedule_solution_metadata import ScheduleSolutionMetadata
+from src.models.solution.schedules_collector import SchedulesCollector
+from src.models.solution.schedules_search_status import SchedulesSearchStatus, create_schedules_search_status, get_solve_status
+from src.models.solution.solver_profiles import is_deterministic_search, get_solve_time_limit, set_solve_time_limit
+
+OBJECTIVE_BOUND_ROUNDING_TOLERANCE = 1e-6
+
+
+# Returns a copy of the model without an objective, in which the objective of the given model can be at most
+# "objective_tolerance" worse than "optimal_objective_value". The variables of the copy have the same indexes.
+# The objective in the model is always minimized, a maximized objective has negative coefficients and a negative scaling
+# factor. Returns the expression that is minimized, without the offset and the scaling factor.
+def get_minimized_objective_expression(constraint_model: cp_model.CpModel) -> cp_model.LinearExprT:
+    objective = constraint_model.Proto().objective
+    objective_terms = []
+
+    for variable_index, coefficient in zip(objective.vars, objective.coeffs):
+        # In a linear expression, a negative index is minus the variable in index "-variable_index - 1"
+        if variable_index >= 0:
+            objective_terms.append(coefficient * constraint_model.GetIntVarFromProtoIndex(variable_index))
+        else:
+            objective_terms.append(-coefficient * constraint_model.GetIntVarFromProtoIndex(-variable_index - 1))
+
+    return sum(objective_terms)
+
+
+# Returns the value of the minimized objective expression, for a value of the objective as the solver reports it.
+def get_minimized_objective_value(constraint_model: cp_model.CpModel, objective_value: float) -> float:
+    objective = constraint_model.Proto().objective
+    scaling_factor = objective.scaling_factor if objective.scaling_factor != 0 else 1
+
+    return objective_value / scaling_factor - objective.offset
+
+
+# Returns a copy of the model without an objective, in which the objective of the given model can be at most
+# "objective_tolerance" worse than "optimal_objective_value". The variables of the copy have the same indexes.
+def create_model_of_solutions_near_the_optimal_objective(constraint_model: cp_model.CpModel, optimal_objective_value: float,
+                                                         objective_tolerance: float) -> cp_model.CpModel:
+    near_optimal_model = cp_model.CpModel()
+    near_optimal_model.Proto().CopyFrom(constraint_model.Proto())
+
+    objective = constraint_model.Proto().objective
+    scaling_factor = objective.scaling_factor if objective.scaling_factor != 0 else 1
+    optimal_minimized_value = round(get_minimized_objective_value(constraint_model, optimal_objective_value))
+    minimized_value_tolerance = int(objective_tolerance / abs(scaling_factor))
+
+    objective_expression = get_minimized_objective_expression(near_optimal_model)
+    near_optimal_model.ClearObjective()
+    near_optimal_model.Add(objective_expression <= optimal_minimized_value + minimized_value_tolerance)
+
+    return near_optimal_model
+
+
+# Hints all the variables of the model with their values in a solution of it
+def add_hints_from_solution(constraint_model: cp_model.CpModel, solution_values: Sequence[int]) -> None:
+    constraint_model.ClearHints()
+    for variable_index, variable_value in enumerate(solution_values):
+        constraint_model.AddHint(constraint_model.GetIntVarFromProtoIndex(variable_index), variable_value)
+
+
+# The time that the limits of a search are counted in. A deterministic search counts the deterministic time of its
+# solves, so it stops at the same solve on any machine, and any other search counts the wall time from its start.
+class SearchClock:
+
+    def __init__(self, deterministic: bool):
+        self.deterministic = deterministic
+        self.start_time = time.perf_counter()
+        self.solves_deterministic_time = 0.0
+        self.paused_search_time = 0.0
+
+    def add_solve(self, solver: cp_model.CpSolver) -> None:
+        self.solves_deterministic_time += solver.ResponseProto().deterministic_time
+
+    def get_search_time(self) -> float:
+        return self.solves_deterministic_time if self.deterministic else time.perf_counter() - self.start_time
+
+    # The wall time between "pause" and "resume" is not counted, for a search that is continued later
+    def pause(self) -> None:
+        self.paused_search_time = time.perf_counter() - self.start_time
+
+    def resume(self) -> None:
+        self.start_time = time.perf_counter() - self.paused_search_time
+
+
+# Returns the time limit of the next solve of a search, or None when the total time of the search is over.
+def get_next_solve_time_limit(solver_time_limit: float, max_time_per_solve_in_seconds: float | None, max_total_time_in_seconds: float | None,
+                              search_clock: SearchClock) -> float | None:
+    solve_time_limits = [solver_time_limit]
+
+    if max_time_per_solve_in_seconds is not None:
+        solve_time_limits.append(max_time_per_solve_in_seconds)
+
+    if max_total_time_in_seconds is not None:
+        remaining_time = max_total_time_in_seconds - search_clock.get_search_time()
+        if remaining_time <= 0:
+            return None
+        solve_time_limits.append(remaining_time)
+
+    return min(solve_time_limits)
 
 
 class ScheduleSolutions:
 
-    def __init__(self, solver: cp_model.CpSolver, all_shifts: dict[ShiftCombinationsKey, IntVar], employees: list[Employee], shifts: list[Shift], constraint_model: cp_model.CpModel):
+    def __init__(self, solver: cp_model.CpSolver, all_shifts: dict[ShiftCombinationsKey, IntVar], employees: list[Employee], shifts: list[Shift], constraint_model: cp_model.CpModel,
+                 employees_schedule_states: dict[uuid.UUID | str, Hashable] | None = None, objective_stages_search_clock: SearchClock | None = None,
+                 break_employees_symmetry: bool = True):
         self.solver = solver
         self.all_shifts = all_shifts
         self.employees = employees
         self.shifts = shifts
         self.constraint_model = constraint_model
+        self.assignments_matrix_index = create_assignments_matrix_index(all_shifts, employees, shifts)
+
+        # Without the symmetry breaking, schedules that differ only by swapping interchangeable employees are different schedules
+        self.employees_canonical_ids = get_employees_canonical_ids(employees, employees_schedule_states) if break_employees_symmetry else \
+            {employee.employee_id: employee.employee_id for employee in employees}
+
+        # The wall time in seconds of every iteration of "yield_schedules", from the start of its solve until its schedule
+        # is yielded
+        self.iterations_wall_times: list[float] = []
+
+        # The status of the last search of schedules, updated after each of its solves
+        self.search_status: SchedulesSearchStatus | None = None
+
+        # The clock of the stages of a lexicographic objective, the solves that the first search started with before it was called
+        self.objective_stages_search_clock = objective_stages_search_clock
+
+        # The wall time of the stages that the last search started with, reported in its status
+        self.objective_stages_wall_time_in_seconds: float | None = None
+
+    # The time of the stages of a lexicographic objective is counted in the total time of the first search
+    def get_search_clock(self) -> SearchClock:
+        search_clock = self.objective_stages_search_clock
+        self.objective_stages_search_clock = None
+        if search_clock is None:
+            self.objective_stages_wall_time_in_seconds = None
+            return SearchClock(is_deterministic_search(self.solver.parameters))
 
-    def yield_schedules(self):
-        while True:
-            status = self.solver.Solve(self.constraint_model)
-            if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        self.objective_stages_wall_time_in_seconds = search_clock.paused_search_time
+        search_clock.resume()
+        return search_clock
 
-                num_closings_for_employees: defaultdict[uuid.UUID, int] = defaultdict(int)
-                num_mornings_for_employees: defaultdict[uuid.UUID, int] = defaultdict(int)
-                num_shift_for_employees: defaultdict[uuid.UUID, int] = defaultdict(int)
+    def update_search_status(self, solver: cp_model.CpSolver, status: int, search_start_time: float) -> None:
+        wall_time_in_seconds = time.perf_counter() - search_start_time
 
-                schedule: dict[uuid.uuid4(), uuid.uuid4()] = {}
+        if self.search_status is None:
+            self.search_status = create_schedules_search_status(solver, status, wall_time_in_seconds)
+            self.search_status.objective_stages_wall_time_in_seconds = self.objective_stages_wall_time_in_seconds
+        else:
+            self.search_status.last_solve_status = get_solve_status(solver, status)
+            self.search_status.wall_time_in_seconds = wall_time_in_seconds
+            self.search_status.time_budget_exhausted = status == cp_model.UNKNOWN
 
-                for employee in self.employees:
-                    for shift in self.shifts:
-                        if self.solver.Value(self.all_shifts[ShiftCombinationsKey(employee.employee_id, shift.shift_id)]):
-                            schedule[shift.shift_id] = employee.employee_id
+    # With "warm_start", every solve is hinted with the previous schedule. The schedules that were already yielded are
+    # forbidden, so the next schedules can not have a better objective, and the best objective bound of the previous
+    # solve is added to the model as a bound for the next one.
+    # Every schedule is different from all the schedules before it in at least "minimum_different_assignments" shifts.
+    # The schedules stop when there are no more schedules, or when a solve or the whole search runs out of time.
+    def yield_schedules(self, warm_start: bool = True, minimum_different_assignments: int = 1,
+                        max_time_per_solve_in_seconds: float | None = None, max_total_time_in_seconds: float | None = None) -> Iterator[ScheduleSolutionMetadata]:
+        objective_bound = None
+        search_clock = self.get_search_clock()
+        solver_time_limit = get_solve_time_limit(self.solver.parameters)
+        self.search_status = None
 
-                            num_shift_for_employees[employee.employee_id] += 1
+        try:
+            while True:
+                solve_time_limit = get_next_solve_time_limit(solver_time_limit, max_time_per_solve_in_seconds, max_total_time_in_seconds, search_clock)
+                if solve_time_limit is None:
+                    if self.search_status is not None:
+                        self.search_status.time_budget_exhausted = True
+                    return
 
-                            if shift.shift_type == ShiftTypesEnum.CLOSING:
-                                num_closings_for_employees[employee.employee_id] += 1
+                iteration_start_time = time.perf_counter()
+                set_solve_time_limit(self.solver.parameters, solve_time_limit)
+                status = self.solver.Solve(self.constraint_model)
+                search_clock.add_solve(self.solver)
+                self.update_search_status(self.solver, status, search_clock.start_time)
 
-                            if shift.shift_type in [ShiftTypesEnum.MORNING, ShiftTypesEnum.MORNING_BACKUP,
-                                                    ShiftTypesEnum.WEEKEND_MORNING,
-                                                    ShiftTypesEnum.WEEKEND_MORNING_BACKUP]:
-                                num_mornings_for_employees[employee.employee_id] += 1
+                if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+                    return
 
-                solution = ScheduleSolutionMetadata(num_closings_for_employees, num_mornings_for_employees,
-                                                    num_shift_for_employees, schedule)
+                solution_values = self.solver.ResponseProto().solution
+                assignments_matrix = self.assignments_matrix_index.get_assignments_matrix(solution_values)
+                solution = create_schedule_solution_metadata_from_assignments_matrix(assignments_matrix, self.assignments_matrix_index)
 
-                # After a schedule was created, forbid the model to assign one of the assignments again
-                # (make a new schedule entirely)
-                all_schedule_assignments = [self.all_shifts[ShiftCombinationsKey(employee_id, shift_id)] for
-                                            shift_id, employee_id in solution.schedule.items()]
-                all_schedule_un_assignments = []
+                if warm_start:
+                    self.constraint_model.ClearHints()
+                    for assignment in self.all_shifts.values():
+                        self.constraint_model.AddHint(assignment, solution_values[assignment.Index()])
 
-                for assignment in all_schedule_assignments:
-                    all_schedule_un_assignments.append(self.constraint_model.NewBoolVar(f"unassign_{assignment}"))
+                    if self.constraint_model.Proto().objective.vars:
+                        minimized_objective_bound = math.ceil(get_minimized_objective_value(self.constraint_model, self.solver.BestObjectiveBound()) - OBJECTIVE_BOUND_ROUNDING_TOLERANCE)
 
-                for i in range(len(all_schedule_assignments)):
-                    self.constraint_model.Add(
-                        all_schedule_assignments[i] != self.solver.Value(all_schedule_assignments[i])).OnlyEnforceIf(
-                        all_schedule_un_assignments[i])
-                    self.constraint_model.Add(
-                        all_schedule_assignments[i] == self.solver.Value(all_schedule_assignments[i])).OnlyEnforceIf(
-                        all_schedule_un_assignments[i].Not())
+                        # A new constraint is added only when the bound is tighter, the older bounds are implied by it
+                        if objective_bound is None or minimized_objective_bound > objective_bound:
+                            self.constraint_model.Add(get_minimized_objective_expression(self.constraint_model) >= minimized_objective_bound)
+                            objective_bound = minimized_objective_bound
 
-                self.constraint_model.AddBoolOr(all_schedule_un_assignments)
+                # After a schedule was created, forbid the next schedules to keep more than all but
+                # "minimum_different_assignments" of its assignments
+                all_schedule_assignments = [self.constraint_model.GetIntVarFromProtoIndex(variable_index) for
+                                            variable_index in self.assignments_matrix_index.variables_indexes[assignments_matrix]]
+                self.constraint_model.Add(sum(all_schedule_assignments) <= len(all_schedule_assignments) - minimum_different_assignments)
 
+                self.iterations_wall_times.append(time.perf_counter() - iteration_start_time)
+                self.search_status.number_of_schedules += 1
                 yield solution
+        finally:
+            set_solve_time_limit(self.solver.parameters, solver_time_limit)
+
+    # Finds the optimal objective once, and then collects up to "number_of_schedules" different schedules whose
+    # objective is at most "objective_tolerance" worse than it, in a single search. The model itself is not changed.
+    def yield_schedules_from_one_search(self, number_of_schedules: int, objective_tolerance: float = 0, minimum_different_assignments: int = 1,
+                                        max_time_per_solve_in_seconds: float | None = None, max_total_time_in_seconds: float | None = None) -> Iterator[ScheduleSolutionMetadata]:
+        search_clock = self.get_search_clock()
+        solver_time_limit = get_solve_time_limit(self.solver.parameters)
+        self.search_status = None
+
+        solve_time_limit = get_next_solve_time_limit(solver_time_limit, max_time_per_solve_in_seconds, max_total_time_in_seconds, search_clock)
+        if solve_time_limit is None:
+            return
+
+        set_solve_time_limit(self.solver.parameters, solve_time_limit)
+        status = self.solver.Solve(self.constraint_model)
+        set_solve_time_limit(self.solver.parameters, solver_time_limit)
+        search_clock.add_solve(self.solver)
+        self.update_search_status(self.solver, status, search_clock.start_time)
+
+        if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+            return
+
+        enumeration_time_limit = get_next_solve_time_limit(solver_time_limit, max_time_per_solve_in_seconds, max_total_time_in_seconds, search_clock)
+        if enumeration_time_limit is None:
+            self.search_status.time_budget_exhausted = True
+            return
+
+        near_optimal_model = create_model_of_solutions_near_the_optimal_objective(self.constraint_model, self.solver.ObjectiveValue(), objective_tolerance)
+        # Without its objective, the search can struggle to find even one near optimal schedule, so it starts from the optimal one
+        add_hints_from_solution(near_optimal_model, self.solver.ResponseProto().solution)
+
+        enumeration_solver = cp_model.CpSolver()
+        enumeration_solver.parameters.CopyFrom(self.solver.parameters)
+        # The time limit is set while the parameters are still the ones of the search, so a deterministic search stays deterministic
+        set_solve_time_limit(enumeration_solver.parameters, enumeration_time_limit)
+        enumeration_solver.parameters.enumerate_all_solutions = True
+        # All the solutions can only be enumerated by one worker
+        enumeration_solver.parameters.num_search_workers = 1
+        enumeration_solver.parameters.interleave_search = False
+
+        schedules_collector = SchedulesCollector(self.assignments_matrix_index, number_of_schedules, minimum_different_assignments, self.employees_canonical_ids)
+        enumeration_status = enumeration_solver.Solve(near_optimal_model, schedules_collector)
+        self.update_search_status(enumeration_solver, enumeration_status, search_clock.start_time)
+
+        # A search that was stopped by the collector is feasible, and a search that went over all the schedules is optimal
+        self.search_status.number_of_schedules = len(schedules_collector.schedules)
+        self.search_status.time_budget_exhausted = len(schedules_collector.schedules) < number_of_schedules and \
+            (enumeration_status == cp_model.FEASIBLE or enumeration_status == cp_model.UNKNOWN)
+
+        yield from schedules_collector.schedules
@@ -4,6 +4,7 @@ from src.models.employees.employee import Employee
 from src.models.shifts.shift import Shift
 from src.models.solution.one_schedule_solution_metadata import ScheduleSolutionMetadata
 from src.models.solution.pydantic_config import ConfigPydanticDataclass
+from src.models.solution.schedules_search_status import SchedulesSearchStatus
 
 
 @pydantic.dataclasses.dataclass(config=ConfigPydanticDataclass)
@@ -11,3 +12,4 @@ class SchedulesAndEmpsMetadata:
     schedules: list[ScheduleSolutionMetadata]
     employees: list[Employee]
     shifts: list[Shift]
+    search_status: SchedulesSearchStatus | None = None
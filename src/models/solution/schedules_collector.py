@@ -0,0 +1,60 @@
+import hashlib
+import uuid
+
+from ortools.sat.python import cp_model
+
+from src.models.solution.assignments_matrix import AssignmentsMatrixIndex, create_schedule_solution_metadata_from_assignments_matrix
+from src.models.solution.one_schedule_solution_metadata import ScheduleSolutionMetadata
+
+
+def get_number_of_different_assignments(schedule: dict[str, str], other_schedule: dict[str, str]) -> int:
+    return sum(1 for shift_id, employee_id in schedule.items() if other_schedule.get(shift_id) != employee_id)
+
+
+# Schedules that differ only by swapping interchangeable employees have the same hash. Going over the shifts in order,
+# the employees of every equivalence class are renamed to the representative of the class and the order in which they
+# first work.
+def get_canonical_schedule_hash(schedule: dict[str, str], employees_canonical_ids: dict[uuid.UUID | str, uuid.UUID | str]) -> str:
+    employees_canonical_names: dict[uuid.UUID | str, str] = {}
+    renamed_employees_in_class: dict[uuid.UUID | str, int] = {}
+    canonical_schedule = []
+
+    for shift_id, employee_id in sorted(schedule.items(), key=lambda assignment: str(assignment[0])):
+        if employee_id not in employees_canonical_names:
+            canonical_id = employees_canonical_ids.get(employee_id, employee_id)
+            employees_canonical_names[employee_id] = f"{canonical_id}_{renamed_employees_in_class.get(canonical_id, 0)}"
+            renamed_employees_in_class[canonical_id] = renamed_employees_in_class.get(canonical_id, 0) + 1
+
+        canonical_schedule.append((str(shift_id), employees_canonical_names[employee_id]))
+
+    return hashlib.sha256(repr(canonical_schedule).encode()).hexdigest()
+
+
+class SchedulesCollector(cp_model.CpSolverSolutionCallback):
+    # Collects the schedules found in one search that are different from all the schedules collected before them in at
+    # least "minimum_different_assignments" shifts, and stops the search after "max_number_of_schedules" of them.
+    # Solutions that differ only in variables other than the assignments, or only by swapping interchangeable employees,
+    # are the same schedule.
+    def __init__(self, assignments_matrix_index: AssignmentsMatrixIndex, max_number_of_schedules: int, minimum_different_assignments: int = 1,
+                 employees_canonical_ids: dict[uuid.UUID | str, uuid.UUID | str] | None = None):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.assignments_matrix_index = assignments_matrix_index
+        self.max_number_of_schedules = max_number_of_schedules
+        self.minimum_different_assignments = minimum_different_assignments
+        self.employees_canonical_ids = employees_canonical_ids if employees_canonical_ids is not None else {}
+
+        self.schedules: list[ScheduleSolutionMetadata] = []
+        self.canonical_schedules_hashes: set[str] = set()
+
+    def on_solution_callback(self):
+        assignments_matrix = self.assignments_matrix_index.get_assignments_matrix(self.Response().solution)
+        schedule_solution = create_schedule_solution_metadata_from_assignments_matrix(assignments_matrix, self.assignments_matrix_index)
+        canonical_schedule_hash = get_canonical_schedule_hash(schedule_solution.schedule, self.employees_canonical_ids)
+
+        if canonical_schedule_hash not in self.canonical_schedules_hashes and all(get_number_of_different_assignments(schedule_solution.schedule, collected_schedule.schedule) >= self.minimum_different_assignments
+               for collected_schedule in self.schedules):
+            self.schedules.append(schedule_solution)
+            self.canonical_schedules_hashes.add(canonical_schedule_hash)
+
+        if len(self.schedules) >= self.max_number_of_schedules:
+            self.StopSearch()
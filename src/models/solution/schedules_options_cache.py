@@ -0,0 +1,130 @@
+import collections
+import hashlib
+import pickle
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from src.models.employees.employee import Employee
+from src.models.shifts.shift import Shift
+from src.models.solution.one_schedule_solution_metadata import ScheduleSolutionMetadata
+from src.models.solution.problem_hash import get_canonical_value
+from src.models.solution.schedules_and_emps_metadata import SchedulesAndEmpsMetadata
+
+SCHEDULES_OPTIONS_CACHE_MAX_SIZE_IN_BYTES = 64 * 1024 * 1024
+SCHEDULES_OPTIONS_CACHE_TIME_TO_LIVE_IN_SECONDS = 10 * 60
+
+
+@dataclass
+class CachedSchedulesOptions:
+    schedules_options: SchedulesAndEmpsMetadata
+    created_time: float
+    size_in_bytes: int
+
+
+@dataclass
+class SchedulesOptionsCacheStatistics:
+    hits: int
+    misses: int
+
+    # The results that were removed because they expired, because the results were too big, or by an invalidation or a clear
+    evictions: int
+    number_of_results: int
+    size_in_bytes: int
+
+
+def get_search_settings_hash(search_settings: dict[str, Any]) -> str:
+    return hashlib.sha256(repr(get_canonical_value(search_settings)).encode()).hexdigest()
+
+
+def get_schedule_in_order(schedule: ScheduleSolutionMetadata, employees: list[Employee], shifts: list[Shift]) -> ScheduleSolutionMetadata:
+    get_employees_counts_in_order = lambda employees_counts: {employee.employee_id: employees_counts[employee.employee_id] for employee in employees
+                                                              if employee.employee_id in employees_counts}
+
+    return ScheduleSolutionMetadata(get_employees_counts_in_order(schedule.number_of_closings_for_each_emp),
+                                    get_employees_counts_in_order(schedule.number_of_mornings_for_each_emp),
+                                    get_employees_counts_in_order(schedule.number_of_shift_for_each_emp),
+                                    {shift.shift_id: schedule.schedule[shift.shift_id] for shift in shifts if shift.shift_id in schedule.schedule})
+
+
+# The problem hash is the same for the employees and the shifts in any order, so a cached result is returned in the order
+# of the request that reads it.
+def get_schedules_options_in_order(schedules_options: SchedulesAndEmpsMetadata, employees: list[Employee], shifts: list[Shift]) -> SchedulesAndEmpsMetadata:
+    return SchedulesAndEmpsMetadata([get_schedule_in_order(schedule, employees, shifts) for schedule in schedules_options.schedules], employees, shifts,
+                                    schedules_options.search_status)
+
+
+# The schedules options that were found for a problem (by its "get_problem_hash") with the given search settings,
+# including the solver profile and seed. A result expires after "time_to_live_in_seconds", and the least recently used
+# results are evicted when all the results are bigger than "max_size_in_bytes". All the results of a problem are
+# invalidated together, when one of its inputs changes.
+class SchedulesOptionsCache:
+
+    def __init__(self, max_size_in_bytes: int = SCHEDULES_OPTIONS_CACHE_MAX_SIZE_IN_BYTES,
+                 time_to_live_in_seconds: float = SCHEDULES_OPTIONS_CACHE_TIME_TO_LIVE_IN_SECONDS):
+        self.max_size_in_bytes = max_size_in_bytes
+        self.time_to_live_in_seconds = time_to_live_in_seconds
+        self.results: collections.OrderedDict[tuple[str, str], CachedSchedulesOptions] = collections.OrderedDict()
+        self.results_keys_by_problem: dict[str, set[tuple[str, str]]] = {}
+        self.size_in_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, problem_hash: str, search_settings: dict[str, Any]) -> SchedulesAndEmpsMetadata | None:
+        result_key = (problem_hash, get_search_settings_hash(search_settings))
+        cached_result = self.results.get(result_key)
+
+        if cached_result is not None and time.time() - cached_result.created_time > self.time_to_live_in_seconds:
+            self.remove(result_key)
+            self.evictions += 1
+            cached_result = None
+
+        if cached_result is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.results.move_to_end(result_key)
+
+        return cached_result.schedules_options
+
+    # The size of a result is the size of its pickle, which is close to its size in memory and is found in one pass
+    def put(self, problem_hash: str, search_settings: dict[str, Any], schedules_options: SchedulesAndEmpsMetadata) -> None:
+        result_key = (problem_hash, get_search_settings_hash(search_settings))
+        self.remove(result_key)
+
+        cached_result = CachedSchedulesOptions(schedules_options=schedules_options, created_time=time.time(), size_in_bytes=len(pickle.dumps(schedules_options)))
+        self.results[result_key] = cached_result
+        self.results_keys_by_problem.setdefault(problem_hash, set()).add(result_key)
+        self.size_in_bytes += cached_result.size_in_bytes
+
+        while self.size_in_bytes > self.max_size_in_bytes and self.results:
+            self.remove(next(iter(self.results)))
+            self.evictions += 1
+
+    def remove(self, result_key: tuple[str, str]) -> None:
+        cached_result = self.results.pop(result_key, None)
+        if cached_result is None:
+            return
+
+        self.size_in_bytes -= cached_result.size_in_bytes
+        problem_results_keys = self.results_keys_by_problem[result_key[0]]
+        problem_results_keys.discard(result_key)
+        if not problem_results_keys:
+            del self.results_keys_by_problem[result_key[0]]
+
+    def invalidate(self, problem_hash: str) -> None:
+        for result_key in list(self.results_keys_by_problem.get(problem_hash, [])):
+            self.remove(result_key)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self.evictions += len(self.results)
+        self.results.clear()
+        self.results_keys_by_problem.clear()
+        self.size_in_bytes = 0
+
+    def get_statistics(self) -> SchedulesOptionsCacheStatistics:
+        return SchedulesOptionsCacheStatistics(hits=self.hits, misses=self.misses, evictions=self.evictions, number_of_results=len(self.results),
+                                               size_in_bytes=self.size_in_bytes)
@@ -0,0 +1,180 @@
+import concurrent.futures
+import itertools
+import math
+import multiprocessing
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from ortools.sat.python import cp_model
+
+from src.models.employees.employee import Employee
+from src.models.shifts.eligible_shift_combinations import EligibleShiftCombinations
+from src.models.shifts.shift import Shift
+from src.models.shifts.shift_combinations_key import ShiftCombinationsKey
+from src.models.solution.one_schedule_solution_metadata import ScheduleSolutionMetadata
+from src.models.solution.schedule_solutions import ScheduleSolutions, get_minimized_objective_expression, get_next_solve_time_limit
+from src.models.solution.schedules_collector import get_number_of_different_assignments, get_canonical_schedule_hash
+from src.models.solution.solver_profiles import get_number_of_available_cpus, is_deterministic_search, get_solve_time_limit, set_solve_time_limit
+
+PORTFOLIO_OBJECTIVE_PERTURBATION = 0.2
+PORTFOLIO_OBJECTIVE_PERTURBATION_SCALE = 100
+PORTFOLIO_SCHEDULES_OVERSAMPLING = 1.5
+DETERMINISTIC_PORTFOLIO_NUMBER_OF_WORKERS = 4
+
+
+@dataclass
+class PortfolioWorkerSettings:
+    random_seed: int
+    number_of_schedules: int
+    minimum_different_assignments: int
+    max_time_per_solve_in_seconds: float | None
+    max_total_time_in_seconds: float | None
+    num_search_workers: int
+    perturb_objective: bool = False
+
+    # The indexes of the assignment variables that the worker can not assign
+    forbidden_assignments_indexes: list[int] = field(default_factory=list)
+
+
+@dataclass
+class PortfolioWorkerSchedules:
+    # The schedules of the worker, with the value of the original (not perturbed) minimized objective of each of them
+    schedules: list[tuple[float, ScheduleSolutionMetadata]]
+    time_budget_exhausted: bool
+
+
+def perturb_objective_coefficients(constraint_model: cp_model.CpModel, random_generator: random.Random) -> None:
+    objective = constraint_model.Proto().objective
+
+    for coefficient_index, coefficient in enumerate(objective.coeffs):
+        perturbation = 1 + random_generator.uniform(-PORTFOLIO_OBJECTIVE_PERTURBATION, PORTFOLIO_OBJECTIVE_PERTURBATION)
+        objective.coeffs[coefficient_index] = round(coefficient * PORTFOLIO_OBJECTIVE_PERTURBATION_SCALE * perturbation)
+
+
+# Runs in a process of the pool. The model is rebuilt from its serialized proto, and its assignment variables from their
+# indexes in it.
+def search_schedules_in_portfolio_worker(model_proto: bytes, solver_parameters: bytes, assignments_indexes: dict[ShiftCombinationsKey, int],
+                                         employees: list[Employee], shifts: list[Shift], worker_settings: PortfolioWorkerSettings) -> PortfolioWorkerSchedules:
+    constraint_model = cp_model.CpModel()
+    constraint_model.Proto().ParseFromString(model_proto)
+
+    all_shifts = EligibleShiftCombinations()
+    for assignment_key, assignment_index in assignments_indexes.items():
+        all_shifts[assignment_key] = constraint_model.GetIntVarFromProtoIndex(assignment_index)
+
+    original_objective_expression = get_minimized_objective_expression(constraint_model)
+    if worker_settings.perturb_objective:
+        perturb_objective_coefficients(constraint_model, random.Random(worker_settings.random_seed))
+
+    for assignment_index in worker_settings.forbidden_assignments_indexes:
+        constraint_model.Add(constraint_model.GetIntVarFromProtoIndex(assignment_index) == 0)
+
+    # A deterministic search keeps its seed and its number of workers in every process
+    solver = cp_model.CpSolver()
+    solver.parameters.ParseFromString(solver_parameters)
+    if not is_deterministic_search(solver.parameters):
+        solver.parameters.random_seed = worker_settings.random_seed
+        solver.parameters.num_search_workers = worker_settings.num_search_workers
+
+    schedule_solutions = ScheduleSolutions(solver, all_shifts, employees, shifts, constraint_model)
+    worker_schedules = []
+
+    for schedule in itertools.islice(schedule_solutions.yield_schedules(minimum_different_assignments=worker_settings.minimum_different_assignments,
+                                                                        max_time_per_solve_in_seconds=worker_settings.max_time_per_solve_in_seconds,
+                                                                        max_total_time_in_seconds=worker_settings.max_total_time_in_seconds),
+                                     worker_settings.number_of_schedules):
+        worker_schedules.append((solver.Value(original_objective_expression), schedule))
+
+    time_budget_exhausted = schedule_solutions.search_status is not None and schedule_solutions.search_status.time_budget_exhausted
+    return PortfolioWorkerSchedules(worker_schedules, time_budget_exhausted)
+
+
+# Returns the schedules with the best objective first, without schedules that are too close to a better one or that are
+# a better one with interchangeable employees swapped.
+def merge_portfolio_schedules(workers_schedules: list[PortfolioWorkerSchedules], number_of_schedules: int,
+                              minimum_different_assignments: int, employees_canonical_ids: dict[uuid.UUID | str, uuid.UUID | str] | None = None) -> list[ScheduleSolutionMetadata]:
+    objective_value_index = 0
+    all_workers_schedules = [worker_schedule for worker_schedules in workers_schedules for worker_schedule in worker_schedules.schedules]
+    employees_canonical_ids = employees_canonical_ids if employees_canonical_ids is not None else {}
+    merged_schedules: list[ScheduleSolutionMetadata] = []
+    merged_schedules_hashes: set[str] = set()
+
+    for _, schedule in sorted(all_workers_schedules, key=lambda worker_schedule: worker_schedule[objective_value_index]):
+        if len(merged_schedules) == number_of_schedules:
+            break
+
+        canonical_schedule_hash = get_canonical_schedule_hash(schedule.schedule, employees_canonical_ids)
+        if canonical_schedule_hash not in merged_schedules_hashes and \
+                all(get_number_of_different_assignments(schedule.schedule, merged_schedule.schedule) >= minimum_different_assignments
+                    for merged_schedule in merged_schedules):
+            merged_schedules.append(schedule)
+            merged_schedules_hashes.add(canonical_schedule_hash)
+
+    return merged_schedules
+
+
+# Solves the model once, and then fans it out to a pool of processes. The first worker searches the model as it is, and
+# each of the other workers has its own seed, a perturbed objective, and a different part of the first schedule's
+# assignments forbidden, so the workers look for schedules in different places. Their schedules are merged.
+def yield_schedules_from_portfolio(schedule_solutions: ScheduleSolutions, number_of_schedules: int, number_of_workers: int | None = None,
+                                   minimum_different_assignments: int = 1, max_time_per_solve_in_seconds: float | None = None,
+                                   max_total_time_in_seconds: float | None = None, random_seed: int = 0, number_of_cpus: int | None = None):
+    solver = schedule_solutions.solver
+    search_clock = schedule_solutions.get_search_clock()
+    solver_time_limit = get_solve_time_limit(solver.parameters)
+    number_of_cpus = number_of_cpus if number_of_cpus is not None else get_number_of_available_cpus()
+    if number_of_workers is None:
+        # The workers split the schedule between them, so a deterministic search has the same workers on any machine
+        number_of_workers = DETERMINISTIC_PORTFOLIO_NUMBER_OF_WORKERS if is_deterministic_search(solver.parameters) else number_of_cpus
+    schedule_solutions.search_status = None
+
+    solve_time_limit = get_next_solve_time_limit(solver_time_limit, max_time_per_solve_in_seconds, max_total_time_in_seconds, search_clock)
+    if solve_time_limit is None:
+        return
+
+    set_solve_time_limit(solver.parameters, solve_time_limit)
+    status = solver.Solve(schedule_solutions.constraint_model)
+    set_solve_time_limit(solver.parameters, solver_time_limit)
+    search_clock.add_solve(solver)
+    schedule_solutions.update_search_status(solver, status, search_clock.start_time)
+
+    if status != cp_model.OPTIMAL and status != cp_model.FEASIBLE:
+        return
+
+    assignments_matrix_index = schedule_solutions.assignments_matrix_index
+    first_schedule_assignments_indexes = assignments_matrix_index.variables_indexes[assignments_matrix_index.get_assignments_matrix(solver.ResponseProto().solution)].tolist()
+    random.Random(random_seed).shuffle(first_schedule_assignments_indexes)
+    forbidden_assignments_groups = [first_schedule_assignments_indexes[worker_index - 1::number_of_workers - 1] for worker_index in range(1, number_of_workers)]
+
+    remaining_time = None if max_total_time_in_seconds is None else max_total_time_in_seconds - search_clock.get_search_time()
+    workers_settings = [PortfolioWorkerSettings(random_seed=random_seed + worker_index,
+                                                number_of_schedules=math.ceil(PORTFOLIO_SCHEDULES_OVERSAMPLING * number_of_schedules / number_of_workers),
+                                                minimum_different_assignments=minimum_different_assignments,
+                                                max_time_per_solve_in_seconds=max_time_per_solve_in_seconds,
+                                                max_total_time_in_seconds=remaining_time,
+                                                num_search_workers=max(1, number_of_cpus // number_of_workers),
+                                                perturb_objective=worker_index > 0,
+                                                forbidden_assignments_indexes=forbidden_assignments_groups[worker_index - 1] if worker_index > 0 else [])
+                        for worker_index in range(number_of_workers)]
+
+    model_proto = schedule_solutions.constraint_model.Proto().SerializeToString()
+    solver_parameters = solver.parameters.SerializeToString()
+    assignments_indexes = {assignment_key: assignment.Index() for assignment_key, assignment in schedule_solutions.all_shifts.items()}
+
+    # Processes are spawned, OR-Tools threads can not be forked safely
+    with concurrent.futures.ProcessPoolExecutor(max_workers=number_of_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        workers_schedules = list(executor.map(search_schedules_in_portfolio_worker, itertools.repeat(model_proto), itertools.repeat(solver_parameters),
+                                              itertools.repeat(assignments_indexes), itertools.repeat(schedule_solutions.employees),
+                                              itertools.repeat(schedule_solutions.shifts), workers_settings))
+
+    merged_schedules = merge_portfolio_schedules(workers_schedules, number_of_schedules, minimum_different_assignments,
+                                                 schedule_solutions.employees_canonical_ids)
+
+    schedule_solutions.search_status.number_of_schedules = len(merged_schedules)
+    schedule_solutions.search_status.wall_time_in_seconds = time.perf_counter() - search_clock.start_time
+    schedule_solutions.search_status.time_budget_exhausted = len(merged_schedules) < number_of_schedules and \
+        any(worker_schedules.time_budget_exhausted for worker_schedules in workers_schedules)
+
+    yield from merged_schedules
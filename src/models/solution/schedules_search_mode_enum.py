@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class SchedulesSearchModeEnum(Enum):
+    RESOLVE_FOR_EACH_SCHEDULE = "resolve for each schedule"   # A new solve for every schedule, on a model that forbids the previous ones
+    ONE_SEARCH = "one search"                                 # The schedules near the optimal objective are collected in one search
+    PORTFOLIO = "portfolio"                                   # Diverse searches of the same model in a pool of processes
+    AGGREGATED = "aggregated"                                 # One schedule from a model of classes of employees, for very big staffs
+    COMPONENTS = "components"                                 # One schedule, stitched from the independent parts of the staff solved in parallel
+    ROLLING_HORIZON = "rolling horizon"                       # One schedule of a long horizon, solved in overlapping windows
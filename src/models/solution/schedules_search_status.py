@@ -0,0 +1,43 @@
+import pydantic
+from ortools.sat.python import cp_model
+
+from src.models.solution.pydantic_config import ConfigPydanticDataclass
+from src.models.solution.solve_status_enum import SolveStatusEnum
+
+
+@pydantic.dataclasses.dataclass(config=ConfigPydanticDataclass)
+class SchedulesSearchStatus:
+    # The first solve of the search, the one of the best schedule
+    status: SolveStatusEnum
+    objective_value: float | None
+    best_objective_bound: float | None
+    objective_gap: float | None
+
+    # The whole search
+    last_solve_status: SolveStatusEnum
+    number_of_schedules: int
+    wall_time_in_seconds: float
+    time_budget_exhausted: bool
+
+    # The wall time of the stages of a lexicographic objective, which is part of "wall_time_in_seconds". None when the
+    # search did not start with them: a weighted sum, a search after the first one, or a cached model, whose stages were
+    # solved when it was built.
+    objective_stages_wall_time_in_seconds: float | None = None
+
+
+def get_solve_status(solver: cp_model.CpSolver, status: int) -> SolveStatusEnum:
+    return SolveStatusEnum[solver.StatusName(status)]
+
+
+def create_schedules_search_status(solver: cp_model.CpSolver, status: int, wall_time_in_seconds: float) -> SchedulesSearchStatus:
+    objective_value, best_objective_bound, objective_gap = None, None, None
+
+    if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
+        objective_value = solver.ObjectiveValue()
+        best_objective_bound = solver.BestObjectiveBound()
+        objective_gap = abs(objective_value - best_objective_bound) / max(1.0, abs(objective_value))
+
+    return SchedulesSearchStatus(status=get_solve_status(solver, status), objective_value=objective_value,
+                                 best_objective_bound=best_objective_bound, objective_gap=objective_gap,
+                                 last_solve_status=get_solve_status(solver, status), number_of_schedules=0,
+                                 wall_time_in_seconds=wall_time_in_seconds, time_budget_exhausted=status == cp_model.UNKNOWN)
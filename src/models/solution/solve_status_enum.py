@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+# The statuses of a CP-SAT solve, by their names in "CpSolver.StatusName"
+class SolveStatusEnum(Enum):
+    OPTIMAL = "optimal"
+    FEASIBLE = "feasible"
+    INFEASIBLE = "infeasible"
+    UNKNOWN = "unknown"             # The time limit was reached before a schedule was found or the model was proven infeasible
+    MODEL_INVALID = "model invalid"
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class SolverProfileEnum(Enum):
+    FAST = "fast"                     # A good schedule quickly, stops within a small gap from the best objective bound
+    BALANCED = "balanced"
+    OPTIMAL = "optimal"               # All the workers and the strongest linear relaxation, no time limit
+    DETERMINISTIC = "deterministic"   # The same schedules for the same input, on any machine
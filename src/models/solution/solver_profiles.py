@@ -0,0 +1,108 @@
+import math
+import os
+
+from ortools.sat import sat_parameters_pb2
+from ortools.sat.python import cp_model
+
+from src.models.solution.solver_profile_enum import SolverProfileEnum
+
+SOLVER_PROFILE_ENVIRONMENT_VARIABLE = "SCHEDULE_SOLVER_PROFILE"
+DEFAULT_SOLVER_PROFILE = SolverProfileEnum.BALANCED
+
+FAST_PROFILE_MAX_WORKERS = 8
+FAST_PROFILE_MAX_TIME_IN_SECONDS = 2
+FAST_PROFILE_RELATIVE_GAP_LIMIT = 0.05
+BALANCED_PROFILE_MAX_TIME_IN_SECONDS = 10
+BALANCED_PROFILE_RELATIVE_GAP_LIMIT = 0.01
+DETERMINISTIC_PROFILE_RANDOM_SEED = 0
+
+# Fixed and not sized to the cpus, since the interleaved search depends on the number of workers
+DETERMINISTIC_PROFILE_NUMBER_OF_WORKERS = 8
+
+CGROUP_V2_CPU_MAX_FILE = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_CPU_QUOTA_FILE = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_V1_CPU_PERIOD_FILE = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+
+# Returns the number of cpus of the container's cpu quota (cgroup v2 or v1), or None when there is no quota.
+def get_cpu_quota(cgroup_v2_cpu_max_file: str = CGROUP_V2_CPU_MAX_FILE, cgroup_v1_cpu_quota_file: str = CGROUP_V1_CPU_QUOTA_FILE,
+                  cgroup_v1_cpu_period_file: str = CGROUP_V1_CPU_PERIOD_FILE) -> int | None:
+    try:
+        with open(cgroup_v2_cpu_max_file) as cpu_max_file:
+            quota, period = cpu_max_file.read().split()
+        if quota != "max":
+            return max(1, math.ceil(int(quota) / int(period)))
+        return None
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open(cgroup_v1_cpu_quota_file) as quota_file, open(cgroup_v1_cpu_period_file) as period_file:
+            quota, period = int(quota_file.read()), int(period_file.read())
+        if quota > 0:
+            return max(1, math.ceil(quota / period))
+    except (OSError, ValueError):
+        pass
+
+    return None
+
+
+# The cpus the process may run on, limited by the container's cpu quota.
+def get_number_of_available_cpus() -> int:
+    number_of_cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    cpu_quota = get_cpu_quota()
+
+    return min(number_of_cpus, cpu_quota) if cpu_quota is not None else number_of_cpus
+
+
+def get_default_solver_profile() -> SolverProfileEnum:
+    return SolverProfileEnum(os.environ.get(SOLVER_PROFILE_ENVIRONMENT_VARIABLE, DEFAULT_SOLVER_PROFILE.value))
+
+
+def configure_solver_profile(solver: cp_model.CpSolver, solver_profile: SolverProfileEnum, random_seed: int | None = None,
+                             number_of_cpus: int | None = None) -> None:
+    number_of_cpus = number_of_cpus if number_of_cpus is not None else get_number_of_available_cpus()
+    parameters = solver.parameters
+    # A solver that is configured again has only the settings of its new profile
+    parameters.Clear()
+
+    if solver_profile == SolverProfileEnum.FAST:
+        parameters.num_search_workers = min(number_of_cpus, FAST_PROFILE_MAX_WORKERS)
+        parameters.linearization_level = 0
+        parameters.max_time_in_seconds = FAST_PROFILE_MAX_TIME_IN_SECONDS
+        parameters.relative_gap_limit = FAST_PROFILE_RELATIVE_GAP_LIMIT
+    elif solver_profile == SolverProfileEnum.BALANCED:
+        parameters.num_search_workers = number_of_cpus
+        parameters.linearization_level = 1
+        parameters.max_time_in_seconds = BALANCED_PROFILE_MAX_TIME_IN_SECONDS
+        parameters.relative_gap_limit = BALANCED_PROFILE_RELATIVE_GAP_LIMIT
+    elif solver_profile == SolverProfileEnum.OPTIMAL:
+        parameters.num_search_workers = number_of_cpus
+        parameters.linearization_level = 2
+    elif solver_profile == SolverProfileEnum.DETERMINISTIC:
+        # The workers are interleaved in one thread so the search does not depend on timing, and their number does not
+        # depend on the machine. Its time limits are deterministic, see "set_solve_time_limit".
+        parameters.num_search_workers = DETERMINISTIC_PROFILE_NUMBER_OF_WORKERS
+        parameters.interleave_search = True
+        parameters.random_seed = DETERMINISTIC_PROFILE_RANDOM_SEED
+
+    if random_seed is not None:
+        parameters.random_seed = random_seed
+
+
+# An interleaved search gives the same schedules on any machine only when it is not stopped by the wall clock, so its
+# time limits are in the solver's deterministic time, which counts the work of the search and not the seconds it took.
+# The search modes keep the number of workers and the seed of a deterministic search.
+def is_deterministic_search(parameters: sat_parameters_pb2.SatParameters) -> bool:
+    return parameters.interleave_search
+
+
+def get_solve_time_limit(parameters: sat_parameters_pb2.SatParameters) -> float:
+    return parameters.max_deterministic_time if is_deterministic_search(parameters) else parameters.max_time_in_seconds
+
+
+def set_solve_time_limit(parameters: sat_parameters_pb2.SatParameters, time_limit_in_seconds: float) -> None:
+    if is_deterministic_search(parameters):
+        parameters.max_deterministic_time = time_limit_in_seconds
+    else:
+        parameters.max_time_in_seconds = time_limit_in_seconds
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class SquaredDeviationEncodingEnum(Enum):
+    MULTIPLICATION = "multiplication"       # The deviation multiplied by itself, with "AddMultiplicationEquality"
+    ELEMENT = "element"                     # The square of the deviation is looked up in a table of squares, with "AddElement"
+    PIECEWISE_LINEAR = "piecewise linear"   # The square is bounded from below by the lines between every two consecutive squares
@@ -1,15 +1,43 @@
-import itertools
+import asyncio
+import contextlib
+import datetime
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.models.employees.employees_file import all_employees
 from src.models.shifts.shifts_file import all_shifts_in_the_week
-from src.models.solution.create_solutions import create_solutions
-from src.models.solution.schedule_solutions import ScheduleSolutions
+from src.models.solution.model_backend_enum import ModelBackendEnum
+from src.models.solution.model_cache import ModelCacheStatistics, merge_model_caches_statistics
+from src.models.solution.objective_mode_enum import ObjectiveModeEnum
+from src.models.solution.problem_hash import get_problem_hash
 from src.models.solution.schedules_and_emps_metadata import SchedulesAndEmpsMetadata
+from src.models.solution.schedules_options_cache import SchedulesOptionsCache, SchedulesOptionsCacheStatistics, get_schedules_options_in_order
+from src.models.solution.schedules_search_mode_enum import SchedulesSearchModeEnum
+from src.models.solution.solve_status_enum import SolveStatusEnum
+from src.models.solution.solver_profile_enum import SolverProfileEnum
+from src.server.schedule_job_status_enum import ScheduleJobStatusEnum
+from src.server.schedule_jobs import ScheduleJob, ScheduleJobsQueue, ScheduleJobStatus, create_schedule_job_status
+from src.server.schedule_options import (MAX_TIME_PER_SOLVE_IN_SECONDS, MAX_TOTAL_TIME_IN_SECONDS, ScheduleOptionsJobResult, ScheduleOptionsRequest,
+                                         run_schedule_options_job)
 
-app = FastAPI()
+# How long a client is told to wait before submitting again when the jobs queue is full
+RETRY_AFTER_IN_SECONDS = 10
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    schedule_jobs_queue.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+
+schedules_options_cache = SchedulesOptionsCache()
+schedule_jobs_queue = ScheduleJobsQueue()
+
+# The last statistics of the model cache of every process of the jobs queue
+model_caches_statistics_by_process: dict[int, ModelCacheStatistics] = {}
 
 origins = [
     "http://localhost",
@@ -29,17 +57,119 @@ app.add_middleware(
 async def index():
     return {"Hey There"}
 
+
+def get_problem_hash_of_request(schedule_options_request: ScheduleOptionsRequest) -> str:
+    return get_problem_hash(schedule_options_request.employees, schedule_options_request.shifts, {})
+
+
+# Runs in the event loop when a job is done, so the caches are only used by the event loop. The result of a job that was
+# cancelled while it was running is thrown away.
+def add_schedule_options_job_result(schedule_job: ScheduleJob, schedule_options_request: ScheduleOptionsRequest) -> None:
+    if schedule_job.future.cancelled() or schedule_job.future.exception() is not None:
+        return
+
+    job_result: ScheduleOptionsJobResult = schedule_job.future.result()
+    model_caches_statistics_by_process[job_result.process_id] = job_result.model_cache_statistics
+
+    if schedule_job.cancel_requested:
+        return
+
+    # A search that ran out of time before finding a schedule may find one when it is requested again
+    search_status = job_result.schedules_options.search_status
+    if search_status is None or search_status.status != SolveStatusEnum.UNKNOWN:
+        schedules_options_cache.put(get_problem_hash_of_request(schedule_options_request), schedule_options_request.get_search_settings(),
+                                    job_result.schedules_options)
+
+
+# A request whose schedules options are cached is a finished job, and any other request is searched in the jobs queue.
+# Raises a 429 when the queue is full.
+def submit_schedule_options_job(schedule_options_request: ScheduleOptionsRequest) -> ScheduleJob:
+    cached_schedules_options = schedules_options_cache.get(get_problem_hash_of_request(schedule_options_request), schedule_options_request.get_search_settings())
+    if cached_schedules_options is not None:
+        return schedule_jobs_queue.add_finished_job(ScheduleOptionsJobResult(get_schedules_options_in_order(cached_schedules_options, schedule_options_request.employees,
+                                                                                                           schedule_options_request.shifts)))
+
+    schedule_job = schedule_jobs_queue.submit(run_schedule_options_job, schedule_options_request, schedule_jobs_queue.get_number_of_cpus_per_worker())
+    if schedule_job is None:
+        raise HTTPException(status_code=429, detail="Too many schedule options jobs, try again later",
+                            headers={"Retry-After": str(RETRY_AFTER_IN_SECONDS)})
+
+    event_loop = asyncio.get_running_loop()
+    schedule_job.future.add_done_callback(lambda _: event_loop.call_soon_threadsafe(add_schedule_options_job_result, schedule_job, schedule_options_request))
+
+    return schedule_job
+
+
+def get_schedule_job(job_id: str) -> ScheduleJob:
+    schedule_job = schedule_jobs_queue.get(job_id)
+    if schedule_job is None:
+        raise HTTPException(status_code=404, detail=f"No schedule options job {job_id}")
+
+    return schedule_job
+
+
 @app.get("/create_and_get_schedule_options", response_model=SchedulesAndEmpsMetadata)
-async def create_and_get_schedule_options():
-    employees = all_employees
-    shifts = all_shifts_in_the_week
+async def create_and_get_schedule_options(model_backend: ModelBackendEnum = ModelBackendEnum.BOOLEAN_SUMS,
+                                          search_mode: SchedulesSearchModeEnum = SchedulesSearchModeEnum.ONE_SEARCH,
+                                          objective_tolerance: float = 0, minimum_different_assignments: int = 1,
+                                          max_time_per_solve_in_seconds: float = MAX_TIME_PER_SOLVE_IN_SECONDS,
+                                          max_total_time_in_seconds: float = MAX_TOTAL_TIME_IN_SECONDS,
+                                          solver_profile: SolverProfileEnum | None = None, random_seed: int | None = None,
+                                          objective_mode: ObjectiveModeEnum = ObjectiveModeEnum.WEIGHTED_SUM,
+                                          min_time_between_shifts: datetime.timedelta | None = None):
+    schedule_options_request = ScheduleOptionsRequest(all_employees, all_shifts_in_the_week, model_backend, search_mode, objective_tolerance,
+                                                      minimum_different_assignments, max_time_per_solve_in_seconds, max_total_time_in_seconds,
+                                                      solver_profile, random_seed, objective_mode, min_time_between_shifts)
+    schedule_job = submit_schedule_options_job(schedule_options_request)
+    job_result: ScheduleOptionsJobResult = await asyncio.wrap_future(schedule_job.future)
+
+    return job_result.schedules_options
+
+
+@app.post("/schedule_options_jobs", response_model=ScheduleJobStatus, status_code=202)
+async def create_schedule_options_job(schedule_options_request: ScheduleOptionsRequest):
+    return create_schedule_job_status(submit_schedule_options_job(schedule_options_request))
+
+
+@app.get("/schedule_options_jobs/{job_id}", response_model=ScheduleJobStatus)
+async def get_schedule_options_job_status(job_id: str):
+    return create_schedule_job_status(get_schedule_job(job_id))
+
+
+@app.get("/schedule_options_jobs/{job_id}/result", response_model=SchedulesAndEmpsMetadata)
+async def get_schedule_options_job_result(job_id: str):
+    schedule_job = get_schedule_job(job_id)
+    status = schedule_job.get_status()
+    if status != ScheduleJobStatusEnum.DONE:
+        raise HTTPException(status_code=409, detail=f"The schedule options job {job_id} is {status.value}")
+
+    return schedule_job.future.result().schedules_options
+
+
+@app.delete("/schedule_options_jobs/{job_id}", response_model=ScheduleJobStatus)
+async def cancel_schedule_options_job(job_id: str):
+    schedule_job = get_schedule_job(job_id)
+    schedule_jobs_queue.cancel(schedule_job)
+
+    return create_schedule_job_status(schedule_job)
+
+
+@app.get("/model_cache_statistics", response_model=ModelCacheStatistics)
+async def get_model_cache_statistics():
+    return merge_model_caches_statistics(list(model_caches_statistics_by_process.values()))
+
+
+@app.get("/schedule_options_cache_statistics", response_model=SchedulesOptionsCacheStatistics)
+async def get_schedule_options_cache_statistics():
+    return schedules_options_cache.get_statistics()
 
-    schedule_solution: ScheduleSolutions = create_solutions(employees, shifts)
 
-    schedules_options = []
-    for i in itertools.islice(schedule_solution.yield_schedules(), 100):
-        schedules_options.append(i)
+@app.delete("/schedule_options_cache")
+async def clear_schedule_options_cache():
+    schedules_options_cache.clear()
 
-    metadata = SchedulesAndEmpsMetadata(schedules_options, employees, shifts)
 
-    return metadata
+# Drops the results of one problem, when one of its employees or shifts changed
+@app.delete("/schedule_options_cache/{problem_hash}")
+async def invalidate_schedule_options_cache(problem_hash: str):
+    schedules_options_cache.invalidate(problem_hash)
@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class ScheduleJobStatusEnum(Enum):
+    QUEUED = "queued"          # Waiting for a free process of the pool
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"          # The search raised an error
+    CANCELLED = "cancelled"
@@ -0,0 +1,122 @@
+import concurrent.futures
+import multiprocessing
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import pydantic.dataclasses
+
+from src.models.solution.pydantic_config import ConfigPydanticDataclass
+from src.models.solution.solver_profiles import get_number_of_available_cpus
+from src.server.schedule_job_status_enum import ScheduleJobStatusEnum
+
+SCHEDULE_JOBS_NUMBER_OF_WORKERS = 2
+SCHEDULE_JOBS_MAX_QUEUED_JOBS = 8
+
+# A finished job is kept for its result this long after it was submitted
+SCHEDULE_JOBS_TIME_TO_LIVE_IN_SECONDS = 60 * 60
+
+
+@dataclass
+class ScheduleJob:
+    job_id: str
+    future: concurrent.futures.Future
+    created_time: float = field(default_factory=time.time)
+
+    # A running job can not be stopped, so when it is cancelled its result is thrown away when it is done
+    cancel_requested: bool = False
+
+    def get_status(self) -> ScheduleJobStatusEnum:
+        if self.cancel_requested or self.future.cancelled():
+            return ScheduleJobStatusEnum.CANCELLED
+        if self.future.done():
+            return ScheduleJobStatusEnum.FAILED if self.future.exception() is not None else ScheduleJobStatusEnum.DONE
+        if self.future.running():
+            return ScheduleJobStatusEnum.RUNNING
+
+        return ScheduleJobStatusEnum.QUEUED
+
+
+@pydantic.dataclasses.dataclass(config=ConfigPydanticDataclass)
+class ScheduleJobStatus:
+    job_id: str
+    status: ScheduleJobStatusEnum
+    error: str | None = None
+
+
+def create_schedule_job_status(schedule_job: ScheduleJob) -> ScheduleJobStatus:
+    status = schedule_job.get_status()
+    error = repr(schedule_job.future.exception()) if status == ScheduleJobStatusEnum.FAILED else None
+
+    return ScheduleJobStatus(job_id=schedule_job.job_id, status=status, error=error)
+
+
+# The jobs of the server, run in a pool of "number_of_workers" processes. At most "max_queued_jobs" jobs wait for a
+# process, and a job that is submitted when the queue is full is refused, so the server tells its client to come back
+# later instead of piling up searches that will time out anyway.
+class ScheduleJobsQueue:
+
+    def __init__(self, number_of_workers: int = SCHEDULE_JOBS_NUMBER_OF_WORKERS, max_queued_jobs: int = SCHEDULE_JOBS_MAX_QUEUED_JOBS,
+                 time_to_live_in_seconds: float = SCHEDULE_JOBS_TIME_TO_LIVE_IN_SECONDS):
+        self.number_of_workers = number_of_workers
+        self.max_queued_jobs = max_queued_jobs
+        self.time_to_live_in_seconds = time_to_live_in_seconds
+        self.jobs: dict[str, ScheduleJob] = {}
+        self.executor: concurrent.futures.ProcessPoolExecutor | None = None
+
+    # The pool is started with the first job, so importing the server does not start processes. Processes are spawned,
+    # OR-Tools threads can not be forked safely.
+    def get_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.number_of_workers, mp_context=multiprocessing.get_context("spawn"))
+
+        return self.executor
+
+    # The cpus are divided between the processes, so the jobs that run together do not use more than all of them
+    def get_number_of_cpus_per_worker(self) -> int:
+        return max(1, get_number_of_available_cpus() // self.number_of_workers)
+
+    def get_number_of_unfinished_jobs(self) -> int:
+        return sum(not schedule_job.future.done() for schedule_job in self.jobs.values())
+
+    def remove_expired_jobs(self) -> None:
+        expired_jobs_ids = [job_id for job_id, schedule_job in self.jobs.items()
+                            if schedule_job.future.done() and time.time() - schedule_job.created_time > self.time_to_live_in_seconds]
+        for job_id in expired_jobs_ids:
+            del self.jobs[job_id]
+
+    # Returns None when the queue is full
+    def submit(self, job_function: Callable[..., Any], *job_arguments: Any) -> ScheduleJob | None:
+        self.remove_expired_jobs()
+        if self.get_number_of_unfinished_jobs() >= self.number_of_workers + self.max_queued_jobs:
+            return None
+
+        schedule_job = ScheduleJob(job_id=uuid.uuid4().hex, future=self.get_executor().submit(job_function, *job_arguments))
+        self.jobs[schedule_job.job_id] = schedule_job
+
+        return schedule_job
+
+    # A job whose result is already known, so it takes no place in the queue
+    def add_finished_job(self, job_result: Any) -> ScheduleJob:
+        self.remove_expired_jobs()
+
+        future = concurrent.futures.Future()
+        future.set_result(job_result)
+        schedule_job = ScheduleJob(job_id=uuid.uuid4().hex, future=future)
+        self.jobs[schedule_job.job_id] = schedule_job
+
+        return schedule_job
+
+    def get(self, job_id: str) -> ScheduleJob | None:
+        return self.jobs.get(job_id)
+
+    # A queued job is removed from the queue, and a running job finishes without its result
+    def cancel(self, schedule_job: ScheduleJob) -> None:
+        if not schedule_job.future.cancel() and not schedule_job.future.done():
+            schedule_job.cancel_requested = True
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,121 @@
+import datetime
+import itertools
+import os
+from dataclasses import dataclass
+
+import pydantic.dataclasses
+
+from src.models.employees.employee import Employee
+from src.models.shifts.shift import Shift
+from src.models.solution.aggregated_schedule import create_aggregated_schedule
+from src.models.solution.model_backend_enum import ModelBackendEnum
+from src.models.solution.model_cache import ModelCache, ModelCacheStatistics, create_solutions_with_model_cache
+from src.models.solution.objective_mode_enum import ObjectiveModeEnum
+from src.models.solution.pydantic_config import ConfigPydanticDataclass
+from src.models.solution.rolling_horizon import create_rolling_horizon_schedule
+from src.models.solution.schedule_components import create_schedule_from_components
+from src.models.solution.schedule_solutions import ScheduleSolutions
+from src.models.solution.schedules_and_emps_metadata import SchedulesAndEmpsMetadata
+from src.models.solution.schedules_portfolio import yield_schedules_from_portfolio
+from src.models.solution.schedules_search_mode_enum import SchedulesSearchModeEnum
+from src.models.solution.solver_profile_enum import SolverProfileEnum
+
+NUMBER_OF_SCHEDULE_OPTIONS = 100
+MAX_TIME_PER_SOLVE_IN_SECONDS = 10
+MAX_TOTAL_TIME_IN_SECONDS = 30
+
+# Every process that searches schedules keeps its own models
+model_cache = ModelCache()
+
+
+@pydantic.dataclasses.dataclass(config=ConfigPydanticDataclass)
+class ScheduleOptionsRequest:
+    employees: list[Employee]
+    shifts: list[Shift]
+    model_backend: ModelBackendEnum = ModelBackendEnum.BOOLEAN_SUMS
+    search_mode: SchedulesSearchModeEnum = SchedulesSearchModeEnum.ONE_SEARCH
+    objective_tolerance: float = 0
+    minimum_different_assignments: int = 1
+    max_time_per_solve_in_seconds: float = MAX_TIME_PER_SOLVE_IN_SECONDS
+    max_total_time_in_seconds: float = MAX_TOTAL_TIME_IN_SECONDS
+    solver_profile: SolverProfileEnum | None = None
+    random_seed: int | None = None
+    objective_mode: ObjectiveModeEnum = ObjectiveModeEnum.WEIGHTED_SUM
+    min_time_between_shifts: datetime.timedelta | None = None
+
+    # Everything but the problem itself, the arguments of "create_schedule_options" after the employees and the shifts
+    def get_search_settings(self) -> dict:
+        return {"model_backend": self.model_backend, "search_mode": self.search_mode, "objective_tolerance": self.objective_tolerance,
+                "minimum_different_assignments": self.minimum_different_assignments, "max_time_per_solve_in_seconds": self.max_time_per_solve_in_seconds,
+                "max_total_time_in_seconds": self.max_total_time_in_seconds, "solver_profile": self.solver_profile, "random_seed": self.random_seed,
+                "objective_mode": self.objective_mode, "min_time_between_shifts": self.min_time_between_shifts}
+
+
+@dataclass
+class ScheduleOptionsJobResult:
+    schedules_options: SchedulesAndEmpsMetadata
+
+    # The process that searched the schedules and its model cache, or None when the schedules options were cached
+    process_id: int | None = None
+    model_cache_statistics: ModelCacheStatistics | None = None
+
+
+def create_schedule_options(employees: list[Employee], shifts: list[Shift], model_backend: ModelBackendEnum, search_mode: SchedulesSearchModeEnum,
+                            objective_tolerance: float, minimum_different_assignments: int, max_time_per_solve_in_seconds: float,
+                            max_total_time_in_seconds: float, solver_profile: SolverProfileEnum | None, random_seed: int | None,
+                            objective_mode: ObjectiveModeEnum, min_time_between_shifts: datetime.timedelta | None = None,
+                            number_of_cpus: int | None = None) -> SchedulesAndEmpsMetadata:
+    if search_mode == SchedulesSearchModeEnum.AGGREGATED:
+        aggregated_schedule = create_aggregated_schedule(employees, shifts, min_time_between_shifts, max_time_per_solve_in_seconds=max_time_per_solve_in_seconds,
+                                                         solver_profile=solver_profile, random_seed=random_seed, number_of_cpus=number_of_cpus)
+        schedules_options = [aggregated_schedule.schedule] if aggregated_schedule.schedule is not None else []
+
+        return SchedulesAndEmpsMetadata(schedules_options, employees, shifts, aggregated_schedule.search_status)
+
+    if search_mode == SchedulesSearchModeEnum.COMPONENTS:
+        components_schedule = create_schedule_from_components(employees, shifts, model_backend, min_time_between_shifts, solver_profile=solver_profile, random_seed=random_seed,
+                                                              max_time_in_seconds=max_time_per_solve_in_seconds, number_of_cpus=number_of_cpus)
+        schedules_options = [components_schedule.schedule] if components_schedule.schedule is not None else []
+
+        return SchedulesAndEmpsMetadata(schedules_options, employees, shifts, components_schedule.search_status)
+
+    if search_mode == SchedulesSearchModeEnum.ROLLING_HORIZON:
+        rolling_horizon_schedule = create_rolling_horizon_schedule(employees, shifts, model_backend=model_backend, min_time_between_shifts=min_time_between_shifts,
+                                                                   solver_profile=solver_profile, random_seed=random_seed,
+                                                                   max_time_per_window_in_seconds=max_time_per_solve_in_seconds, number_of_cpus=number_of_cpus)
+        schedules_options = [rolling_horizon_schedule.schedule] if rolling_horizon_schedule.schedule is not None else []
+
+        return SchedulesAndEmpsMetadata(schedules_options, employees, shifts, rolling_horizon_schedule.search_status)
+
+    schedule_solution: ScheduleSolutions = create_solutions_with_model_cache(model_cache, employees, shifts, model_backend, min_time_between_shifts, solver_profile=solver_profile,
+                                                                             random_seed=random_seed, objective_mode=objective_mode,
+                                                                             max_time_per_solve_in_seconds=max_time_per_solve_in_seconds,
+                                                                             max_total_time_in_seconds=max_total_time_in_seconds, number_of_cpus=number_of_cpus)
+
+    if search_mode == SchedulesSearchModeEnum.ONE_SEARCH:
+        schedules_options = list(schedule_solution.yield_schedules_from_one_search(NUMBER_OF_SCHEDULE_OPTIONS, objective_tolerance, minimum_different_assignments,
+                                                                                   max_time_per_solve_in_seconds, max_total_time_in_seconds))
+    elif search_mode == SchedulesSearchModeEnum.PORTFOLIO:
+        schedules_options = list(yield_schedules_from_portfolio(schedule_solution, NUMBER_OF_SCHEDULE_OPTIONS, minimum_different_assignments=minimum_different_assignments,
+                                                                max_time_per_solve_in_seconds=max_time_per_solve_in_seconds,
+                                                                max_total_time_in_seconds=max_total_time_in_seconds, number_of_cpus=number_of_cpus))
+    else:
+        schedules_options = []
+        for i in itertools.islice(schedule_solution.yield_schedules(minimum_different_assignments=minimum_different_assignments,
+                                                                    max_time_per_solve_in_seconds=max_time_per_solve_in_seconds,
+                                                                    max_total_time_in_seconds=max_total_time_in_seconds), NUMBER_OF_SCHEDULE_OPTIONS):
+            schedules_options.append(i)
+
+    metadata = SchedulesAndEmpsMetadata(schedules_options, employees, shifts, schedule_solution.search_status)
+
+    return metadata
+
+
+# Runs in a process of the schedule jobs pool, with its share of the cpus for its solvers and its own pools. The
+# statistics of the model cache of the process are returned with the schedules, so the server can report the caches of
+# all its processes.
+def run_schedule_options_job(schedule_options_request: ScheduleOptionsRequest, number_of_cpus: int | None = None) -> ScheduleOptionsJobResult:
+    schedules_options = create_schedule_options(schedule_options_request.employees, schedule_options_request.shifts, **schedule_options_request.get_search_settings(),
+                                                number_of_cpus=number_of_cpus)
+
+    return ScheduleOptionsJobResult(schedules_options, os.getpid(), model_cache.get_statistics())
@@ -0,0 +1,73 @@
+from ortools.sat.python import cp_model
+
+from src.models.employees.employee import Employee
+from src.models.employees.employee_status_enum import EmployeeStatusEnum
+from src.models.employees.employees_file import all_employees
+from src.models.shifts.shifts_file import all_shifts_in_the_week
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.aggregated_schedule import get_employees_classes, create_aggregated_model, create_aggregated_schedule, get_class_shifts, \
+    add_class_shifts_no_good_cut, validate_aggregated_schedule
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.solve_status_enum import SolveStatusEnum
+from src.models.solution.create_solutions import AFTERNOON_START_TIME
+
+
+def test_employees_with_the_same_trained_shifts_and_status_are_in_the_same_class():
+    morning_employee = Employee(name="morning_employee", employee_id="morning_employee", shift_types_trained_to_do=[ShiftTypesEnum.MORNING, ShiftTypesEnum.EVENING])
+    other_morning_employee = Employee(name="other_morning_employee", employee_id="other_morning_employee", shift_types_trained_to_do=[ShiftTypesEnum.EVENING, ShiftTypesEnum.MORNING])
+    senior_morning_employee = Employee(name="senior_morning_employee", employee_id="senior_morning_employee", employee_status=EmployeeStatusEnum.senior_employee,
+                                       shift_types_trained_to_do=[ShiftTypesEnum.MORNING, ShiftTypesEnum.EVENING])
+    closing_employee = Employee(name="closing_employee", employee_id="closing_employee", shift_types_trained_to_do=[ShiftTypesEnum.CLOSING])
+
+    employees_classes = get_employees_classes([morning_employee, other_morning_employee, senior_morning_employee, closing_employee])
+
+    assert list(employees_classes.values()) == [[morning_employee, other_morning_employee], [senior_morning_employee], [closing_employee]]
+
+
+def test_the_aggregated_schedule_keeps_all_the_constraints_and_reports_its_distance_from_the_full_model():
+    aggregated_schedule = create_aggregated_schedule(all_employees, all_shifts_in_the_week, full_model_bound_time_in_seconds=1)
+
+    full_schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+    full_schedule_solution.solver.parameters.relative_gap_limit = 0
+    full_schedule_solution.solver.Solve(full_schedule_solution.constraint_model)
+
+    search_status = aggregated_schedule.search_status
+    assert aggregated_schedule.schedule is not None
+    assert set(aggregated_schedule.schedule.schedule) == {shift.shift_id for shift in all_shifts_in_the_week}
+    assert search_status.status in [SolveStatusEnum.OPTIMAL, SolveStatusEnum.FEASIBLE]
+    assert search_status.objective_value >= full_schedule_solution.solver.ObjectiveValue()
+    assert search_status.best_objective_bound <= full_schedule_solution.solver.ObjectiveValue()
+    assert search_status.objective_gap is not None
+
+
+def test_a_stitched_schedule_is_valid_when_the_check_of_its_assignments_is_only_feasible(monkeypatch):
+    schedule = create_aggregated_schedule(all_employees, all_shifts_in_the_week).schedule.schedule
+    solve = cp_model.CpSolver.Solve
+
+    # As if the time limit stopped every solve before it proved its objective
+    def solve_without_proving_the_objective(solver: cp_model.CpSolver, *solve_arguments) -> int:
+        status = solve(solver, *solve_arguments)
+        return cp_model.FEASIBLE if status == cp_model.OPTIMAL else status
+
+    monkeypatch.setattr(cp_model.CpSolver, "Solve", solve_without_proving_the_objective)
+
+    schedule_metadata, search_status = validate_aggregated_schedule(all_employees, all_shifts_in_the_week, schedule, None, AFTERNOON_START_TIME, 0, 0)
+
+    assert schedule_metadata is not None
+    assert schedule_metadata.schedule == schedule
+    assert search_status.status == SolveStatusEnum.FEASIBLE
+
+
+def test_a_no_good_cut_takes_the_shifts_of_a_class_away_from_it():
+    employees_classes = get_employees_classes(all_employees)
+    aggregated_model = create_aggregated_model(employees_classes, all_shifts_in_the_week)
+    solver = cp_model.CpSolver()
+    class_key = next(iter(employees_classes))
+
+    assert solver.Solve(aggregated_model.constraint_model) == cp_model.OPTIMAL
+    class_shifts = get_class_shifts(aggregated_model, solver, class_key, all_shifts_in_the_week)
+
+    add_class_shifts_no_good_cut(aggregated_model, class_key, class_shifts)
+
+    assert solver.Solve(aggregated_model.constraint_model) == cp_model.OPTIMAL
+    assert not set(class_shifts) <= set(get_class_shifts(aggregated_model, solver, class_key, all_shifts_in_the_week))
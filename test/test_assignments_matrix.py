@@ -0,0 +1,50 @@
+from collections import defaultdict
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from src.models.employees.employees_file import all_employees
+from src.models.shifts.shift_combinations_key import ShiftCombinationsKey
+from src.models.shifts.shifts_file import all_shifts_in_the_week
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.assignments_matrix import NO_ASSIGNMENT_VARIABLE, create_schedule_solution_metadata_from_assignments_matrix
+from src.models.solution.create_solutions import create_solutions
+
+
+def test_schedule_metadata_from_the_assignments_matrix_is_the_same_as_from_every_assignment_value():
+    schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+    solver = schedule_solution.solver
+    assert solver.Solve(schedule_solution.constraint_model) == cp_model.OPTIMAL
+
+    expected_schedule = {}
+    expected_number_of_shifts = defaultdict(int)
+    expected_number_of_closings = defaultdict(int)
+    expected_number_of_mornings = defaultdict(int)
+    for employee in all_employees:
+        for shift in all_shifts_in_the_week:
+            assignment = schedule_solution.all_shifts.get(ShiftCombinationsKey(employee.employee_id, shift.shift_id))
+            if assignment is not None and solver.Value(assignment):
+                expected_schedule[shift.shift_id] = employee.employee_id
+                expected_number_of_shifts[employee.employee_id] += 1
+                expected_number_of_closings[employee.employee_id] += shift.shift_type == ShiftTypesEnum.CLOSING
+                expected_number_of_mornings[employee.employee_id] += shift.shift_type in [ShiftTypesEnum.MORNING, ShiftTypesEnum.MORNING_BACKUP,
+                                                                                           ShiftTypesEnum.WEEKEND_MORNING, ShiftTypesEnum.WEEKEND_MORNING_BACKUP]
+
+    assignments_matrix = schedule_solution.assignments_matrix_index.get_assignments_matrix(solver.ResponseProto().solution)
+    schedule_metadata = create_schedule_solution_metadata_from_assignments_matrix(assignments_matrix, schedule_solution.assignments_matrix_index)
+
+    assert list(schedule_metadata.schedule.items()) == list(expected_schedule.items())
+    assert schedule_metadata.number_of_shift_for_each_emp == dict(expected_number_of_shifts)
+    assert schedule_metadata.number_of_closings_for_each_emp == {employee_id: count for employee_id, count in expected_number_of_closings.items() if count}
+    assert schedule_metadata.number_of_mornings_for_each_emp == {employee_id: count for employee_id, count in expected_number_of_mornings.items() if count}
+
+
+def test_pairs_without_a_variable_are_never_assigned_in_the_assignments_matrix():
+    schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+    assignments_matrix_index = schedule_solution.assignments_matrix_index
+    number_of_variables = len(schedule_solution.constraint_model.Proto().variables)
+
+    assignments_matrix = assignments_matrix_index.get_assignments_matrix(np.ones(number_of_variables, dtype=np.int64))
+
+    assert np.array_equal(assignments_matrix, assignments_matrix_index.variables_indexes != NO_ASSIGNMENT_VARIABLE)
+    assert not assignments_matrix.all()
@@ -70,4 +70,24 @@ def test_verify_no_optimal_solution_when_there_are_more_shifts_then_employees():
 
     solver = cp_model.CpSolver()
     status = solver.Solve(model)
-    assert (status != cp_model.OPTIMAL)
\ No newline at end of file
+    assert (status != cp_model.OPTIMAL)
+
+def test_no_optimal_solution_when_the_shifts_of_the_same_day_are_not_given_one_after_the_other():
+    test_employee = Employee("test", EmployeePriorityEnum.HIGHEST, EmployeeStatusEnum.senior_employee, employee_id=uuid4(), position=EmployeePositionEnum.part_timer)
+
+    first_day_morning = Shift(shift_id=uuid4(), shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2023, 12, 11, 9), end_time=datetime.datetime(2023, 12, 11, 12))
+    second_day_morning = Shift(shift_id=uuid4(), shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2023, 12, 12, 9), end_time=datetime.datetime(2023, 12, 12, 12))
+    first_day_evening = Shift(shift_id=uuid4(), shift_type=ShiftTypesEnum.EVENING, start_time=datetime.datetime(2023, 12, 11, 16), end_time=datetime.datetime(2023, 12, 11, 20))
+
+    employees = [test_employee]
+    shifts = [first_day_morning, second_day_morning, first_day_evening]
+
+    model = cp_model.CpModel()
+    all_shifts = generate_shift_employee_combinations(employees, shifts, model)
+
+    add_exactly_one_employee_per_shift_constraint(shifts, employees, model, all_shifts)
+    add_at_most_one_shift_per_employee_in_the_same_day_constraint(shifts, employees, model, all_shifts)
+
+    solver = cp_model.CpSolver()
+    status = solver.Solve(model)
+    assert (status == cp_model.INFEASIBLE)
@@ -0,0 +1,50 @@
+import datetime
+import random
+
+from src.models.employees.employee_preferences.combine_preference import CombinePreference
+from src.models.employees.employee_preferences.compiled_shifts_preference import merge_time_ranges
+from src.models.employees.employee_preferences.date_time_range_preference_ import DateTimeRangePreference
+from src.models.employees.employee_preferences.shifts_preference_by_id import ShiftIdPreference
+from src.models.shifts.shift import Shift
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+
+
+def is_shift_inside_date_time_range(shift: Shift, range_start: datetime.datetime, range_end: datetime.datetime) -> bool:
+    return range_start >= shift.start_time >= range_end or range_start >= shift.end_time >= range_end or range_start <= shift.start_time <= range_end
+
+
+def test_a_shift_in_more_than_one_combined_preference_is_in_the_combined_preference_once():
+    shift = Shift(shift_id="shift", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 1, 8), end_time=datetime.datetime(2024, 1, 1, 14))
+    combined_preference = CombinePreference([ShiftIdPreference([shift.shift_id]),
+                                             DateTimeRangePreference(range_start=datetime.datetime(2024, 1, 1, 7), range_end=datetime.datetime(2024, 1, 1, 9)),
+                                             DateTimeRangePreference(range_start=datetime.datetime(2024, 1, 1, 8), range_end=datetime.datetime(2024, 1, 1, 10))])
+
+    assert combined_preference.get_shifts_preference([shift]) == [shift]
+
+
+def test_overlapping_and_touching_time_ranges_are_merged():
+    first_time = datetime.datetime(2024, 1, 1)
+    hour = datetime.timedelta(hours=1)
+
+    time_ranges = [(first_time + 5 * hour, first_time + 6 * hour), (first_time, first_time + 2 * hour), (first_time + hour, first_time + 3 * hour), (first_time + 3 * hour, first_time + 4 * hour)]
+
+    assert merge_time_ranges(time_ranges) == [(first_time, first_time + 4 * hour), (first_time + 5 * hour, first_time + 6 * hour)]
+
+
+def test_compiled_date_time_ranges_contain_the_same_shifts_as_the_date_time_ranges_rules():
+    random_generator = random.Random(0)
+    first_time = datetime.datetime(2024, 1, 1)
+    get_random_time = lambda: first_time + datetime.timedelta(hours=random_generator.randint(0, 48))
+
+    shifts = []
+    for shift_number in range(40):
+        shift_start_time = get_random_time()
+        shifts.append(Shift(shift_id=shift_number, shift_type=ShiftTypesEnum.MORNING, start_time=shift_start_time, end_time=shift_start_time + datetime.timedelta(hours=random_generator.randint(0, 10))))
+
+    for _ in range(50):
+        date_time_ranges = [(get_random_time(), get_random_time()) for _ in range(random_generator.randint(1, 4))]
+        combined_preference = CombinePreference([DateTimeRangePreference(range_start=range_start, range_end=range_end) for range_start, range_end in date_time_ranges])
+
+        expected_shifts = [shift for shift in shifts if any(is_shift_inside_date_time_range(shift, range_start, range_end) for range_start, range_end in date_time_ranges)]
+
+        assert combined_preference.get_shifts_preference(shifts) == expected_shifts
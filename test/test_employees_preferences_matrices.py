@@ -0,0 +1,73 @@
+import datetime
+import random
+
+import numpy as np
+
+from src.models.employees.employee import Employee
+from src.models.employees.employee_preferences.combine_preference import CombinePreference
+from src.models.employees.employee_preferences.date_time_range_preference_ import DateTimeRangePreference
+from src.models.employees.employee_preferences.employees_preferences_matrices import create_employees_preferences_matrices
+from src.models.employees.employee_preferences.employees_shifts_preferences import EmployeesShiftsPreferences
+from src.models.employees.employee_preferences.shifts_preference_by_id import ShiftIdPreference
+from src.models.employees.employees_file import all_employees
+from src.models.shifts.shift import Shift
+from src.models.shifts.shift_index import create_shift_index
+from src.models.shifts.shifts_file import all_shifts_in_the_week
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+
+
+def get_expected_preferences_row(preference, shift_index) -> np.ndarray:
+    preferred_shifts = set(preference.get_shifts_preference(shift_index.shifts_sorted_by_start_time))
+    return np.array([shift in preferred_shifts for shift in shift_index.shifts_sorted_by_start_time], dtype=bool)
+
+
+def test_preferences_matrices_of_the_week_employees_are_the_same_as_their_shifts_preferences():
+    shift_index = create_shift_index(all_shifts_in_the_week)
+    preferences_matrices = create_employees_preferences_matrices(all_employees, shift_index)
+
+    for employee_row, employee in enumerate(all_employees):
+        assert np.array_equal(preferences_matrices.wants_to_work[employee_row], get_expected_preferences_row(employee.shifts_preferences.shifts_wants_to_work, shift_index))
+        assert np.array_equal(preferences_matrices.prefer_not_to_work[employee_row], get_expected_preferences_row(employee.shifts_preferences.shifts_prefer_not_to_work, shift_index))
+        assert np.array_equal(preferences_matrices.cannot_work[employee_row], get_expected_preferences_row(employee.shifts_preferences.shifts_cannot_work, shift_index))
+
+
+def test_reversed_range_and_combined_preferences_are_in_the_preferences_matrix():
+    first_shift = Shift(shift_id="first_shift", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 1, 8), end_time=datetime.datetime(2024, 1, 1, 13))
+    second_shift = Shift(shift_id="second_shift", shift_type=ShiftTypesEnum.EVENING, start_time=datetime.datetime(2024, 1, 1, 14), end_time=datetime.datetime(2024, 1, 1, 20))
+    third_shift = Shift(shift_id="third_shift", shift_type=ShiftTypesEnum.CLOSING, start_time=datetime.datetime(2024, 1, 1, 20), end_time=datetime.datetime(2024, 1, 2, 2))
+    shift_index = create_shift_index([third_shift, first_shift, second_shift])
+
+    # Only the end of the first shift is inside this range
+    reversed_range = DateTimeRangePreference(range_start=datetime.datetime(2024, 1, 1, 13, 30), range_end=datetime.datetime(2024, 1, 1, 12, 30))
+    combined_preference = CombinePreference([ShiftIdPreference([third_shift.shift_id]), DateTimeRangePreference(range_start=datetime.datetime(2024, 1, 1, 20), range_end=datetime.datetime(2024, 1, 1, 21))])
+
+    employee_with_reversed_range = Employee(name="employee_with_reversed_range", employee_id="employee_with_reversed_range", shifts_preferences=EmployeesShiftsPreferences(shifts_wants_to_work=reversed_range))
+    employee_with_combined_preference = Employee(name="employee_with_combined_preference", employee_id="employee_with_combined_preference", shifts_preferences=EmployeesShiftsPreferences(shifts_wants_to_work=combined_preference))
+
+    preferences_matrices = create_employees_preferences_matrices([employee_with_reversed_range, employee_with_combined_preference], shift_index)
+
+    assert preferences_matrices.wants_to_work.tolist() == [[True, False, False], [False, False, True]]
+    assert not preferences_matrices.cannot_work.any()
+
+
+def test_the_ranges_of_many_employees_are_evaluated_together_the_same_as_each_preference():
+    random_generator = random.Random(1)
+    week_start = datetime.datetime(2024, 1, 1)
+    shifts = [Shift(shift_id=f"shift_{shift_number}", shift_type=ShiftTypesEnum.MORNING, start_time=week_start + datetime.timedelta(hours=shift_start_hour),
+                    end_time=week_start + datetime.timedelta(hours=shift_start_hour + random_generator.randint(4, 9)))
+              for shift_number, shift_start_hour in enumerate(random_generator.sample(range(7 * 24), 30))]
+    shift_index = create_shift_index(shifts)
+
+    # Some ranges are reversed, some are empty or outside the week, and some employees have no ranges
+    employees = []
+    for employee_number in range(20):
+        ranges = [DateTimeRangePreference(range_start=week_start + datetime.timedelta(hours=random_generator.randint(-24, 8 * 24)),
+                                          range_end=week_start + datetime.timedelta(hours=random_generator.randint(-24, 8 * 24)))
+                  for _ in range(random_generator.randint(0, 3))]
+        employees.append(Employee(name=f"employee{employee_number}", employee_id=f"employee{employee_number}",
+                                  shifts_preferences=EmployeesShiftsPreferences(shifts_wants_to_work=CombinePreference(ranges))))
+
+    preferences_matrices = create_employees_preferences_matrices(employees, shift_index)
+
+    for employee_row, employee in enumerate(employees):
+        assert np.array_equal(preferences_matrices.wants_to_work[employee_row], get_expected_preferences_row(employee.shifts_preferences.shifts_wants_to_work, shift_index))
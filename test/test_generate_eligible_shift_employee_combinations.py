@@ -0,0 +1,79 @@
+import datetime
+import random
+
+import pytest
+
+from ortools.sat.python import cp_model
+
+from src.constraints_file import generate_eligible_shift_employee_combinations, \
+    generate_shift_employee_combinations, add_exactly_one_employee_per_shift_constraint, \
+    add_prevent_overlapping_shifts_for_employees_constraint, \
+    add_employees_can_work_only_shifts_that_they_trained_for_constraint, \
+    add_aspire_to_maximize_all_employees_preferences_constraint
+from src.models.employees.employee import Employee
+from src.models.employees.employee_preferences.employees_shifts_preferences import EmployeesShiftsPreferences
+from src.models.employees.employee_preferences.shifts_preference_by_id import ShiftIdPreference
+from src.models.employees.employees_file import all_employees
+from src.models.shifts.shift import Shift
+from src.models.shifts.shift_combinations_key import ShiftCombinationsKey
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.shifts.shifts_file import all_shifts_in_the_week
+
+
+def test_no_variable_is_created_for_a_shift_the_employee_is_not_trained_for_or_cannot_work():
+    morning_shift = Shift(shift_id="morning_shift", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime.now(), end_time=datetime.datetime.now() + datetime.timedelta(minutes=random.random()))
+    closing_shift = Shift(shift_id="closing_shift", shift_type=ShiftTypesEnum.CLOSING, start_time=morning_shift.end_time, end_time=morning_shift.end_time + datetime.timedelta(minutes=random.random()))
+    evening_shift = Shift(shift_id="evening_shift", shift_type=ShiftTypesEnum.EVENING, start_time=closing_shift.end_time, end_time=closing_shift.end_time + datetime.timedelta(minutes=random.random()))
+
+    emp_preferences = EmployeesShiftsPreferences(shifts_cannot_work=ShiftIdPreference([evening_shift.shift_id]))
+    employee = Employee(name="employee", employee_id="employee", shifts_preferences=emp_preferences, shift_types_trained_to_do=[ShiftTypesEnum.MORNING, ShiftTypesEnum.EVENING])
+
+    model = cp_model.CpModel()
+    all_shifts = generate_eligible_shift_employee_combinations([employee], [morning_shift, closing_shift, evening_shift], model)
+
+    assert list(all_shifts.keys()) == [ShiftCombinationsKey(employee.employee_id, morning_shift.shift_id)]
+    assert len(model.Proto().variables) == 1
+
+    # A pair without a variable is read with "get", and looking it up raises a KeyError
+    assert all_shifts.get(ShiftCombinationsKey(employee.employee_id, closing_shift.shift_id)) is None
+    with pytest.raises(KeyError):
+        all_shifts[ShiftCombinationsKey(employee.employee_id, closing_shift.shift_id)]
+
+
+def test_no_schedule_when_the_only_employee_is_not_eligible_for_the_shift():
+    closing_shift = Shift(shift_id="closing_shift", shift_type=ShiftTypesEnum.CLOSING, start_time=datetime.datetime.now(), end_time=datetime.datetime.now() + datetime.timedelta(minutes=random.random()))
+    employee_who_cannot_close = Employee(name="employee_who_cannot_close", employee_id="employee_who_cannot_close", shift_types_trained_to_do=[ShiftTypesEnum.MORNING])
+
+    employees = [employee_who_cannot_close]
+    shifts = [closing_shift]
+    model = cp_model.CpModel()
+
+    all_shifts = generate_eligible_shift_employee_combinations(employees, shifts, model)
+    add_exactly_one_employee_per_shift_constraint(shifts, employees, model, all_shifts)
+
+    solver = cp_model.CpSolver()
+    status = solver.Solve(model)
+
+    assert (status == cp_model.INFEASIBLE)
+
+
+def test_eligible_combinations_reach_the_same_optimal_objective_as_all_the_combinations():
+    employees = all_employees
+    shifts = all_shifts_in_the_week
+    objective_values = []
+
+    for generate_combinations in [generate_shift_employee_combinations, generate_eligible_shift_employee_combinations]:
+        model = cp_model.CpModel()
+        all_shifts = generate_combinations(employees, shifts, model)
+        add_exactly_one_employee_per_shift_constraint(shifts, employees, model, all_shifts)
+        add_prevent_overlapping_shifts_for_employees_constraint(shifts, employees, model, all_shifts)
+        add_employees_can_work_only_shifts_that_they_trained_for_constraint(shifts, employees, model, all_shifts)
+        add_aspire_to_maximize_all_employees_preferences_constraint(shifts, employees, model, all_shifts)
+
+        solver = cp_model.CpSolver()
+        status = solver.Solve(model)
+
+        assert (status == cp_model.OPTIMAL)
+        objective_values.append(solver.ObjectiveValue())
+
+    assert objective_values[0] == objective_values[1]
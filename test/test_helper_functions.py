@@ -4,7 +4,7 @@ import random
 from src.models.shifts.shift import Shift
 from src.models.shifts import ShiftCombinationsKey
 from src.models.shifts import ShiftTypesEnum
-from src.constraints_file import is_fully_overlapping
+from src.constraints_file import is_fully_overlapping, get_minimal_fully_overlapping_shifts_sets
 
 
 def test_shifts_are_parallel_to_each_other():
@@ -24,6 +24,42 @@ def test_shifts_are_parallel_to_each_other():
     assert(True == is_fully_overlapping(main_shift, [support_shift1, support_shift3, support_shift2]))
 
 
+
+def test_minimal_fully_overlapping_shifts_sets_are_the_parallel_shifts_without_supersets():
+    main_shift_start_time = datetime.datetime(2023, 12, 12, 9)
+
+    main_shift = Shift("main_shitf", shift_type=ShiftTypesEnum.MORNING, start_time=main_shift_start_time, end_time=main_shift_start_time + datetime.timedelta(hours=4))
+    support_shift1 = Shift("support_shift1", shift_type=ShiftTypesEnum.MORNING, start_time=main_shift_start_time, end_time=main_shift_start_time + datetime.timedelta(hours=2))
+    support_shift2 = Shift("support_shift2", shift_type=ShiftTypesEnum.MORNING, start_time=support_shift1.end_time, end_time=main_shift.end_time)
+    support_shift3 = Shift("support_shift3", shift_type=ShiftTypesEnum.MORNING, start_time=main_shift_start_time, end_time=support_shift1.end_time)
+    support_shift4 = Shift("support_shift4", shift_type=ShiftTypesEnum.MORNING, start_time=main_shift_start_time - datetime.timedelta(hours=1), end_time=main_shift.end_time + datetime.timedelta(hours=1))
+
+    minimal_sets = get_minimal_fully_overlapping_shifts_sets(main_shift, [support_shift1, support_shift2, support_shift3, support_shift4])
+
+    assert set(minimal_sets) == {frozenset([support_shift1, support_shift2]), frozenset([support_shift3, support_shift2]), frozenset([support_shift4])}
+    for minimal_set in minimal_sets:
+        assert is_fully_overlapping(main_shift, list(minimal_set))
+
+
+def test_minimal_fully_overlapping_shifts_sets_of_many_parallel_shifts():
+    """
+    |main shift                                |
+    |hour0|hour1|hour2|hour3| ... |hour11|
+    |hour0 again|hour2 again| ... |hour10 again|
+    """
+    main_shift_start_time = datetime.datetime(2024, 1, 1, 8)
+    main_shift = Shift("main_shift", shift_type=ShiftTypesEnum.MORNING, start_time=main_shift_start_time, end_time=main_shift_start_time + datetime.timedelta(hours=12))
+
+    hourly_shifts = [Shift(f"hour{hour}", shift_type=ShiftTypesEnum.MORNING, start_time=main_shift_start_time + datetime.timedelta(hours=hour), end_time=main_shift_start_time + datetime.timedelta(hours=hour + 1)) for hour in range(12)]
+    two_hours_shifts = [Shift(f"hour{hour}_again", shift_type=ShiftTypesEnum.MORNING_BACKUP, start_time=main_shift_start_time + datetime.timedelta(hours=hour), end_time=main_shift_start_time + datetime.timedelta(hours=hour + 2)) for hour in range(0, 12, 2)]
+
+    minimal_sets = get_minimal_fully_overlapping_shifts_sets(main_shift, hourly_shifts + two_hours_shifts)
+
+    # Every 2 hours are covered by 2 hourly shifts, or by one 2 hours shift.
+    assert len(minimal_sets) == pow(2, 6)
+    for minimal_set in minimal_sets:
+        assert is_fully_overlapping(main_shift, list(minimal_set))
+
 def test_overlapping_shifts_where_shift_starts_in_the_same_time():
     """
     [ A ]
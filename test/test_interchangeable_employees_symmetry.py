@@ -0,0 +1,72 @@
+import datetime
+
+from src.models.employees.employee import Employee
+from src.models.employees.employee_preferences.employees_shifts_preferences import EmployeesShiftsPreferences
+from src.models.employees.employee_preferences.shifts_preference_by_id import ShiftIdPreference
+from src.models.employees.employee_status_enum import EmployeeStatusEnum
+from src.models.employees.employees_equivalence_classes import get_employees_equivalence_classes, get_employees_canonical_ids
+from src.models.shifts.shift import Shift
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.schedules_collector import get_canonical_schedule_hash
+
+
+def create_interchangeable_employees(number_of_employees: int) -> list[Employee]:
+    return [Employee(name=f"employee{employee_number}", employee_id=f"employee{employee_number}", shift_types_trained_to_do=[ShiftTypesEnum.MORNING])
+            for employee_number in range(number_of_employees)]
+
+
+def create_shifts_in_different_days(number_of_shifts: int) -> list[Shift]:
+    return [Shift(shift_id=f"shift{day}", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 1 + day, 8), end_time=datetime.datetime(2024, 1, 1 + day, 14))
+            for day in range(number_of_shifts)]
+
+
+def test_only_employees_with_the_same_attributes_and_no_preferences_are_interchangeable():
+    interchangeable_employees = create_interchangeable_employees(2)
+    senior_employee = Employee(name="senior_employee", employee_id="senior_employee", employee_status=EmployeeStatusEnum.senior_employee, shift_types_trained_to_do=[ShiftTypesEnum.MORNING])
+    employee_with_preferences = Employee(name="employee_with_preferences", employee_id="employee_with_preferences", shift_types_trained_to_do=[ShiftTypesEnum.MORNING],
+                                         shifts_preferences=EmployeesShiftsPreferences(shifts_wants_to_work=ShiftIdPreference(["shift0"])))
+    employees = interchangeable_employees + [senior_employee, employee_with_preferences]
+
+    assert get_employees_equivalence_classes(employees) == [interchangeable_employees]
+    assert get_employees_canonical_ids(employees) == {"employee0": "employee0", "employee1": "employee0",
+                                                      "senior_employee": "senior_employee", "employee_with_preferences": "employee_with_preferences"}
+
+
+def test_swapping_interchangeable_employees_keeps_the_canonical_schedule_hash():
+    employees_canonical_ids = get_employees_canonical_ids(create_interchangeable_employees(2) + [Employee(name="senior_employee", employee_id="senior_employee",
+                                                                                                          employee_status=EmployeeStatusEnum.senior_employee)])
+
+    schedule_hash = get_canonical_schedule_hash({"shift0": "employee0", "shift1": "employee1"}, employees_canonical_ids)
+
+    assert get_canonical_schedule_hash({"shift0": "employee1", "shift1": "employee0"}, employees_canonical_ids) == schedule_hash
+    assert get_canonical_schedule_hash({"shift0": "employee0", "shift1": "employee0"}, employees_canonical_ids) != schedule_hash
+    assert get_canonical_schedule_hash({"shift0": "senior_employee", "shift1": "employee1"}, employees_canonical_ids) != schedule_hash
+
+
+# Three shifts can be split between three interchangeable employees in 5 ways: everyone works one shift, one employee works
+# two shifts (in 3 ways), or one employee works all of them. Without the symmetry breaking, each of the 3 ** 3 assignments
+# is a different schedule.
+def test_schedules_that_differ_only_by_swapping_interchangeable_employees_are_found_once_only_with_the_symmetry_breaking():
+    employees = create_interchangeable_employees(3)
+    shifts = create_shifts_in_different_days(3)
+
+    for break_employees_symmetry, number_of_schedules in [(True, 5), (False, 27)]:
+        schedule_solution = create_solutions(employees, shifts, break_employees_symmetry=break_employees_symmetry)
+        schedules = list(schedule_solution.yield_schedules_from_one_search(100, objective_tolerance=100))
+
+        assert len(schedules) == number_of_schedules
+        assert len({get_canonical_schedule_hash(schedule.schedule, schedule_solution.employees_canonical_ids) for schedule in schedules}) == number_of_schedules
+
+
+def test_the_symmetry_breaking_keeps_the_optimal_objective():
+    employees = create_interchangeable_employees(4)
+    shifts = create_shifts_in_different_days(6)
+    optimal_objectives = []
+
+    for break_employees_symmetry in [True, False]:
+        schedule_solution = create_solutions(employees, shifts, break_employees_symmetry=break_employees_symmetry)
+        schedule_solution.solver.Solve(schedule_solution.constraint_model)
+        optimal_objectives.append(schedule_solution.solver.ObjectiveValue())
+
+    assert optimal_objectives[0] == optimal_objectives[1]
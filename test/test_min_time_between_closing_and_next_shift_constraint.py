@@ -6,7 +6,7 @@ from ortools.sat.python import cp_model
 
 from src.constraints_file import generate_shift_employee_combinations, add_exactly_one_employee_per_shift_constraint, \
     add_at_most_one_shift_per_employee_in_the_same_day_constraint, \
-    add_minimum_time_between_a_morning_shift_and_the_shift_before_constraint
+    add_minimum_time_between_a_morning_shift_and_the_shift_before_constraint, get_minimum_rest_conflicting_shifts
 from src.models.employees.employee import Employee
 from src.models.employees.employee_position_enum import EmployeePositionEnum
 from src.models.employees.employee_priority_enum import EmployeePriorityEnum
@@ -14,6 +14,8 @@ from src.models import EmployeeStatusEnum
 from src.models.shifts.shift import Shift
 from src.models.shifts import ShiftCombinationsKey
 from src.models.shifts import ShiftTypesEnum
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.model_backend_enum import ModelBackendEnum
 
 
 def test_no_optimal_solution_when_the_closing_shift_and_the_next_shift_are_too_close_to_each_other():
@@ -109,3 +111,36 @@ def test_all_the_employees_who_worked_in_the_afternoon_are_not_working_in_the_mo
     assert (status == cp_model.OPTIMAL)
 
     assert solver.Value(all_shifts[morning_employee_working_morning_key]) == True
+
+
+def test_the_conflicting_shifts_of_an_afternoon_shift_are_the_shifts_that_start_before_the_rest_ended():
+    minimum_time_between_shifts = datetime.timedelta(hours=9)
+    afternoon_start_time = datetime.time(12, 30)
+
+    morning_shift = Shift(shift_id="morning_shift", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 1, 9), end_time=datetime.datetime(2024, 1, 1, 16))
+    closing_shift = Shift(shift_id="closing_shift", shift_type=ShiftTypesEnum.CLOSING, start_time=datetime.datetime(2024, 1, 1, 19), end_time=datetime.datetime(2024, 1, 2, 2))
+    next_morning_shift = Shift(shift_id="next_morning_shift", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 2, 9), end_time=datetime.datetime(2024, 1, 2, 16))
+    next_morning_shift_after_rest = Shift(shift_id="next_morning_shift_after_rest", shift_type=ShiftTypesEnum.MORNING_BACKUP, start_time=closing_shift.end_time + minimum_time_between_shifts, end_time=datetime.datetime(2024, 1, 2, 16))
+
+    conflicting_shifts = get_minimum_rest_conflicting_shifts([next_morning_shift_after_rest, next_morning_shift, closing_shift, morning_shift], minimum_time_between_shifts, afternoon_start_time)
+
+    assert conflicting_shifts == [(closing_shift, next_morning_shift)]
+
+
+def test_both_model_backends_do_not_let_the_only_employee_work_a_shift_too_close_to_a_closing_shift():
+    minimum_time_between_shifts = datetime.timedelta(hours=9)
+
+    closing_shift = Shift(shift_id="closing_shift", shift_type=ShiftTypesEnum.CLOSING, start_time=datetime.datetime(2024, 1, 1, 19), end_time=datetime.datetime(2024, 1, 2, 2))
+    morning_shift = Shift(shift_id="morning_shift", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 2, 9), end_time=datetime.datetime(2024, 1, 2, 16))
+    test_employee = Employee("test", EmployeePriorityEnum.HIGHEST, EmployeeStatusEnum.senior_employee, employee_id=uuid4(), shift_types_trained_to_do=[ShiftTypesEnum.CLOSING, ShiftTypesEnum.MORNING])
+
+    for model_backend in ModelBackendEnum:
+        schedule_solution = create_solutions([test_employee], [closing_shift, morning_shift], model_backend, minimum_time_between_shifts)
+        status = schedule_solution.solver.Solve(schedule_solution.constraint_model)
+
+        assert (status == cp_model.INFEASIBLE)
+
+        schedule_solution = create_solutions([test_employee], [closing_shift, morning_shift], model_backend)
+        status = schedule_solution.solver.Solve(schedule_solution.constraint_model)
+
+        assert (status == cp_model.OPTIMAL)
@@ -0,0 +1,162 @@
+import dataclasses
+import datetime
+import itertools
+import pickle
+import uuid
+
+from src.models.employees.employee import Employee
+from src.models.employees.employee_status_enum import EmployeeStatusEnum
+from src.models.shifts.shift import Shift
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.model_cache import ModelCache, create_solutions_with_model_cache, create_cached_model
+from src.models.solution.objective_mode_enum import ObjectiveModeEnum
+from src.models.solution.problem_hash import get_problem_hash
+from src.models.solution.schedule_solutions import ScheduleSolutions
+from src.models.solution.solver_profile_enum import SolverProfileEnum
+
+
+def create_employees() -> list[Employee]:
+    return [Employee(name=f"employee{employee_number}", employee_id=f"employee{employee_number}", employee_status=employee_status,
+                     shift_types_trained_to_do=[ShiftTypesEnum.MORNING, ShiftTypesEnum.CLOSING])
+            for employee_number, employee_status in enumerate([EmployeeStatusEnum.new_employee, EmployeeStatusEnum.mid_level_employee, EmployeeStatusEnum.senior_employee])]
+
+
+def create_shifts() -> list[Shift]:
+    return [Shift(shift_id=f"{shift_type.value}_{day}", shift_type=shift_type, start_time=datetime.datetime(2024, 1, 1 + day, start_hour),
+                  end_time=datetime.datetime(2024, 1, 1 + day, start_hour + 6))
+            for day in range(4) for shift_type, start_hour in [(ShiftTypesEnum.MORNING, 8), (ShiftTypesEnum.CLOSING, 16)]]
+
+
+def solve_and_get_objective(schedule_solution: ScheduleSolutions) -> float:
+    schedule_solution.solver.Solve(schedule_solution.constraint_model)
+    return schedule_solution.solver.ObjectiveValue()
+
+
+def test_the_problem_hash_does_not_depend_on_the_order_of_the_employees_and_the_shifts():
+    employees, shifts = create_employees(), create_shifts()
+    problem_hash = get_problem_hash(employees, shifts, {"objective_mode": ObjectiveModeEnum.WEIGHTED_SUM})
+
+    assert get_problem_hash(employees[::-1], shifts[::-1], {"objective_mode": ObjectiveModeEnum.WEIGHTED_SUM}) == problem_hash
+    assert get_problem_hash(employees, shifts, {"objective_mode": ObjectiveModeEnum.LEXICOGRAPHIC}) != problem_hash
+    assert get_problem_hash(employees[1:], shifts, {"objective_mode": ObjectiveModeEnum.WEIGHTED_SUM}) != problem_hash
+
+
+def test_a_cached_model_has_the_same_optimal_objective_as_a_built_model():
+    model_cache = ModelCache()
+    employees, shifts = create_employees(), create_shifts()
+
+    built_schedule_solution = create_solutions_with_model_cache(model_cache, employees, shifts)
+    cached_schedule_solution = create_solutions_with_model_cache(model_cache, employees[::-1], shifts)
+
+    assert model_cache.hits == 1 and model_cache.misses == 1
+    assert solve_and_get_objective(cached_schedule_solution) == solve_and_get_objective(built_schedule_solution) == solve_and_get_objective(create_solutions(employees, shifts))
+
+
+def test_a_lexicographic_model_is_cached_for_the_solver_profile_that_solved_its_stages():
+    model_cache = ModelCache()
+    employees, shifts = create_employees(), create_shifts()
+
+    for solver_profile in [SolverProfileEnum.FAST, SolverProfileEnum.OPTIMAL, SolverProfileEnum.OPTIMAL]:
+        create_solutions_with_model_cache(model_cache, employees, shifts, solver_profile=solver_profile, objective_mode=ObjectiveModeEnum.LEXICOGRAPHIC)
+    create_solutions_with_model_cache(model_cache, employees, shifts, solver_profile=SolverProfileEnum.FAST)
+    create_solutions_with_model_cache(model_cache, employees, shifts, solver_profile=SolverProfileEnum.OPTIMAL)
+
+    assert model_cache.hits == 2 and model_cache.misses == 3
+
+
+# The stages of a cached lexicographic model were solved when it was built, so only the search in the built model reports their time
+def test_only_the_search_in_a_built_lexicographic_model_reports_the_time_of_its_stages():
+    model_cache = ModelCache()
+    employees, shifts = create_employees(), create_shifts()
+    objective_stages_wall_times = []
+
+    for _ in range(2):
+        schedule_solution = create_solutions_with_model_cache(model_cache, employees, shifts, solver_profile=SolverProfileEnum.OPTIMAL,
+                                                              objective_mode=ObjectiveModeEnum.LEXICOGRAPHIC)
+        list(schedule_solution.yield_schedules_from_one_search(3))
+        objective_stages_wall_times.append(schedule_solution.search_status.objective_stages_wall_time_in_seconds)
+
+    assert model_cache.hits == 1 and model_cache.misses == 1
+    assert objective_stages_wall_times[0] > 0
+    assert objective_stages_wall_times[1] is None
+
+
+def test_the_searches_in_a_cached_model_do_not_change_the_cache():
+    model_cache = ModelCache()
+    employees, shifts = create_employees(), create_shifts()
+
+    schedule_solution = create_solutions_with_model_cache(model_cache, employees, shifts)
+    number_of_constraints = len(schedule_solution.constraint_model.Proto().constraints)
+    list(itertools.islice(schedule_solution.yield_schedules(), 3))
+
+    assert len(schedule_solution.constraint_model.Proto().constraints) > number_of_constraints
+    assert len(create_solutions_with_model_cache(model_cache, employees, shifts).constraint_model.Proto().constraints) == number_of_constraints
+
+
+def test_a_model_cached_on_disk_is_used_by_another_cache(tmp_path):
+    employees, shifts = create_employees(), create_shifts()
+    create_solutions_with_model_cache(ModelCache(cache_directory=str(tmp_path)), employees, shifts)
+
+    model_cache = ModelCache(cache_directory=str(tmp_path))
+    create_solutions_with_model_cache(model_cache, employees, shifts)
+
+    assert model_cache.hits == 1 and model_cache.misses == 0
+
+
+def test_a_model_on_disk_keeps_the_uuid_ids_of_its_assignments(tmp_path):
+    employees = [dataclasses.replace(employee, employee_id=uuid.uuid4()) for employee in create_employees()]
+    shifts = [dataclasses.replace(shift, shift_id=uuid.uuid4()) for shift in create_shifts()]
+    cached_model = create_cached_model(create_solutions(employees, shifts))
+    ModelCache(cache_directory=str(tmp_path)).put("model", cached_model)
+
+    assert ModelCache(cache_directory=str(tmp_path)).get("model") == cached_model
+
+
+class CreateFileWhenUnpickled:
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+    def __reduce__(self):
+        return open, (self.file_path, "w")
+
+
+def test_a_pickle_in_the_cache_directory_is_never_unpickled(tmp_path):
+    model_cache = ModelCache(cache_directory=str(tmp_path / "models"))
+    unpickled_file_path = tmp_path / "unpickled"
+    with open(model_cache.get_model_file_path("model"), "wb") as model_file:
+        pickle.dump(CreateFileWhenUnpickled(str(unpickled_file_path)), model_file)
+
+    assert model_cache.get("model") is None
+    assert not unpickled_file_path.exists()
+    assert not (tmp_path / "models" / "model.model").exists()
+
+
+def test_models_are_evicted_when_they_are_too_old_or_too_big(tmp_path):
+    employees, shifts = create_employees(), create_shifts()
+
+    small_model_cache = ModelCache(max_size_in_bytes=1)
+    create_solutions_with_model_cache(small_model_cache, employees, shifts)
+
+    assert small_model_cache.get_statistics().number_of_models == 0
+    assert small_model_cache.evictions == 1
+
+    model_cache = ModelCache(max_age_in_seconds=60, cache_directory=str(tmp_path))
+    create_solutions_with_model_cache(model_cache, employees, shifts)
+    for cached_model in model_cache.models.values():
+        cached_model.created_time -= 120
+    create_solutions_with_model_cache(model_cache, employees, shifts)
+
+    assert model_cache.misses == 2 and model_cache.evictions == 1
+
+
+def test_a_model_on_disk_that_is_bigger_than_the_memory_of_the_cache_is_used_without_keeping_it(tmp_path):
+    employees, shifts = create_employees(), create_shifts()
+    create_solutions_with_model_cache(ModelCache(cache_directory=str(tmp_path)), employees, shifts)
+
+    small_model_cache = ModelCache(max_size_in_bytes=10, cache_directory=str(tmp_path))
+    schedule_solution = create_solutions_with_model_cache(small_model_cache, employees, shifts)
+
+    assert small_model_cache.hits == 1 and small_model_cache.misses == 0
+    assert small_model_cache.get_statistics().number_of_models == 0
+    assert solve_and_get_objective(schedule_solution) == solve_and_get_objective(create_solutions(employees, shifts))
@@ -0,0 +1,96 @@
+import datetime
+
+from ortools.sat.python import cp_model
+
+from src.models.employees.employee import Employee
+from src.models.employees.employee_preferences.employees_shifts_preferences import EmployeesShiftsPreferences
+from src.models.employees.employee_preferences.shifts_preference_by_id import ShiftIdPreference
+from src.models.employees.employee_priority_enum import EmployeePriorityEnum
+from src.models.shifts.shift import Shift
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.objective_mode_enum import ObjectiveModeEnum
+from src.models.solution.objective_registry import get_objective_registry, apply_lexicographic_objective, PREFERRED_SHIFTS_OBJECTIVE_TERM, \
+    SHIFTS_PREFERRED_NOT_TO_WORK_OBJECTIVE_TERM, POSITION_DEVIATION_OBJECTIVE_TERM
+
+
+# Both full timers working one shift is the fairest schedule, but the employee who wants both shifts working them is
+# the schedule with the best preferences.
+def create_two_shifts_and_an_employee_who_wants_both_of_them():
+    first_shift = Shift(shift_id="first_shift", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 1, 8), end_time=datetime.datetime(2024, 1, 1, 14))
+    second_shift = Shift(shift_id="second_shift", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 2, 8), end_time=datetime.datetime(2024, 1, 2, 14))
+
+    employee_who_wants_both_shifts = Employee(name="employee_who_wants_both_shifts", employee_id="employee_who_wants_both_shifts", shift_types_trained_to_do=[ShiftTypesEnum.MORNING],
+                                              priority=EmployeePriorityEnum.LOWEST,
+                                              shifts_preferences=EmployeesShiftsPreferences(shifts_wants_to_work=ShiftIdPreference([first_shift.shift_id, second_shift.shift_id])))
+    employee_without_preferences = Employee(name="employee_without_preferences", employee_id="employee_without_preferences", shift_types_trained_to_do=[ShiftTypesEnum.MORNING])
+
+    return [employee_who_wants_both_shifts, employee_without_preferences], [first_shift, second_shift]
+
+
+def get_first_schedule(schedule_solution) -> dict:
+    return next(schedule_solution.yield_schedules()).schedule
+
+
+def test_every_soft_constraint_adds_its_term_to_the_objective():
+    employees, shifts = create_two_shifts_and_an_employee_who_wants_both_of_them()
+    schedule_solution = create_solutions(employees, shifts)
+
+    objective_terms_names = [term.name for term in get_objective_registry(schedule_solution.constraint_model).terms]
+
+    assert objective_terms_names == [POSITION_DEVIATION_OBJECTIVE_TERM, PREFERRED_SHIFTS_OBJECTIVE_TERM, SHIFTS_PREFERRED_NOT_TO_WORK_OBJECTIVE_TERM]
+
+
+def test_the_weighted_sum_of_the_terms_is_optimized():
+    employees, shifts = create_two_shifts_and_an_employee_who_wants_both_of_them()
+    schedule_solution = create_solutions(employees, shifts)
+
+    assert sorted(get_first_schedule(schedule_solution).values()) == ["employee_who_wants_both_shifts", "employee_without_preferences"]
+
+
+def test_a_term_without_weight_does_not_change_the_schedule():
+    employees, shifts = create_two_shifts_and_an_employee_who_wants_both_of_them()
+    schedule_solution = create_solutions(employees, shifts, objective_weights={POSITION_DEVIATION_OBJECTIVE_TERM: 0})
+
+    assert get_first_schedule(schedule_solution) == {"first_shift": "employee_who_wants_both_shifts", "second_shift": "employee_who_wants_both_shifts"}
+
+
+def test_the_preferences_are_optimized_before_the_deviation_in_a_lexicographic_objective():
+    employees, shifts = create_two_shifts_and_an_employee_who_wants_both_of_them()
+    schedule_solution = create_solutions(employees, shifts, objective_mode=ObjectiveModeEnum.LEXICOGRAPHIC)
+
+    assert get_first_schedule(schedule_solution) == {"first_shift": "employee_who_wants_both_shifts", "second_shift": "employee_who_wants_both_shifts"}
+
+    # The deviation of the employee who wants both shifts is 1, and the deviation of the employee without shifts is 9
+    assert schedule_solution.solver.ObjectiveValue() == 10
+
+
+def test_a_model_without_objective_terms_has_no_lexicographic_objectives():
+    constraint_model = cp_model.CpModel()
+
+    assert get_objective_registry(constraint_model).get_lexicographic_objectives() == []
+
+
+def test_the_stages_of_a_lexicographic_objective_are_counted_in_the_time_of_the_search():
+    employees, shifts = create_two_shifts_and_an_employee_who_wants_both_of_them()
+    schedule_solution = create_solutions(employees, shifts, objective_mode=ObjectiveModeEnum.LEXICOGRAPHIC, max_total_time_in_seconds=10)
+    objective_stages_wall_time_in_seconds = schedule_solution.objective_stages_search_clock.paused_search_time
+
+    assert objective_stages_wall_time_in_seconds > 0
+
+    get_first_schedule(schedule_solution)
+
+    assert schedule_solution.search_status.wall_time_in_seconds >= objective_stages_wall_time_in_seconds
+    assert schedule_solution.objective_stages_search_clock is None
+
+
+def test_no_stage_is_bounded_when_the_time_of_the_search_is_over():
+    employees, shifts = create_two_shifts_and_an_employee_who_wants_both_of_them()
+    schedule_solution = create_solutions(employees, shifts)
+    number_of_constraints = len(schedule_solution.constraint_model.Proto().constraints)
+
+    apply_lexicographic_objective(schedule_solution.constraint_model, schedule_solution.solver, max_total_time_in_seconds=0)
+
+    # The model is left with the weighted sum of all the priorities
+    assert len(schedule_solution.constraint_model.Proto().constraints) == number_of_constraints
+    assert sorted(get_first_schedule(schedule_solution).values()) == ["employee_who_wants_both_shifts", "employee_without_preferences"]
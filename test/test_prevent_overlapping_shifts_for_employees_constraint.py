@@ -11,6 +11,7 @@ from src.models.employees.employee_position_enum import EmployeePositionEnum
 from src.models.employees.employee_priority_enum import EmployeePriorityEnum
 from src.models import EmployeeStatusEnum
 from src.models.shifts.shift import Shift
+from src.models.shifts.shift_index import get_overlapping_shifts_cliques
 from src.models.shifts import ShiftCombinationsKey
 from src.models.shifts import ShiftTypesEnum
 
@@ -95,4 +96,54 @@ def test_a_shift_that_starts_when_a_different_shift_ends_does_not_overlaps_with_
 
     # The employee can work the 2 shifts because the shifts does not overlap
     assert (solver.Value(all_shifts[ShiftCombinationsKey(test_employee.employee_id, main_shift.shift_id)]) == True)
-    assert (solver.Value(all_shifts[ShiftCombinationsKey(test_employee.employee_id, shift_bigger_then_main_shift.shift_id)]) == True)
\ No newline at end of file
+    assert (solver.Value(all_shifts[ShiftCombinationsKey(test_employee.employee_id, shift_bigger_then_main_shift.shift_id)]) == True)
+
+
+def test_overlapping_shifts_cliques_are_the_maximal_groups_of_shifts_that_overlap_each_other():
+    """
+    |shift_a      |
+        |shift_b      |
+                   |shift_c   |
+                                |shift_d|
+    """
+    start_time = datetime.datetime(2024, 1, 1, 9)
+    shift_a = Shift(shift_id="shift_a", shift_type=ShiftTypesEnum.MORNING, start_time=start_time, end_time=start_time + datetime.timedelta(hours=4))
+    shift_b = Shift(shift_id="shift_b", shift_type=ShiftTypesEnum.MORNING_BACKUP, start_time=start_time + datetime.timedelta(hours=1), end_time=start_time + datetime.timedelta(hours=6))
+    shift_c = Shift(shift_id="shift_c", shift_type=ShiftTypesEnum.EVENING, start_time=shift_a.end_time, end_time=shift_a.end_time + datetime.timedelta(hours=4))
+    shift_d = Shift(shift_id="shift_d", shift_type=ShiftTypesEnum.CLOSING, start_time=shift_c.end_time, end_time=shift_c.end_time + datetime.timedelta(hours=4))
+
+    cliques = get_overlapping_shifts_cliques([shift_d, shift_c, shift_b, shift_a])
+
+    assert [set(clique) for clique in cliques] == [{shift_a, shift_b}, {shift_b, shift_c}, {shift_d}]
+
+
+def test_employee_can_work_two_shifts_that_only_overlap_with_the_same_third_shift():
+    """
+    |shift_a   |
+          |shift_b   |
+                |shift_c   |
+    """
+    test_employee = Employee("test", priority=EmployeePriorityEnum.HIGHEST, employee_status=EmployeeStatusEnum.senior_employee, employee_id=uuid4(), position=EmployeePositionEnum.part_timer)
+    other_employee = Employee("other", priority=EmployeePriorityEnum.HIGHEST, employee_status=EmployeeStatusEnum.senior_employee, employee_id=uuid4(), position=EmployeePositionEnum.part_timer)
+
+    start_time = datetime.datetime(2024, 1, 1, 9)
+    shift_duration = datetime.timedelta(hours=4)
+    shift_a = Shift(shift_id=uuid4(), shift_type=ShiftTypesEnum.MORNING, start_time=start_time, end_time=start_time + shift_duration)
+    shift_b = Shift(shift_id=uuid4(), shift_type=ShiftTypesEnum.MORNING_BACKUP, start_time=start_time + (shift_duration / 2), end_time=shift_a.end_time + (shift_duration / 2))
+    shift_c = Shift(shift_id=uuid4(), shift_type=ShiftTypesEnum.EVENING, start_time=shift_a.end_time, end_time=shift_a.end_time + shift_duration)
+
+    model = cp_model.CpModel()
+    employees = [test_employee, other_employee]
+    shifts = [shift_a, shift_b, shift_c]
+
+    all_shifts = generate_shift_employee_combinations(employees, shifts, model)
+    add_exactly_one_employee_per_shift_constraint(shifts, employees, model, all_shifts)
+    add_prevent_overlapping_shifts_for_employees_constraint(shifts, employees, model, all_shifts)
+    model.Add(all_shifts[ShiftCombinationsKey(other_employee.employee_id, shift_b.shift_id)] == 1)
+
+    solver = cp_model.CpSolver()
+    status = solver.Solve(model)
+
+    assert (status == cp_model.OPTIMAL)
+    assert (solver.Value(all_shifts[ShiftCombinationsKey(test_employee.employee_id, shift_a.shift_id)]) == True)
+    assert (solver.Value(all_shifts[ShiftCombinationsKey(test_employee.employee_id, shift_c.shift_id)]) == True)
@@ -0,0 +1,105 @@
+import datetime
+import random
+from uuid import uuid4
+
+from ortools.sat.python import cp_model
+
+from src.constraints_file import generate_shift_employee_combinations, add_exactly_one_employee_per_shift_constraint, \
+    add_prevent_overlapping_shifts_for_employees_with_intervals_constraint
+from src.models.employees.employee import Employee
+from src.models.employees.employee_position_enum import EmployeePositionEnum
+from src.models.employees.employee_priority_enum import EmployeePriorityEnum
+from src.models.employees.employee_status_enum import EmployeeStatusEnum
+from src.models.shifts.shift import Shift
+from src.models.shifts.shift_combinations_key import ShiftCombinationsKey
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.model_backend_enum import ModelBackendEnum
+from src.models.employees.employees_file import all_employees
+from src.models.shifts.shifts_file import all_shifts_in_the_week
+
+
+def test_employees_can_not_work_overlapping_shifts_with_intervals():
+    test_employee = Employee("test", priority=EmployeePriorityEnum.HIGHEST, employee_status=EmployeeStatusEnum.senior_employee, employee_id=uuid4(), position=EmployeePositionEnum.part_timer)
+
+    shift_a_start_time = datetime.datetime(2024, 1, 1, 12)
+    shift_duration = datetime.timedelta(hours=random.random())
+    shift_a = Shift(shift_id=uuid4(), shift_type=ShiftTypesEnum.MORNING, start_time=shift_a_start_time, end_time=shift_a_start_time + shift_duration)
+    shift_b = Shift(shift_id=uuid4(), shift_type=ShiftTypesEnum.MORNING, start_time=shift_a_start_time + (shift_duration / 2), end_time=shift_a.end_time + shift_duration)
+
+    model = cp_model.CpModel()
+    employees = [test_employee]
+    shifts = [shift_a, shift_b]
+
+    all_shifts = generate_shift_employee_combinations(employees, shifts, model)
+    add_exactly_one_employee_per_shift_constraint(shifts, employees, model, all_shifts)
+    add_prevent_overlapping_shifts_for_employees_with_intervals_constraint(shifts, employees, model, all_shifts)
+
+    solver = cp_model.CpSolver()
+    status = solver.Solve(model)
+
+    assert (status == cp_model.INFEASIBLE)
+
+
+def test_a_shift_that_starts_when_a_different_shift_ends_can_be_worked_by_the_same_employee_with_intervals():
+    test_employee = Employee("test", priority=EmployeePriorityEnum.HIGHEST, employee_status=EmployeeStatusEnum.senior_employee, employee_id=uuid4(), position=EmployeePositionEnum.part_timer)
+
+    main_shift_start_time = datetime.datetime(2024, 1, 11, 9, 0)
+    shift_duration = datetime.timedelta(minutes=30)
+    main_shift = Shift(shift_id=uuid4(), shift_type=ShiftTypesEnum.MORNING, start_time=main_shift_start_time, end_time=main_shift_start_time + shift_duration)
+    next_shift = Shift(shift_id=uuid4(), shift_type=ShiftTypesEnum.MORNING, start_time=main_shift.end_time, end_time=main_shift.end_time + shift_duration)
+
+    model = cp_model.CpModel()
+    employees = [test_employee]
+    shifts = [main_shift, next_shift]
+
+    all_shifts = generate_shift_employee_combinations(employees, shifts, model)
+    add_exactly_one_employee_per_shift_constraint(shifts, employees, model, all_shifts)
+    add_prevent_overlapping_shifts_for_employees_with_intervals_constraint(shifts, employees, model, all_shifts)
+
+    solver = cp_model.CpSolver()
+    status = solver.Solve(model)
+
+    assert (status == cp_model.OPTIMAL)
+    assert (solver.Value(all_shifts[ShiftCombinationsKey(test_employee.employee_id, main_shift.shift_id)]) == True)
+    assert (solver.Value(all_shifts[ShiftCombinationsKey(test_employee.employee_id, next_shift.shift_id)]) == True)
+
+
+def test_an_employee_who_worked_an_afternoon_shift_rests_before_the_next_shift_with_intervals():
+    minimum_time_between_shifts = datetime.timedelta(hours=9)
+    afternoon_start_time = datetime.time(12, 30)
+
+    closing_shift = Shift(shift_id="closing_shift", shift_type=ShiftTypesEnum.CLOSING, start_time=datetime.datetime(2023, 12, 11, 19), end_time=datetime.datetime(2023, 12, 12, 2))
+    shift_too_close_to_closing_shift = Shift(shift_id="morning_shift", shift_type=ShiftTypesEnum.MORNING, start_time=closing_shift.end_time + datetime.timedelta(hours=6), end_time=closing_shift.end_time + datetime.timedelta(hours=12))
+
+    closing_employee = Employee(name="closing_employee", employee_id="closing_employee")
+    morning_employee = Employee(name="morning_employee", employee_id="morning_employee")
+
+    shifts = [closing_shift, shift_too_close_to_closing_shift]
+    employees = [closing_employee, morning_employee]
+
+    model = cp_model.CpModel()
+    all_shifts = generate_shift_employee_combinations(employees, shifts, model)
+    model.Add(all_shifts[ShiftCombinationsKey(closing_employee.employee_id, closing_shift.shift_id)] == 1)
+
+    add_exactly_one_employee_per_shift_constraint(shifts, employees, model, all_shifts)
+    add_prevent_overlapping_shifts_for_employees_with_intervals_constraint(shifts, employees, model, all_shifts, minimum_time_between_shifts, afternoon_start_time)
+
+    solver = cp_model.CpSolver()
+    status = solver.Solve(model)
+
+    assert (status == cp_model.OPTIMAL)
+    assert (solver.Value(all_shifts[ShiftCombinationsKey(morning_employee.employee_id, shift_too_close_to_closing_shift.shift_id)]) == True)
+
+
+def test_both_model_backends_reach_the_same_optimal_objective():
+    objective_values = []
+
+    for model_backend in ModelBackendEnum:
+        schedule_solution = create_solutions(all_employees, all_shifts_in_the_week, model_backend)
+        status = schedule_solution.solver.Solve(schedule_solution.constraint_model)
+
+        assert (status == cp_model.OPTIMAL)
+        objective_values.append(schedule_solution.solver.ObjectiveValue())
+
+    assert objective_values[0] == objective_values[1]
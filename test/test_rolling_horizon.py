@@ -0,0 +1,106 @@
+import datetime
+
+import pytest
+
+from src.models.employees.employee import Employee
+from src.models.employees.employee_position_enum import EmployeePositionEnum
+from src.models.employees.employee_preferences.employees_shifts_preferences import EmployeesShiftsPreferences
+from src.models.employees.employee_preferences.shifts_preference_by_id import ShiftIdPreference
+from src.models.shifts.shift import Shift
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.assignments_matrix import create_schedule_solution_metadata_from_assignments_matrix
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.rolling_horizon import create_rolling_horizon_schedule
+from src.models.solution.solve_status_enum import SolveStatusEnum
+
+MIN_TIME_BETWEEN_SHIFTS = datetime.timedelta(hours=9)
+
+
+def create_employees(number_of_employees: int) -> list[Employee]:
+    return [Employee(name=f"employee{employee_number}", employee_id=f"employee{employee_number}", shift_types_trained_to_do=[ShiftTypesEnum.MORNING, ShiftTypesEnum.CLOSING])
+            for employee_number in range(number_of_employees)]
+
+
+def create_daily_shifts(number_of_days: int) -> list[Shift]:
+    return [Shift(shift_id=f"{shift_type.value}_{day}", shift_type=shift_type, start_time=datetime.datetime(2024, 1, 1, start_hour) + datetime.timedelta(days=day),
+                  end_time=datetime.datetime(2024, 1, 1, start_hour) + datetime.timedelta(days=day, hours=7))
+            for day in range(number_of_days) for shift_type, start_hour in [(ShiftTypesEnum.MORNING, 7), (ShiftTypesEnum.CLOSING, 16)]]
+
+
+def test_the_stitched_schedule_covers_every_shift_of_the_horizon_with_enough_rest_after_every_closing():
+    employees = create_employees(6)
+    shifts = create_daily_shifts(28)
+    shifts_by_id = {shift.shift_id: shift for shift in shifts}
+
+    rolling_horizon_schedule = create_rolling_horizon_schedule(employees, shifts, min_time_between_shifts=MIN_TIME_BETWEEN_SHIFTS)
+
+    assert rolling_horizon_schedule.search_status.status == SolveStatusEnum.FEASIBLE
+    assert len(rolling_horizon_schedule.windows_search_statuses) == 3
+    assert set(rolling_horizon_schedule.schedule.schedule) == set(shifts_by_id)
+
+    for employee in employees:
+        employee_shifts = sorted((shifts_by_id[shift_id] for shift_id, employee_id in rolling_horizon_schedule.schedule.schedule.items() if employee_id == employee.employee_id),
+                                 key=lambda shift: shift.start_time)
+        for shift, next_shift in zip(employee_shifts, employee_shifts[1:]):
+            if shift.shift_type == ShiftTypesEnum.CLOSING:
+                assert next_shift.start_time - shift.end_time >= MIN_TIME_BETWEEN_SHIFTS
+
+
+# The windows do not overlap, so only the rest carried from the first window stops the employee who closes the first day
+# from opening the second day, which they want to work.
+def test_the_rest_after_a_frozen_shift_holds_in_the_next_window():
+    closing_employee = Employee(name="closing_employee", employee_id="closing_employee", shift_types_trained_to_do=[ShiftTypesEnum.MORNING, ShiftTypesEnum.CLOSING],
+                                shifts_preferences=EmployeesShiftsPreferences(shifts_wants_to_work=ShiftIdPreference(["morning_1"])))
+    morning_employee = Employee(name="morning_employee", employee_id="morning_employee", position=EmployeePositionEnum.part_timer,
+                                shift_types_trained_to_do=[ShiftTypesEnum.MORNING])
+    shifts = [shift for shift in create_daily_shifts(2) if shift.shift_id in ["closing_0", "morning_1"]]
+
+    rolling_horizon_schedule = create_rolling_horizon_schedule([closing_employee, morning_employee], shifts, window=datetime.timedelta(hours=12),
+                                                               step=datetime.timedelta(hours=12), min_time_between_shifts=MIN_TIME_BETWEEN_SHIFTS)
+
+    assert rolling_horizon_schedule.schedule.schedule["closing_0"] == "closing_employee"
+    assert rolling_horizon_schedule.schedule.schedule["morning_1"] == "morning_employee"
+
+
+def test_the_shifts_of_the_previous_windows_count_towards_the_fairness_of_the_next_window():
+    employees = create_employees(2)
+    shifts = [shift for shift in create_daily_shifts(2) if shift.shift_type == ShiftTypesEnum.MORNING]
+
+    rolling_horizon_schedule = create_rolling_horizon_schedule(employees, shifts, window=datetime.timedelta(days=1), step=datetime.timedelta(days=1))
+
+    assert rolling_horizon_schedule.schedule.number_of_shift_for_each_emp == {"employee0": 1, "employee1": 1}
+
+
+def test_a_fixed_assignment_is_kept_against_the_employees_preferences():
+    employee_who_prefers_not_to_work = Employee(name="employee_who_prefers_not_to_work", employee_id="employee_who_prefers_not_to_work",
+                                                shift_types_trained_to_do=[ShiftTypesEnum.MORNING],
+                                                shifts_preferences=EmployeesShiftsPreferences(shifts_prefer_not_to_work=ShiftIdPreference(["morning_0"])))
+    employees = [employee_who_prefers_not_to_work] + create_employees(1)
+    shifts = [shift for shift in create_daily_shifts(1) if shift.shift_type == ShiftTypesEnum.MORNING]
+
+    schedule_solution = create_solutions(employees, shifts, fixed_assignments={"morning_0": "employee_who_prefers_not_to_work"})
+    schedule_solution.solver.Solve(schedule_solution.constraint_model)
+    assignments_matrix_index = schedule_solution.assignments_matrix_index
+    schedule = create_schedule_solution_metadata_from_assignments_matrix(assignments_matrix_index.get_assignments_matrix(schedule_solution.solver.ResponseProto().solution),
+                                                                         assignments_matrix_index)
+
+    assert schedule.schedule == {"morning_0": "employee_who_prefers_not_to_work"}
+
+
+def test_a_fixed_assignment_to_a_shift_the_employee_can_not_work_raises_a_value_error():
+    employee_who_cannot_close = Employee(name="employee_who_cannot_close", employee_id="employee_who_cannot_close", shift_types_trained_to_do=[ShiftTypesEnum.MORNING])
+    employees = [employee_who_cannot_close] + create_employees(1)
+    shifts = create_daily_shifts(1)
+
+    with pytest.raises(ValueError, match="employee_who_cannot_close.*closing_0"):
+        create_solutions(employees, shifts, fixed_assignments={"closing_0": "employee_who_cannot_close"})
+
+
+def test_a_step_that_is_not_positive_raises_a_value_error():
+    with pytest.raises(ValueError, match="must be positive"):
+        create_rolling_horizon_schedule(create_employees(2), create_daily_shifts(3), step=datetime.timedelta(0))
+
+
+def test_a_step_longer_than_the_window_raises_a_value_error():
+    with pytest.raises(ValueError, match="can not be longer than its window"):
+        create_rolling_horizon_schedule(create_employees(2), create_daily_shifts(3), window=datetime.timedelta(days=1), step=datetime.timedelta(days=2))
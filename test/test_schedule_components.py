@@ -0,0 +1,67 @@
+import datetime
+
+from src.models.employees.employee import Employee
+from src.models.employees.employees_file import all_employees
+from src.models.shifts.shift import Shift
+from src.models.shifts.shifts_file import all_shifts_in_the_week
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.schedule_components import get_schedule_components, create_schedule_from_components
+from src.models.solution.solve_status_enum import SolveStatusEnum
+from src.models.solution.solver_profile_enum import SolverProfileEnum
+
+
+# Two sites with their own staff: the morning employees can not work the closings, and the closing employees can not
+# work the mornings.
+def create_two_sites():
+    employees = [Employee(name=f"{site}_employee{employee_number}", employee_id=f"{site}_employee{employee_number}", shift_types_trained_to_do=[shift_type])
+                 for site, shift_type in [("morning", ShiftTypesEnum.MORNING), ("closing", ShiftTypesEnum.CLOSING)] for employee_number in range(3)]
+    shifts = [Shift(shift_id=f"{shift_type.value}_{day}", shift_type=shift_type, start_time=datetime.datetime(2024, 1, 1 + day, start_hour),
+                    end_time=datetime.datetime(2024, 1, 1 + day, start_hour + 6))
+              for shift_type, start_hour in [(ShiftTypesEnum.MORNING, 8), (ShiftTypesEnum.CLOSING, 17)] for day in range(5)]
+
+    return employees, shifts
+
+
+def test_staffs_that_can_not_work_each_others_shifts_are_different_components():
+    employees, shifts = create_two_sites()
+    employee_without_shifts = Employee(name="employee_without_shifts", employee_id="employee_without_shifts", shift_types_trained_to_do=[ShiftTypesEnum.STAND_BY])
+
+    components = get_schedule_components(employees + [employee_without_shifts], shifts)
+
+    assert len(components) == 2
+    assert components[0].employees == employees[:3] + [employee_without_shifts]
+    assert components[0].shifts == shifts[:5]
+    assert components[1].employees == employees[3:]
+    assert components[1].shifts == shifts[5:]
+
+
+def test_the_stitched_schedule_of_the_components_is_as_good_as_the_schedule_of_one_model():
+    employees, shifts = create_two_sites()
+    full_schedule_solution = create_solutions(employees, shifts, solver_profile=SolverProfileEnum.OPTIMAL)
+    full_schedule_solution.solver.Solve(full_schedule_solution.constraint_model)
+
+    components_schedule = create_schedule_from_components(employees, shifts, solver_profile=SolverProfileEnum.OPTIMAL, number_of_workers=2)
+
+    assert components_schedule.search_status.status == SolveStatusEnum.OPTIMAL
+    assert components_schedule.search_status.objective_value == full_schedule_solution.solver.ObjectiveValue()
+    assert set(components_schedule.schedule.schedule) == {shift.shift_id for shift in shifts}
+    assert sum(components_schedule.schedule.number_of_shift_for_each_emp.values()) == len(shifts)
+
+
+def test_a_sample_week_in_one_component_is_solved_in_the_calling_process():
+    components_schedule = create_schedule_from_components(all_employees, all_shifts_in_the_week)
+
+    assert len(get_schedule_components(all_employees, all_shifts_in_the_week)) == 1
+    assert components_schedule.schedule is not None
+    assert len(components_schedule.schedule.schedule) == len(all_shifts_in_the_week)
+
+
+def test_a_shift_that_no_employee_can_work_makes_the_schedule_infeasible():
+    employees, shifts = create_two_sites()
+    shift_without_employees = Shift(shift_id="stand_by", shift_type=ShiftTypesEnum.STAND_BY, start_time=datetime.datetime(2024, 1, 1, 20), end_time=datetime.datetime(2024, 1, 2, 2))
+
+    components_schedule = create_schedule_from_components(employees, shifts + [shift_without_employees], number_of_workers=1)
+
+    assert components_schedule.schedule is None
+    assert components_schedule.search_status.status == SolveStatusEnum.INFEASIBLE
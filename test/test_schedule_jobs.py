@@ -0,0 +1,166 @@
+import concurrent.futures
+import datetime
+import time
+
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from src.models.employees.employee import Employee
+from src.models.employees.employee_status_enum import EmployeeStatusEnum
+from src.models.shifts.shift import Shift
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.model_cache import ModelCache
+from src.models.solution.schedules_and_emps_metadata import SchedulesAndEmpsMetadata
+from src.models.solution.solver_profile_enum import SolverProfileEnum
+from src.server import schedule_jobs
+from src.server import app as server
+from src.server.schedule_job_status_enum import ScheduleJobStatusEnum
+from src.server.schedule_jobs import ScheduleJob, ScheduleJobsQueue
+from src.server.schedule_options import ScheduleOptionsJobResult, ScheduleOptionsRequest, run_schedule_options_job
+
+
+def create_schedule_options_request() -> ScheduleOptionsRequest:
+    employees = [Employee(name=f"employee{employee_number}", employee_id=f"employee{employee_number}", employee_status=employee_status,
+                          shift_types_trained_to_do=[ShiftTypesEnum.MORNING, ShiftTypesEnum.CLOSING])
+                 for employee_number, employee_status in enumerate([EmployeeStatusEnum.mid_level_employee, EmployeeStatusEnum.senior_employee])]
+    shifts = [Shift(shift_id=f"{shift_type.value}_{day}", shift_type=shift_type, start_time=datetime.datetime(2024, 1, 1 + day, start_hour),
+                    end_time=datetime.datetime(2024, 1, 1 + day, start_hour + 6))
+              for day in range(2) for shift_type, start_hour in [(ShiftTypesEnum.MORNING, 8), (ShiftTypesEnum.CLOSING, 16)]]
+
+    return ScheduleOptionsRequest(employees, shifts, max_time_per_solve_in_seconds=1, max_total_time_in_seconds=2, random_seed=1)
+
+
+def wait_for_schedule_job(schedule_job: ScheduleJob) -> None:
+    while schedule_job.get_status() in [ScheduleJobStatusEnum.QUEUED, ScheduleJobStatusEnum.RUNNING]:
+        time.sleep(0.1)
+
+
+def test_a_schedule_options_job_is_done_with_its_schedules():
+    schedule_jobs_queue = ScheduleJobsQueue(number_of_workers=1)
+    try:
+        schedule_job = schedule_jobs_queue.submit(run_schedule_options_job, create_schedule_options_request())
+        wait_for_schedule_job(schedule_job)
+
+        assert schedule_job.get_status() == ScheduleJobStatusEnum.DONE
+        assert schedule_jobs_queue.get(schedule_job.job_id) is schedule_job
+        assert len(schedule_job.future.result().schedules_options.schedules) > 0
+    finally:
+        schedule_jobs_queue.shutdown()
+
+
+def test_a_job_is_refused_when_the_queue_is_full_and_accepted_when_it_is_free():
+    schedule_jobs_queue = ScheduleJobsQueue(number_of_workers=1, max_queued_jobs=0)
+    try:
+        schedule_job = schedule_jobs_queue.submit(time.sleep, 1)
+
+        assert schedule_jobs_queue.submit(time.sleep, 1) is None
+
+        wait_for_schedule_job(schedule_job)
+
+        assert schedule_jobs_queue.submit(time.sleep, 0) is not None
+    finally:
+        schedule_jobs_queue.shutdown()
+
+
+def test_finished_jobs_are_removed_after_their_time_to_live():
+    schedule_jobs_queue = ScheduleJobsQueue(time_to_live_in_seconds=60)
+    expired_schedule_job = schedule_jobs_queue.add_finished_job("result")
+    expired_schedule_job.created_time -= 120
+
+    schedule_job = schedule_jobs_queue.add_finished_job("result")
+
+    assert schedule_jobs_queue.get(expired_schedule_job.job_id) is None
+    assert schedule_jobs_queue.get(schedule_job.job_id) is schedule_job
+
+
+def test_cancelled_jobs_are_cancelled_whether_they_are_queued_or_running():
+    schedule_jobs_queue = ScheduleJobsQueue(number_of_workers=1, max_queued_jobs=1)
+    try:
+        running_schedule_job = schedule_jobs_queue.submit(time.sleep, 1)
+        queued_schedule_job = schedule_jobs_queue.submit(time.sleep, 1)
+        schedule_jobs_queue.cancel(running_schedule_job)
+        schedule_jobs_queue.cancel(queued_schedule_job)
+
+        assert running_schedule_job.get_status() == ScheduleJobStatusEnum.CANCELLED
+        assert queued_schedule_job.get_status() == ScheduleJobStatusEnum.CANCELLED
+        assert schedule_jobs_queue.get_number_of_unfinished_jobs() <= 1
+    finally:
+        schedule_jobs_queue.shutdown()
+
+
+def test_the_result_of_a_job_cancelled_while_it_was_running_is_not_cached():
+    schedule_options_request = create_schedule_options_request()
+    server.schedules_options_cache.clear()
+
+    for cancel_requested in [True, False]:
+        future = concurrent.futures.Future()
+        future.set_result(ScheduleOptionsJobResult(SchedulesAndEmpsMetadata([], [], []), 0, ModelCache().get_statistics()))
+        server.add_schedule_options_job_result(ScheduleJob(job_id="job", future=future, cancel_requested=cancel_requested), schedule_options_request)
+
+        assert server.schedules_options_cache.get_statistics().number_of_results == (0 if cancel_requested else 1)
+
+    server.schedules_options_cache.clear()
+    server.model_caches_statistics_by_process.clear()
+
+
+def test_the_cpus_are_divided_between_the_processes_of_the_queue(monkeypatch):
+    monkeypatch.setattr(schedule_jobs, "get_number_of_available_cpus", lambda: 16)
+    schedule_options_request = create_schedule_options_request()
+    number_of_cpus_per_worker = ScheduleJobsQueue(number_of_workers=2).get_number_of_cpus_per_worker()
+    schedule_solution = create_solutions(schedule_options_request.employees, schedule_options_request.shifts, solver_profile=SolverProfileEnum.BALANCED,
+                                         number_of_cpus=number_of_cpus_per_worker)
+
+    assert number_of_cpus_per_worker == 8
+    assert ScheduleJobsQueue(number_of_workers=32).get_number_of_cpus_per_worker() == 1
+    assert schedule_solution.solver.parameters.num_search_workers == 8
+
+
+def test_the_schedules_of_a_posted_job_are_read_when_it_is_done():
+    schedule_options_request = create_schedule_options_request()
+    request_body = TypeAdapter(ScheduleOptionsRequest).dump_python(schedule_options_request, mode="json")
+
+    with TestClient(server.app) as client:
+        response = client.post("/schedule_options_jobs", json=request_body)
+        job_id = response.json()["job_id"]
+
+        assert response.status_code == 202
+
+        while client.get(f"/schedule_options_jobs/{job_id}").json()["status"] in [ScheduleJobStatusEnum.QUEUED.value, ScheduleJobStatusEnum.RUNNING.value]:
+            time.sleep(0.1)
+
+        assert client.get(f"/schedule_options_jobs/{job_id}").json()["status"] == ScheduleJobStatusEnum.DONE.value
+        assert len(client.get(f"/schedule_options_jobs/{job_id}/result").json()["schedules"]) > 0
+        assert client.get("/schedule_options_jobs/unknown_job").status_code == 404
+
+
+# Only 10 hours pass between the closing of the first day and the morning of the second day
+def test_the_minimum_rest_of_a_request_is_kept_and_is_part_of_its_cache_key():
+    schedule_options_request = create_schedule_options_request()
+    rest_schedule_options_request = TypeAdapter(ScheduleOptionsRequest).validate_python({**schedule_options_request.__dict__, "min_time_between_shifts": 11 * 60 * 60})
+
+    assert rest_schedule_options_request.min_time_between_shifts == datetime.timedelta(hours=11)
+    assert rest_schedule_options_request.get_search_settings() != schedule_options_request.get_search_settings()
+
+    schedules = run_schedule_options_job(rest_schedule_options_request).schedules_options.schedules
+
+    assert len(schedules) > 0
+    assert all(schedule.schedule["closing_0"] != schedule.schedule["morning_1"] for schedule in schedules)
+
+
+def test_posted_employees_without_ids_get_different_ids():
+    request_body = TypeAdapter(ScheduleOptionsRequest).dump_python(create_schedule_options_request(), mode="json")
+    for employee in request_body["employees"]:
+        del employee["employee_id"]
+
+    with TestClient(server.app) as client:
+        job_id = client.post("/schedule_options_jobs", json=request_body).json()["job_id"]
+
+        while client.get(f"/schedule_options_jobs/{job_id}").json()["status"] in [ScheduleJobStatusEnum.QUEUED.value, ScheduleJobStatusEnum.RUNNING.value]:
+            time.sleep(0.1)
+
+        schedules_options = client.get(f"/schedule_options_jobs/{job_id}/result").json()
+
+    employees_ids = [employee["employee_id"] for employee in schedules_options["employees"]]
+    assert len(set(employees_ids)) == 2
+    assert all(set(schedule["schedule"].values()) == set(employees_ids) for schedule in schedules_options["schedules"])
@@ -0,0 +1,94 @@
+import datetime
+
+from ortools.sat.python import cp_model
+
+from src.models.employees.employee import Employee
+from src.models.employees.employee_position_enum import EmployeePositionEnum
+from src.models.shifts.shift import Shift
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.assignments_matrix import create_schedule_solution_metadata_from_assignments_matrix
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.schedule_repair import repair_schedule, ScheduleChange, get_objective_range
+
+MIN_TIME_BETWEEN_SHIFTS = datetime.timedelta(hours=9)
+
+
+def create_employees(number_of_employees: int) -> list[Employee]:
+    return [Employee(name=f"employee{employee_number}", employee_id=f"employee{employee_number}", shift_types_trained_to_do=[ShiftTypesEnum.MORNING, ShiftTypesEnum.CLOSING])
+            for employee_number in range(number_of_employees)]
+
+
+def create_shift(shift_type: ShiftTypesEnum, day: int) -> Shift:
+    start_hour = 7 if shift_type == ShiftTypesEnum.MORNING else 16
+    start_time = datetime.datetime(2024, 1, 1 + day, start_hour)
+
+    return Shift(shift_id=f"{shift_type.value}_{day}", shift_type=shift_type, start_time=start_time, end_time=start_time + datetime.timedelta(hours=7))
+
+
+def create_week_schedule(employees: list[Employee]) -> tuple[list[Shift], dict[str, str]]:
+    shifts = [create_shift(shift_type, day) for day in range(7) for shift_type in [ShiftTypesEnum.MORNING, ShiftTypesEnum.CLOSING]]
+    schedule_solution = create_solutions(employees, shifts, min_time_between_shifts=MIN_TIME_BETWEEN_SHIFTS)
+    schedule_solution.solver.Solve(schedule_solution.constraint_model)
+    assignments_matrix_index = schedule_solution.assignments_matrix_index
+    assignments_matrix = assignments_matrix_index.get_assignments_matrix(schedule_solution.solver.ResponseProto().solution)
+
+    return shifts, create_schedule_solution_metadata_from_assignments_matrix(assignments_matrix, assignments_matrix_index).schedule
+
+
+def test_only_the_shifts_of_a_removed_employee_are_reassigned():
+    employees = create_employees(6)
+    shifts, schedule = create_week_schedule(employees)
+    removed_employee_shifts_ids = {shift_id for shift_id, employee_id in schedule.items() if employee_id == "employee0"}
+
+    repaired_schedule = repair_schedule(employees, shifts, schedule, ScheduleChange(removed_employees_ids=["employee0"]), min_time_between_shifts=MIN_TIME_BETWEEN_SHIFTS)
+
+    assert set(repaired_schedule.schedule.schedule) == {shift.shift_id for shift in shifts}
+    assert "employee0" not in repaired_schedule.schedule.schedule.values()
+    assert set(repaired_schedule.changed_shifts_ids) == removed_employee_shifts_ids
+
+
+def test_an_unavailable_shift_is_reassigned_and_the_shifts_outside_the_neighbourhood_are_kept():
+    employees = create_employees(6)
+    shifts, schedule = create_week_schedule(employees)
+
+    repaired_schedule = repair_schedule(employees, shifts, schedule, ScheduleChange(unavailable_shifts={schedule["morning_3"]: ["morning_3"]}),
+                                        min_time_between_shifts=MIN_TIME_BETWEEN_SHIFTS)
+
+    assert repaired_schedule.schedule.schedule["morning_3"] != schedule["morning_3"]
+    assert all(repaired_schedule.schedule.schedule[shift.shift_id] == schedule[shift.shift_id] for shift in shifts if abs(shift.start_time.day - 4) > 1)
+
+
+def test_an_added_shift_gets_an_employee_without_changing_the_schedule():
+    employees = create_employees(6)
+    shifts, schedule = create_week_schedule(employees)
+    added_shift = Shift(shift_id="added_shift", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 4, 9), end_time=datetime.datetime(2024, 1, 4, 13))
+
+    repaired_schedule = repair_schedule(employees, shifts, schedule, ScheduleChange(added_shifts=[added_shift]), min_time_between_shifts=MIN_TIME_BETWEEN_SHIFTS)
+
+    assert repaired_schedule.changed_shifts_ids == ["added_shift"]
+    assert repaired_schedule.schedule.schedule["added_shift"] != repaired_schedule.schedule.schedule["morning_3"]
+
+
+# The closing before the neighbourhood is not reassigned, but its employee still needs the rest after it, so the
+# morning goes to the part timer even though the fairness prefers the full timer who closed.
+def test_the_rest_after_a_shift_outside_the_neighbourhood_holds_in_the_repair():
+    closing_employee = Employee(name="closing_employee", employee_id="closing_employee", shift_types_trained_to_do=[ShiftTypesEnum.MORNING, ShiftTypesEnum.CLOSING])
+    part_timer = Employee(name="part_timer", employee_id="part_timer", position=EmployeePositionEnum.part_timer, shift_types_trained_to_do=[ShiftTypesEnum.MORNING])
+    unavailable_employee = Employee(name="unavailable_employee", employee_id="unavailable_employee", shift_types_trained_to_do=[ShiftTypesEnum.MORNING])
+    shifts = [create_shift(ShiftTypesEnum.CLOSING, 0), create_shift(ShiftTypesEnum.MORNING, 1)]
+    schedule = {"closing_0": "closing_employee", "morning_1": "unavailable_employee"}
+
+    repaired_schedule = repair_schedule([closing_employee, part_timer, unavailable_employee], shifts, schedule,
+                                        ScheduleChange(unavailable_shifts={"unavailable_employee": ["morning_1"]}), min_time_between_shifts=MIN_TIME_BETWEEN_SHIFTS,
+                                        neighbourhood_radius=datetime.timedelta(hours=1))
+
+    assert repaired_schedule.schedule.schedule == {"closing_0": "closing_employee", "morning_1": "part_timer"}
+
+
+def test_the_objective_range_is_the_largest_difference_between_two_values_of_the_objective():
+    constraint_model = cp_model.CpModel()
+    shift_count = constraint_model.NewIntVar(2, 10, "shift_count")
+    assignment = constraint_model.NewBoolVar("assignment")
+    constraint_model.Minimize(3 * shift_count - 2 * assignment.Not() + 5)
+
+    assert get_objective_range(constraint_model) == 3 * 8 + 2
@@ -0,0 +1,33 @@
+import itertools
+
+from src.models.employees.employees_file import all_employees
+from src.models.shifts.shifts_file import all_shifts_in_the_week
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.schedules_collector import get_number_of_different_assignments
+
+
+def test_every_yielded_schedule_is_different_from_the_schedules_before_it_in_enough_shifts():
+    minimum_different_assignments = 3
+    schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+    number_of_constraints_before_the_schedules = len(schedule_solution.constraint_model.Proto().constraints)
+    number_of_variables_before_the_schedules = len(schedule_solution.constraint_model.Proto().variables)
+
+    schedules = list(itertools.islice(schedule_solution.yield_schedules(minimum_different_assignments=minimum_different_assignments), 10))
+
+    for schedule, previous_schedule in itertools.combinations(schedules, 2):
+        assert get_number_of_different_assignments(schedule.schedule, previous_schedule.schedule) >= minimum_different_assignments
+
+    # One linear constraint for each schedule (and one for the objective bound), and no new variables
+    assert len(schedule_solution.constraint_model.Proto().constraints) == number_of_constraints_before_the_schedules + len(schedules) + 1
+    assert len(schedule_solution.constraint_model.Proto().variables) == number_of_variables_before_the_schedules
+
+
+def test_schedules_collected_in_one_search_are_different_from_each_other_in_enough_shifts():
+    minimum_different_assignments = 3
+    schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+
+    schedules = list(schedule_solution.yield_schedules_from_one_search(10, objective_tolerance=10, minimum_different_assignments=minimum_different_assignments))
+
+    assert len(schedules) == 10
+    for schedule, other_schedule in itertools.combinations(schedules, 2):
+        assert get_number_of_different_assignments(schedule.schedule, other_schedule.schedule) >= minimum_different_assignments
@@ -0,0 +1,133 @@
+import datetime
+import pickle
+
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from src.models.employees.employee import Employee
+from src.models.shifts.shift import Shift
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.one_schedule_solution_metadata import ScheduleSolutionMetadata
+from src.models.solution.schedules_and_emps_metadata import SchedulesAndEmpsMetadata
+from src.models.solution.schedules_options_cache import SchedulesOptionsCache
+from src.models.solution.solver_profile_enum import SolverProfileEnum
+from src.server import app
+from src.server.schedule_job_status_enum import ScheduleJobStatusEnum
+from src.server.schedule_options import ScheduleOptionsRequest
+
+FAST_SEARCH_SETTINGS = {"solver_profile": SolverProfileEnum.FAST, "random_seed": 1}
+OPTIMAL_SEARCH_SETTINGS = {"solver_profile": SolverProfileEnum.OPTIMAL, "random_seed": 1}
+
+
+def create_schedules_options() -> SchedulesAndEmpsMetadata:
+    return SchedulesAndEmpsMetadata([], [], [])
+
+
+def test_a_result_is_found_only_for_its_problem_and_search_settings():
+    schedules_options_cache = SchedulesOptionsCache()
+    schedules_options = create_schedules_options()
+    schedules_options_cache.put("problem", FAST_SEARCH_SETTINGS, schedules_options)
+
+    assert schedules_options_cache.get("problem", {"random_seed": 1, "solver_profile": SolverProfileEnum.FAST}) is schedules_options
+    assert schedules_options_cache.get("problem", OPTIMAL_SEARCH_SETTINGS) is None
+    assert schedules_options_cache.get("other_problem", FAST_SEARCH_SETTINGS) is None
+    assert schedules_options_cache.hits == 1 and schedules_options_cache.misses == 2
+
+
+def test_a_whole_float_setting_finds_the_result_of_its_int():
+    schedules_options_cache = SchedulesOptionsCache()
+    schedules_options = create_schedules_options()
+    schedules_options_cache.put("problem", {"max_time_per_solve_in_seconds": 10}, schedules_options)
+
+    assert schedules_options_cache.get("problem", {"max_time_per_solve_in_seconds": 10.0}) is schedules_options
+    assert schedules_options_cache.get("problem", {"max_time_per_solve_in_seconds": 10.5}) is None
+
+
+def test_a_result_expires_after_its_time_to_live():
+    schedules_options_cache = SchedulesOptionsCache(time_to_live_in_seconds=60)
+    schedules_options_cache.put("problem", FAST_SEARCH_SETTINGS, create_schedules_options())
+    for cached_result in schedules_options_cache.results.values():
+        cached_result.created_time -= 120
+
+    assert schedules_options_cache.get("problem", FAST_SEARCH_SETTINGS) is None
+    assert schedules_options_cache.get_statistics().number_of_results == 0
+    assert schedules_options_cache.evictions == 1
+
+
+def test_the_least_recently_used_result_is_evicted_when_the_results_are_too_big():
+    schedules_options_cache = SchedulesOptionsCache(max_size_in_bytes=2 * len(pickle.dumps(create_schedules_options())))
+    schedules_options_cache.put("first_problem", FAST_SEARCH_SETTINGS, create_schedules_options())
+    schedules_options_cache.put("second_problem", FAST_SEARCH_SETTINGS, create_schedules_options())
+    schedules_options_cache.get("first_problem", FAST_SEARCH_SETTINGS)
+    schedules_options_cache.put("third_problem", FAST_SEARCH_SETTINGS, create_schedules_options())
+
+    assert schedules_options_cache.get("second_problem", FAST_SEARCH_SETTINGS) is None
+    assert schedules_options_cache.get("first_problem", FAST_SEARCH_SETTINGS) is not None
+    assert schedules_options_cache.get("third_problem", FAST_SEARCH_SETTINGS) is not None
+    assert schedules_options_cache.evictions == 1
+
+
+def test_invalidating_a_problem_removes_all_its_results():
+    schedules_options_cache = SchedulesOptionsCache()
+    for search_settings in [FAST_SEARCH_SETTINGS, OPTIMAL_SEARCH_SETTINGS]:
+        schedules_options_cache.put("problem", search_settings, create_schedules_options())
+    schedules_options_cache.put("other_problem", FAST_SEARCH_SETTINGS, create_schedules_options())
+
+    schedules_options_cache.invalidate("problem")
+
+    assert schedules_options_cache.get("problem", FAST_SEARCH_SETTINGS) is None
+    assert schedules_options_cache.get("problem", OPTIMAL_SEARCH_SETTINGS) is None
+    assert schedules_options_cache.get("other_problem", FAST_SEARCH_SETTINGS) is not None
+    assert schedules_options_cache.evictions == 2
+
+
+def test_clearing_the_cache_counts_its_results_as_evictions():
+    schedules_options_cache = SchedulesOptionsCache()
+    for problem in ["first_problem", "second_problem"]:
+        schedules_options_cache.put(problem, FAST_SEARCH_SETTINGS, create_schedules_options())
+
+    schedules_options_cache.clear()
+
+    assert schedules_options_cache.get_statistics().number_of_results == 0
+    assert schedules_options_cache.evictions == 2
+
+
+def test_the_server_invalidates_the_results_of_one_problem():
+    app.schedules_options_cache.clear()
+    for search_settings in [FAST_SEARCH_SETTINGS, OPTIMAL_SEARCH_SETTINGS]:
+        app.schedules_options_cache.put("problem", search_settings, create_schedules_options())
+    app.schedules_options_cache.put("other_problem", FAST_SEARCH_SETTINGS, create_schedules_options())
+
+    with TestClient(app.app) as client:
+        assert client.delete("/schedule_options_cache/problem").status_code == 200
+        assert client.get("/schedule_options_cache_statistics").json()["number_of_results"] == 1
+
+    assert app.schedules_options_cache.get("other_problem", FAST_SEARCH_SETTINGS) is not None
+    app.schedules_options_cache.clear()
+
+
+def test_a_cached_result_is_returned_in_the_order_of_the_employees_and_the_shifts_of_the_request():
+    employees = [Employee(name=f"employee{employee_number}", employee_id=f"employee{employee_number}", shift_types_trained_to_do=[ShiftTypesEnum.MORNING])
+                 for employee_number in range(2)]
+    shifts = [Shift(shift_id=f"morning_{day}", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 1 + day, 8),
+                    end_time=datetime.datetime(2024, 1, 1 + day, 14)) for day in range(2)]
+    schedule = ScheduleSolutionMetadata({"employee0": 0, "employee1": 0}, {"employee0": 1, "employee1": 1}, {"employee0": 1, "employee1": 1},
+                                        {"morning_0": "employee0", "morning_1": "employee1"})
+    schedule_options_request = ScheduleOptionsRequest(employees, shifts, random_seed=1)
+    reordered_schedule_options_request = ScheduleOptionsRequest(employees[::-1], shifts[::-1], random_seed=1)
+
+    app.schedules_options_cache.clear()
+    app.schedules_options_cache.put(app.get_problem_hash_of_request(schedule_options_request), schedule_options_request.get_search_settings(),
+                                    SchedulesAndEmpsMetadata([schedule], employees, shifts))
+
+    with TestClient(app.app) as client:
+        job_id = client.post("/schedule_options_jobs", json=TypeAdapter(ScheduleOptionsRequest).dump_python(reordered_schedule_options_request, mode="json")).json()["job_id"]
+
+        assert client.get(f"/schedule_options_jobs/{job_id}").json()["status"] == ScheduleJobStatusEnum.DONE.value
+        schedules_options = client.get(f"/schedule_options_jobs/{job_id}/result").json()
+
+    assert [employee["employee_id"] for employee in schedules_options["employees"]] == ["employee1", "employee0"]
+    assert [shift["shift_id"] for shift in schedules_options["shifts"]] == ["morning_1", "morning_0"]
+    assert list(schedules_options["schedules"][0]["schedule"].items()) == [("morning_1", "employee1"), ("morning_0", "employee0")]
+    assert list(schedules_options["schedules"][0]["number_of_shift_for_each_emp"]) == ["employee1", "employee0"]
+    app.schedules_options_cache.clear()
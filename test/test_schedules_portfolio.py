@@ -0,0 +1,49 @@
+import itertools
+
+from ortools.sat.python import cp_model
+
+from src.models.employees.employees_file import all_employees
+from src.models.shifts.shift_combinations_key import ShiftCombinationsKey
+from src.models.shifts.shifts_file import all_shifts_in_the_week
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.one_schedule_solution_metadata import ScheduleSolutionMetadata
+from src.models.solution.schedules_collector import get_number_of_different_assignments
+from src.models.solution.schedules_portfolio import PortfolioWorkerSchedules, merge_portfolio_schedules, \
+    yield_schedules_from_portfolio
+
+
+def create_schedule(schedule: dict[str, str]) -> ScheduleSolutionMetadata:
+    return ScheduleSolutionMetadata({}, {}, {}, schedule)
+
+
+def test_merged_schedules_are_the_best_schedules_that_are_different_enough_from_each_other():
+    best_schedule = create_schedule({"first_shift": "first_employee", "second_shift": "second_employee"})
+    same_schedule_from_another_worker = create_schedule({"first_shift": "first_employee", "second_shift": "second_employee"})
+    schedule_with_one_different_assignment = create_schedule({"first_shift": "first_employee", "second_shift": "first_employee"})
+    schedule_with_two_different_assignments = create_schedule({"first_shift": "second_employee", "second_shift": "first_employee"})
+
+    workers_schedules = [PortfolioWorkerSchedules([(-10, best_schedule), (-8, schedule_with_one_different_assignment)], False),
+                         PortfolioWorkerSchedules([(-10, same_schedule_from_another_worker), (-5, schedule_with_two_different_assignments)], False)]
+
+    assert merge_portfolio_schedules(workers_schedules, 10, 1) == [best_schedule, schedule_with_one_different_assignment, schedule_with_two_different_assignments]
+    assert merge_portfolio_schedules(workers_schedules, 10, 2) == [best_schedule, schedule_with_two_different_assignments]
+    assert merge_portfolio_schedules(workers_schedules, 1, 1) == [best_schedule]
+
+
+def test_portfolio_schedules_are_different_and_the_first_one_is_optimal():
+    number_of_schedules = 10
+    schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+
+    schedules = list(yield_schedules_from_portfolio(schedule_solution, number_of_schedules, number_of_workers=2))
+
+    assert len(schedules) == number_of_schedules
+    assert schedule_solution.search_status.number_of_schedules == number_of_schedules
+    for schedule, other_schedule in itertools.combinations(schedules, 2):
+        assert get_number_of_different_assignments(schedule.schedule, other_schedule.schedule) >= 1
+
+    first_schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+    for shift_id, employee_id in schedules[0].schedule.items():
+        first_schedule_solution.constraint_model.Add(first_schedule_solution.all_shifts[ShiftCombinationsKey(employee_id, shift_id)] == 1)
+
+    assert first_schedule_solution.solver.Solve(first_schedule_solution.constraint_model) == cp_model.OPTIMAL
+    assert first_schedule_solution.solver.ObjectiveValue() == schedule_solution.search_status.objective_value
@@ -0,0 +1,57 @@
+import datetime
+
+from src.models.employees.employee import Employee
+from src.models.employees.employees_file import all_employees
+from src.models.shifts.shift import Shift
+from src.models.shifts.shifts_file import all_shifts_in_the_week
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.solve_status_enum import SolveStatusEnum
+
+
+def create_employee_and_shifts(shifts_overlap: bool):
+    first_shift = Shift(shift_id="first_shift", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 1, 8), end_time=datetime.datetime(2024, 1, 1, 14))
+    second_shift_start_time = first_shift.start_time if shifts_overlap else first_shift.end_time
+    second_shift = Shift(shift_id="second_shift", shift_type=ShiftTypesEnum.MORNING, start_time=second_shift_start_time, end_time=second_shift_start_time + datetime.timedelta(hours=6))
+    employee = Employee(name="employee", employee_id="employee", shift_types_trained_to_do=[ShiftTypesEnum.MORNING])
+
+    return [employee], [first_shift, second_shift]
+
+
+def test_schedules_stop_when_the_week_has_no_schedule():
+    employees, shifts = create_employee_and_shifts(shifts_overlap=True)
+
+    for search_schedules in [lambda schedule_solution: schedule_solution.yield_schedules(),
+                             lambda schedule_solution: schedule_solution.yield_schedules_from_one_search(10)]:
+        schedule_solution = create_solutions(employees, shifts)
+
+        assert list(search_schedules(schedule_solution)) == []
+        assert schedule_solution.search_status.status == SolveStatusEnum.INFEASIBLE
+        assert schedule_solution.search_status.objective_value is None
+        assert schedule_solution.search_status.number_of_schedules == 0
+
+
+def test_schedules_stop_when_there_are_no_more_schedules():
+    employees, shifts = create_employee_and_shifts(shifts_overlap=False)
+    schedule_solution = create_solutions(employees, shifts)
+
+    schedules = list(schedule_solution.yield_schedules())
+
+    assert len(schedules) == 1
+    assert schedule_solution.search_status.status == SolveStatusEnum.OPTIMAL
+    assert schedule_solution.search_status.objective_gap == 0
+    assert schedule_solution.search_status.last_solve_status == SolveStatusEnum.INFEASIBLE
+    assert schedule_solution.search_status.number_of_schedules == 1
+    assert not schedule_solution.search_status.time_budget_exhausted
+
+
+def test_schedules_stop_when_the_total_time_budget_is_over():
+    max_total_time_in_seconds = 0.3
+    schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+
+    schedules = list(schedule_solution.yield_schedules(max_total_time_in_seconds=max_total_time_in_seconds))
+
+    assert len(schedules) == schedule_solution.search_status.number_of_schedules
+    assert schedule_solution.search_status.time_budget_exhausted
+    assert schedule_solution.search_status.wall_time_in_seconds < max_total_time_in_seconds + 0.5
+    assert schedule_solution.solver.parameters.max_time_in_seconds > max_total_time_in_seconds
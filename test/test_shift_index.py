@@ -0,0 +1,52 @@
+import datetime
+
+import pytest
+
+from src.models.shifts.shift import Shift
+from src.models.shifts.shift_index import get_shift_index
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.shifts.shifts_file import all_shifts_in_the_week
+
+
+def test_shift_index_groups_the_shifts_by_day_and_type_in_start_time_order():
+    first_day_evening = Shift(shift_id="first_day_evening", shift_type=ShiftTypesEnum.EVENING, start_time=datetime.datetime(2024, 1, 1, 16), end_time=datetime.datetime(2024, 1, 1, 23))
+    second_day_morning = Shift(shift_id="second_day_morning", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 2, 9), end_time=datetime.datetime(2024, 1, 2, 16))
+    first_day_morning = Shift(shift_id="first_day_morning", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 1, 9), end_time=datetime.datetime(2024, 1, 1, 16))
+
+    shift_index = get_shift_index([first_day_evening, second_day_morning, first_day_morning])
+
+    assert shift_index.shifts_sorted_by_start_time == (first_day_morning, first_day_evening, second_day_morning)
+    assert shift_index.shifts_by_day == {datetime.date(2024, 1, 1): (first_day_morning, first_day_evening), datetime.date(2024, 1, 2): (second_day_morning,)}
+    assert shift_index.shifts_by_type == {ShiftTypesEnum.MORNING: (first_day_morning, second_day_morning), ShiftTypesEnum.EVENING: (first_day_evening,)}
+    assert shift_index.shift_position_by_id == {"first_day_morning": 0, "first_day_evening": 1, "second_day_morning": 2}
+    assert shift_index.get_shifts_starting_between(first_day_morning.start_time, second_day_morning.start_time) == [first_day_evening]
+
+
+def test_shift_index_has_the_overlapping_shifts_of_every_shift():
+    morning = Shift(shift_id="morning", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 1, 9), end_time=datetime.datetime(2024, 1, 1, 16))
+    morning_backup = Shift(shift_id="morning_backup", shift_type=ShiftTypesEnum.MORNING_BACKUP, start_time=datetime.datetime(2024, 1, 1, 10), end_time=datetime.datetime(2024, 1, 1, 17))
+    evening = Shift(shift_id="evening", shift_type=ShiftTypesEnum.EVENING, start_time=datetime.datetime(2024, 1, 1, 16), end_time=datetime.datetime(2024, 1, 1, 23))
+
+    shift_index = get_shift_index([evening, morning_backup, morning])
+
+    assert shift_index.overlapping_shifts == {morning: (morning_backup,), morning_backup: (morning, evening), evening: (morning_backup,)}
+
+
+def test_shift_index_is_built_once_for_the_same_shifts():
+    shifts_in_another_order = list(reversed(all_shifts_in_the_week))
+
+    assert get_shift_index(all_shifts_in_the_week) is get_shift_index(shifts_in_another_order)
+
+
+def test_the_shared_shift_index_can_not_be_changed_by_one_of_its_callers():
+    shift_index = get_shift_index(all_shifts_in_the_week)
+    shift_index.get_shifts_starting_between(shift_index.start_times[0], shift_index.start_times[-1]).clear()
+
+    with pytest.raises(TypeError):
+        shift_index.shifts_by_day[shift_index.start_times[0].date()] = ()
+    with pytest.raises(TypeError):
+        shift_index.shift_position_by_id["new_shift"] = 0
+    with pytest.raises(AttributeError):
+        shift_index.start_times.append(shift_index.start_times[0])
+
+    assert get_shift_index(all_shifts_in_the_week).shifts_sorted_by_start_time == tuple(sorted(all_shifts_in_the_week, key=lambda shift: (shift.start_time, shift.end_time, str(shift.shift_id))))
@@ -0,0 +1,112 @@
+import concurrent.futures
+import datetime
+import itertools
+
+import pytest
+from ortools.sat import sat_parameters_pb2
+from ortools.sat.python import cp_model
+
+from src.models.employees.employee import Employee
+from src.models.employees.employees_file import all_employees
+from src.models.shifts.shift import Shift
+from src.models.shifts.shifts_file import all_shifts_in_the_week
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.model_backend_enum import ModelBackendEnum
+from src.models.solution.objective_mode_enum import ObjectiveModeEnum
+from src.models.solution.schedules_search_mode_enum import SchedulesSearchModeEnum
+from src.models.solution.solver_profile_enum import SolverProfileEnum
+from src.models.solution.solver_profiles import SOLVER_PROFILE_ENVIRONMENT_VARIABLE, FAST_PROFILE_MAX_WORKERS, DETERMINISTIC_PROFILE_NUMBER_OF_WORKERS, \
+    DETERMINISTIC_PROFILE_RANDOM_SEED, configure_solver_profile, get_cpu_quota
+from src.server.schedule_options import create_schedule_options
+
+
+def test_the_solver_profile_is_taken_from_the_environment_variable(monkeypatch):
+    monkeypatch.setenv(SOLVER_PROFILE_ENVIRONMENT_VARIABLE, SolverProfileEnum.OPTIMAL.value)
+
+    schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+
+    assert schedule_solution.solver.parameters.linearization_level == 2
+    assert schedule_solution.solver.parameters.max_time_in_seconds == float("inf")
+
+
+def test_the_number_of_workers_is_sized_to_the_cpus():
+    number_of_cpus = 16
+    schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+
+    configure_solver_profile(schedule_solution.solver, SolverProfileEnum.FAST, number_of_cpus=number_of_cpus)
+    assert schedule_solution.solver.parameters.num_search_workers == FAST_PROFILE_MAX_WORKERS
+
+    configure_solver_profile(schedule_solution.solver, SolverProfileEnum.BALANCED, random_seed=7, number_of_cpus=number_of_cpus)
+    assert schedule_solution.solver.parameters.num_search_workers == number_of_cpus
+    assert schedule_solution.solver.parameters.random_seed == 7
+
+
+def test_the_cpu_quota_is_read_from_the_cgroup_files(tmp_path):
+    cpu_max_file = tmp_path / "cpu.max"
+    cpu_quota_file = tmp_path / "cpu.cfs_quota_us"
+    cpu_period_file = tmp_path / "cpu.cfs_period_us"
+    get_test_cpu_quota = lambda: get_cpu_quota(str(cpu_max_file), str(cpu_quota_file), str(cpu_period_file))
+
+    assert get_test_cpu_quota() is None
+
+    cpu_quota_file.write_text("250000")
+    cpu_period_file.write_text("100000")
+    assert get_test_cpu_quota() == 3
+
+    cpu_max_file.write_text("max 100000")
+    assert get_test_cpu_quota() is None
+
+    cpu_max_file.write_text("1600000 100000")
+    assert get_test_cpu_quota() == 16
+
+
+def test_the_deterministic_profile_gives_the_same_schedules_on_machines_with_different_cpus():
+    schedules_of_each_run = []
+
+    for number_of_cpus in [2, 16]:
+        schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+        configure_solver_profile(schedule_solution.solver, SolverProfileEnum.DETERMINISTIC, number_of_cpus=number_of_cpus)
+        schedules_of_each_run.append([schedule.schedule for schedule in itertools.islice(schedule_solution.yield_schedules(), 5)])
+
+    assert schedules_of_each_run[0] == schedules_of_each_run[1]
+
+
+def test_schedules_from_one_search_are_collected_with_many_workers():
+    schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+    configure_solver_profile(schedule_solution.solver, SolverProfileEnum.BALANCED, number_of_cpus=4)
+
+    assert len(list(schedule_solution.yield_schedules_from_one_search(10))) == 10
+
+
+# The portfolio's processes are threads here, so the parameters of their solves are recorded too
+@pytest.mark.parametrize("search_mode", list(SchedulesSearchModeEnum))
+def test_every_search_mode_keeps_the_workers_the_seed_and_the_deterministic_time_limits_of_the_deterministic_profile(monkeypatch, search_mode):
+    solves_parameters = []
+    solve = cp_model.CpSolver.Solve
+
+    def record_solve_parameters(solver, *args, **kwargs):
+        solves_parameters.append(sat_parameters_pb2.SatParameters.FromString(solver.parameters.SerializeToString()))
+        return solve(solver, *args, **kwargs)
+
+    employees = [Employee(name=f"employee{employee_number}", employee_id=f"employee{employee_number}",
+                          shift_types_trained_to_do=[ShiftTypesEnum.MORNING, ShiftTypesEnum.CLOSING]) for employee_number in range(3)]
+    shifts = [Shift(shift_id=f"{shift_type.value}_{day}", shift_type=shift_type, start_time=datetime.datetime(2024, 1, 1 + day, start_hour),
+                    end_time=datetime.datetime(2024, 1, 1 + day, start_hour + 6))
+              for day in range(2) for shift_type, start_hour in [(ShiftTypesEnum.MORNING, 8), (ShiftTypesEnum.CLOSING, 16)]]
+
+    monkeypatch.setattr(cp_model.CpSolver, "Solve", record_solve_parameters)
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", lambda max_workers, mp_context: concurrent.futures.ThreadPoolExecutor(max_workers))
+
+    create_schedule_options(employees, shifts, ModelBackendEnum.BOOLEAN_SUMS, search_mode, objective_tolerance=0,
+                            minimum_different_assignments=1, max_time_per_solve_in_seconds=1, max_total_time_in_seconds=100,
+                            solver_profile=SolverProfileEnum.DETERMINISTIC, random_seed=None, objective_mode=ObjectiveModeEnum.WEIGHTED_SUM, number_of_cpus=2)
+
+    # The time limits of the request are in deterministic time, and nothing is stopped by the wall clock
+    assert any(parameters.max_deterministic_time == 1 for parameters in solves_parameters)
+    for parameters in solves_parameters:
+        assert parameters.random_seed == DETERMINISTIC_PROFILE_RANDOM_SEED
+        assert parameters.max_time_in_seconds == float("inf")
+        # Only the enumeration of the one search has one worker, which is deterministic without interleaving
+        assert parameters.num_search_workers == DETERMINISTIC_PROFILE_NUMBER_OF_WORKERS if parameters.interleave_search else \
+            parameters.enumerate_all_solutions and parameters.num_search_workers == 1
@@ -0,0 +1,67 @@
+import datetime
+
+import pytest
+from ortools.sat.python import cp_model
+
+from src.constraints_file import add_squared_deviation_constraint
+from src.models.employees.employee import Employee
+from src.models.employees.employees_file import all_employees
+from src.models.shifts.shift import Shift
+from src.models.shifts.shifts_file import all_shifts_in_the_week
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.objective_registry import POSITION_DEVIATION_OBJECTIVE_TERM
+from src.models.solution.solver_profile_enum import SolverProfileEnum
+from src.models.solution.squared_deviation_encoding_enum import SquaredDeviationEncodingEnum
+
+
+@pytest.mark.parametrize("squared_deviation_encoding", list(SquaredDeviationEncodingEnum))
+def test_the_minimal_squared_deviation_is_the_square_of_the_deviation(squared_deviation_encoding):
+    max_deviation = 6
+    constraint_model = cp_model.CpModel()
+    deviation = constraint_model.NewIntVar(0, max_deviation, "deviation")
+    squared_deviation = constraint_model.NewIntVar(0, pow(max_deviation, 2), "squared_deviation")
+    add_squared_deviation_constraint(constraint_model, deviation, squared_deviation, max_deviation, squared_deviation_encoding)
+    constraint_model.Minimize(squared_deviation)
+    solver = cp_model.CpSolver()
+
+    for deviation_value in range(max_deviation + 1):
+        constraint_model.ClearAssumptions()
+        deviation_is_fixed = constraint_model.NewBoolVar(f"deviation_is_{deviation_value}")
+        constraint_model.Add(deviation == deviation_value).OnlyEnforceIf(deviation_is_fixed)
+        constraint_model.AddAssumption(deviation_is_fixed)
+
+        assert solver.Solve(constraint_model) == cp_model.OPTIMAL
+        assert solver.Value(squared_deviation) == pow(deviation_value, 2)
+
+
+def test_all_the_encodings_reach_the_same_optimal_objective():
+    optimal_objectives = []
+
+    for squared_deviation_encoding in SquaredDeviationEncodingEnum:
+        schedule_solution = create_solutions(all_employees, all_shifts_in_the_week, squared_deviation_encoding=squared_deviation_encoding)
+        schedule_solution.solver.parameters.relative_gap_limit = 0
+
+        assert schedule_solution.solver.Solve(schedule_solution.constraint_model) == cp_model.OPTIMAL
+        optimal_objectives.append(schedule_solution.solver.ObjectiveValue())
+
+    assert len(set(optimal_objectives)) == 1
+
+
+# A deviation that is not minimized can not be squared from below, so its square is an element of the squares
+def test_a_deviation_weight_that_is_not_positive_squares_the_deviation_exactly():
+    optimal_objectives = []
+
+    employees = [Employee(name=f"employee{employee_number}", employee_id=f"employee{employee_number}", shift_types_trained_to_do=[ShiftTypesEnum.MORNING])
+                 for employee_number in range(2)]
+    shifts = [Shift(shift_id=f"morning_{day}", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 1 + day, 8),
+                    end_time=datetime.datetime(2024, 1, 1 + day, 14)) for day in range(4)]
+
+    for squared_deviation_encoding in [SquaredDeviationEncodingEnum.PIECEWISE_LINEAR, SquaredDeviationEncodingEnum.ELEMENT]:
+        schedule_solution = create_solutions(employees, shifts, solver_profile=SolverProfileEnum.OPTIMAL, objective_weights={POSITION_DEVIATION_OBJECTIVE_TERM: -1},
+                                             squared_deviation_encoding=squared_deviation_encoding)
+
+        assert schedule_solution.solver.Solve(schedule_solution.constraint_model) == cp_model.OPTIMAL
+        optimal_objectives.append(schedule_solution.solver.ObjectiveValue())
+
+    assert optimal_objectives[0] == optimal_objectives[1]
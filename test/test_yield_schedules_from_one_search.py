@@ -0,0 +1,61 @@
+import datetime
+
+from src.models.employees.employee import Employee
+from src.models.employees.employee_preferences.employees_shifts_preferences import EmployeesShiftsPreferences
+from src.models.employees.employee_preferences.shifts_preference_by_id import ShiftIdPreference
+from src.models.employees.employees_file import all_employees
+from src.models.shifts.shift import Shift
+from src.models.shifts.shifts_file import all_shifts_in_the_week
+from src.models.shifts.shifts_types_enum import ShiftTypesEnum
+from src.models.solution.create_solutions import create_solutions
+
+
+def create_two_shifts_and_an_employee_who_wants_the_first_one():
+    first_shift = Shift(shift_id="first_shift", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 1, 8), end_time=datetime.datetime(2024, 1, 1, 14))
+    second_shift = Shift(shift_id="second_shift", shift_type=ShiftTypesEnum.MORNING, start_time=datetime.datetime(2024, 1, 2, 8), end_time=datetime.datetime(2024, 1, 2, 14))
+
+    employee_who_wants_the_first_shift = Employee(name="employee_who_wants_the_first_shift", employee_id="employee_who_wants_the_first_shift", shift_types_trained_to_do=[ShiftTypesEnum.MORNING],
+                                                  shifts_preferences=EmployeesShiftsPreferences(shifts_wants_to_work=ShiftIdPreference([first_shift.shift_id])))
+    employee_without_preferences = Employee(name="employee_without_preferences", employee_id="employee_without_preferences", shift_types_trained_to_do=[ShiftTypesEnum.MORNING])
+
+    return [employee_who_wants_the_first_shift, employee_without_preferences], [first_shift, second_shift]
+
+
+def test_only_optimal_schedules_are_collected_without_objective_tolerance():
+    employees, shifts = create_two_shifts_and_an_employee_who_wants_the_first_one()
+    schedule_solution = create_solutions(employees, shifts)
+
+    schedules = list(schedule_solution.yield_schedules_from_one_search(10))
+
+    # The employee who wants the first shift works it, and the shifts are split evenly between the two full timers
+    assert len(schedules) == 1
+    assert schedules[0].schedule == {"first_shift": "employee_who_wants_the_first_shift", "second_shift": "employee_without_preferences"}
+
+
+def test_all_the_schedules_are_collected_with_a_wide_objective_tolerance():
+    employees, shifts = create_two_shifts_and_an_employee_who_wants_the_first_one()
+    schedule_solution = create_solutions(employees, shifts)
+
+    schedules = list(schedule_solution.yield_schedules_from_one_search(10, objective_tolerance=100))
+
+    assert len(schedules) == 4
+    assert len({frozenset(schedule.schedule.items()) for schedule in schedules}) == 4
+
+
+def test_the_search_stops_after_the_requested_number_of_different_schedules():
+    schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+    number_of_variables_before_the_search = len(schedule_solution.constraint_model.Proto().variables)
+
+    schedules = list(schedule_solution.yield_schedules_from_one_search(20))
+
+    assert len(schedules) == 20
+    assert len({frozenset(schedule.schedule.items()) for schedule in schedules}) == 20
+    assert all(len(schedule.schedule) == len(all_shifts_in_the_week) for schedule in schedules)
+    assert len(schedule_solution.constraint_model.Proto().variables) == number_of_variables_before_the_search
+
+
+def test_no_schedules_are_collected_when_there_is_no_schedule():
+    employees, shifts = create_two_shifts_and_an_employee_who_wants_the_first_one()
+    schedule_solution = create_solutions(employees[:1], shifts + [Shift(shift_id="overlapping_shift", shift_type=ShiftTypesEnum.MORNING, start_time=shifts[0].start_time, end_time=shifts[0].end_time)])
+
+    assert list(schedule_solution.yield_schedules_from_one_search(10)) == []
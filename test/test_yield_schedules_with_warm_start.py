@@ -0,0 +1,56 @@
+import itertools
+import math
+
+from src.models.employees.employees_file import all_employees
+from src.models.shifts.shifts_file import all_shifts_in_the_week
+from src.models.solution.create_solutions import create_solutions
+from src.models.solution.schedule_solutions import get_minimized_objective_value, OBJECTIVE_BOUND_ROUNDING_TOLERANCE
+
+
+def test_warm_started_schedules_have_the_same_objectives_as_cold_started_schedules():
+    number_of_schedules = 10
+    objective_values_by_warm_start = {}
+
+    for warm_start in [False, True]:
+        schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+        objective_values = []
+
+        for _ in itertools.islice(schedule_solution.yield_schedules(warm_start), number_of_schedules):
+            objective_values.append(schedule_solution.solver.ObjectiveValue())
+
+        assert len(schedule_solution.iterations_wall_times) == number_of_schedules
+        objective_values_by_warm_start[warm_start] = objective_values
+
+    assert objective_values_by_warm_start[False] == objective_values_by_warm_start[True]
+
+
+def test_the_previous_schedule_is_the_hint_of_the_next_solve():
+    schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+    schedules = schedule_solution.yield_schedules()
+
+    first_schedule = next(schedules)
+    solution_hint = schedule_solution.constraint_model.Proto().solution_hint
+    hinted_values = dict(zip(solution_hint.vars, solution_hint.values))
+
+    for assignment_key, assignment in schedule_solution.all_shifts.items():
+        is_assigned = first_schedule.schedule.get(assignment_key.shift_id) == assignment_key.employee_id
+        assert hinted_values[assignment.Index()] == is_assigned
+
+
+def test_the_best_objective_bound_of_a_solve_is_added_as_a_new_constraint_of_the_next_solve():
+    schedule_solution = create_solutions(all_employees, all_shifts_in_the_week)
+    constraint_model = schedule_solution.constraint_model
+    schedules = schedule_solution.yield_schedules()
+
+    next(schedules)
+    minimized_objective_bound = math.ceil(get_minimized_objective_value(constraint_model, schedule_solution.solver.BestObjectiveBound()) - OBJECTIVE_BOUND_ROUNDING_TOLERANCE)
+    objective_bound_constraint = constraint_model.Proto().constraints[-2].linear
+
+    assert sorted(objective_bound_constraint.vars) == sorted(constraint_model.Proto().objective.vars)
+    assert objective_bound_constraint.domain[0] == minimized_objective_bound
+
+    number_of_constraints_after_the_first_schedule = len(constraint_model.Proto().constraints)
+    next(schedules)
+
+    # The forbidden schedule, and a new bound only if it is tighter
+    assert len(constraint_model.Proto().constraints) - number_of_constraints_after_the_first_schedule in [1, 2]